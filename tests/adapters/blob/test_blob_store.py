@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from workflower.adapters.blob.store import BlobStore, get_event_output
+from workflower.domain.entities.event import Event
+
+
+@pytest.fixture
+def blob_store(tmpdir_factory):
+    return BlobStore(str(tmpdir_factory.mktemp("blobs")), chunk_size=16)
+
+
+class TestBlobStore:
+    def test_blob_store_stores_compressed_content(self, blob_store):
+        value = "Hello, World!\n" * 1000
+
+        key = blob_store.put(value)
+
+        assert blob_store.exists(key)
+        assert blob_store.get_text(key) == value
+        file_path = blob_store._get_file_path(key)
+        assert os.path.getsize(file_path) < len(value)
+
+    def test_blob_store_deduplicates_equal_content(self, blob_store):
+        first_key = blob_store.put("output")
+        second_key = blob_store.put(b"output")
+
+        assert first_key == second_key
+        blob_directory = os.path.dirname(blob_store._get_file_path(first_key))
+        assert len(os.listdir(blob_directory)) == 1
+
+    def test_blob_store_streams_content_in_chunks(self, blob_store):
+        value = os.urandom(1024)
+        key = blob_store.put(value)
+
+        chunks = list(blob_store.open(key))
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == value
+
+    def test_blob_store_removes_blob(self, blob_store):
+        key = blob_store.put("output")
+
+        blob_store.remove(key)
+        blob_store.remove(key)
+
+        assert not blob_store.exists(key)
+
+    def test_blob_store_keeps_blob_stored_again(self, blob_store):
+        key = blob_store.put("output")
+        file_path = blob_store._get_file_path(key)
+        os.utime(file_path, (0, 0))
+        blob_store.put("output")
+
+        assert not blob_store.remove(key, unused_since=1)
+        assert blob_store.exists(key)
+
+    def test_get_event_output_reads_blob(self, blob_store):
+        key = blob_store.put("whole output")
+        event = Event("executed", "job", "1", output="whole", output_blob=key)
+
+        assert get_event_output(event, blob_store) == "whole output"
+        assert get_event_output(dict(output="short"), blob_store) == "short"
+        blob_store.remove(key)
+        assert get_event_output(event, blob_store) == "whole"
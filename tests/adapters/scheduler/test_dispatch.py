@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from workflower.adapters.scheduler.dispatch import DispatchQueue
+
+
+class TestDispatchQueue:
+    def test_dispatch_queue_dispatches_by_priority(self):
+        dispatch_queue = DispatchQueue(workers=1)
+        dispatched = []
+
+        assert dispatch_queue.submit(lambda: None)
+        assert not dispatch_queue.submit(lambda: dispatched.append("low"), 0)
+        assert not dispatch_queue.submit(lambda: dispatched.append("high"), 2)
+        for _ in range(3):
+            dispatch_queue.release()
+
+        assert dispatched == ["high", "low"]
+        assert dispatch_queue.get_stats()["max_queue_depth"] == 2
+        assert dispatch_queue.get_stats()["busy_workers"] == 0
+
+    def test_dispatch_queue_ages_waiting_jobs(self):
+        dispatch_queue = DispatchQueue(workers=1, aging_interval=10)
+        dispatched = []
+        dispatch_queue.submit(lambda: None)
+
+        with patch("time.monotonic", return_value=100):
+            dispatch_queue.submit(lambda: dispatched.append("old_low"), 0)
+        with patch("time.monotonic", return_value=125):
+            dispatch_queue.submit(lambda: dispatched.append("new_high"), 2)
+        dispatch_queue.release()
+
+        assert dispatched == ["old_low"]
+
+    def test_dispatch_queue_without_workers_limit(self):
+        dispatch_queue = DispatchQueue()
+
+        assert all(dispatch_queue.submit(lambda: None) for _ in range(100))
+
+    def test_dispatch_queue_records_delays_by_priority(self):
+        dispatch_queue = DispatchQueue()
+
+        dispatch_queue.record_delay(0, 2.0)
+        dispatch_queue.record_delay(0, 4.0)
+        dispatch_queue.record_delay(5, 1.0)
+
+        assert dispatch_queue.get_stats()["priorities"] == [
+            dict(priority=5, dispatched_jobs=1, mean_delay=1.0, max_delay=1.0),
+            dict(priority=0, dispatched_jobs=2, mean_delay=3.0, max_delay=4.0),
+        ]
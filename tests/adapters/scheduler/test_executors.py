@@ -0,0 +1,245 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
+from apscheduler.schedulers.background import BackgroundScheduler
+from workflower.adapters.scheduler.executors import (
+    EventLoopExecutor,
+    PooledProcessPoolExecutor,
+    PooledThreadPoolExecutor,
+    WarmProcessPoolExecutor,
+)
+from workflower.adapters.scheduler.pools import ResourcePools
+
+
+@pytest.fixture(autouse=True)
+def event_writer():
+    with patch(
+        "workflower.adapters.scheduler.executors.event_writer"
+    ) as event_writer:
+        yield event_writer
+
+
+async def coroutine_job(value):
+    await asyncio.sleep(0)
+    return value
+
+
+def function_job(value):
+    return value
+
+
+def failing_job():
+    raise ValueError("failed")
+
+
+running = []
+max_running = []
+
+
+def pooled_job(resource_pool=None):
+    running.append(resource_pool)
+    max_running.append(len(running))
+    time.sleep(0.05)
+    running.pop()
+
+
+started = threading.Event()
+blocked = threading.Event()
+dispatched = []
+
+
+def blocking_job():
+    started.set()
+    blocked.wait(5)
+
+
+def priority_job(name=None, priority=0):
+    dispatched.append(name)
+
+
+class TestEventLoopExecutor:
+    def test_event_loop_executor_runs_jobs(self):
+        scheduler = BackgroundScheduler(timezone="UTC")
+        scheduler.add_executor(EventLoopExecutor(), "asyncio")
+        events = []
+        done = threading.Event()
+
+        def listener(event):
+            events.append(event)
+            if len(events) == 3:
+                done.set()
+
+        scheduler.add_listener(listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        scheduler.start()
+        try:
+            scheduler.add_job(
+                coroutine_job, args=["coroutine"], executor="asyncio"
+            )
+            scheduler.add_job(
+                function_job, args=["function"], executor="asyncio"
+            )
+            scheduler.add_job(failing_job, executor="asyncio")
+            assert done.wait(5)
+        finally:
+            scheduler.shutdown()
+
+        assert sorted(
+            event.retval
+            for event in events
+            if event.code == EVENT_JOB_EXECUTED
+        ) == ["coroutine", "function"]
+        assert [
+            type(event.exception)
+            for event in events
+            if event.code == EVENT_JOB_ERROR
+        ] == [ValueError]
+
+
+class TestPooledThreadPoolExecutor:
+    def test_pooled_executor_limits_jobs_by_resource_pool(self):
+        executor = PooledThreadPoolExecutor(max_workers=4)
+        executor.resource_pools = ResourcePools({"alteryx": 1})
+        scheduler = BackgroundScheduler(timezone="UTC")
+        scheduler.add_executor(executor, "default")
+        executed = []
+        done = threading.Event()
+
+        def listener(event):
+            executed.append(event)
+            if len(executed) == 3:
+                done.set()
+
+        scheduler.add_listener(listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        scheduler.start()
+        try:
+            for _ in range(3):
+                scheduler.add_job(
+                    pooled_job, kwargs=dict(resource_pool="alteryx")
+                )
+            assert done.wait(5)
+        finally:
+            scheduler.shutdown()
+
+        assert max(max_running) == 1
+        stats = executor.resource_pools.get("alteryx").get_stats()
+        assert stats["acquired_jobs"] == 3
+        assert stats["in_use"] == 0
+
+
+class TestDispatchQueueMixin:
+    def test_pooled_executor_dispatches_jobs_by_priority(self, event_writer):
+        executor = PooledThreadPoolExecutor(max_workers=1)
+        scheduler = BackgroundScheduler(timezone="UTC")
+        scheduler.add_executor(executor, "default")
+        executed = []
+        done = threading.Event()
+
+        def listener(event):
+            executed.append(event)
+            if len(executed) == 3:
+                done.set()
+
+        scheduler.add_listener(listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        scheduler.start()
+        try:
+            scheduler.add_job(blocking_job)
+            assert started.wait(5)
+            scheduler.add_job(priority_job, kwargs=dict(name="low"))
+            scheduler.add_job(
+                priority_job, kwargs=dict(name="high", priority=1)
+            )
+            while executor.dispatch_queue.get_stats()["queue_depth"] < 2:
+                time.sleep(0.01)
+            blocked.set()
+            assert done.wait(5)
+        finally:
+            scheduler.shutdown()
+
+        assert dispatched == ["high", "low"]
+        stats = executor.dispatch_queue.get_stats()
+        assert [
+            (priority["priority"], priority["dispatched_jobs"])
+            for priority in stats["priorities"]
+        ] == [(1, 1), (0, 2)]
+        assert event_writer.write_event.call_count == 3
+
+
+def run_jobs(executor, count):
+    """
+    Run jobs one after another, returning their worker pids.
+    """
+    scheduler = BackgroundScheduler(timezone="UTC")
+    scheduler.add_executor(executor, "default")
+    executed = []
+    done = threading.Semaphore(0)
+
+    def listener(event):
+        executed.append(event)
+        done.release()
+
+    scheduler.add_listener(listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+    scheduler.start()
+    try:
+        for _ in range(count):
+            scheduler.add_job("os:getpid")
+            assert done.acquire(timeout=30)
+    finally:
+        scheduler.shutdown()
+    return [event.retval for event in executed]
+
+
+class TestWarmProcessPoolExecutor:
+    def test_warm_executor_reuses_started_workers(self):
+        executor = WarmProcessPoolExecutor(max_workers=1, preload=["json"])
+
+        pids = run_jobs(executor, 2)
+
+        assert len(set(pids)) == 1
+        assert executor.recycled_pools == 0
+        stats = executor.dispatch_queue.get_stats()
+        assert stats["start_overhead"]["started_jobs"] == 2
+
+    def test_warm_executor_replaces_pool_over_max_memory(self):
+        executor = WarmProcessPoolExecutor(
+            max_workers=1, preload=["json"], max_memory=0.001
+        )
+
+        pids = run_jobs(executor, 2)
+
+        assert len(set(pids)) == 2
+        assert executor.recycled_pools == 2
+
+    def test_warm_executor_replaces_pool_with_stuck_execution(self):
+        executor = WarmProcessPoolExecutor(max_workers=1, preload=["json"])
+        scheduler = BackgroundScheduler(timezone="UTC")
+        scheduler.add_executor(executor, "default")
+        done = threading.Semaphore(0)
+        scheduler.add_listener(
+            lambda event: done.release(), EVENT_JOB_EXECUTED | EVENT_JOB_ERROR
+        )
+        scheduler.start()
+        try:
+            scheduler.add_job(
+                "workflower.application.operators.inprocess:run_in_process",
+                args=[bool],
+                kwargs=dict(code="import time\ntime.sleep(30)", timeout=0.1),
+            )
+            assert done.acquire(timeout=30)
+        finally:
+            scheduler.shutdown()
+
+        assert executor.recycled_pools == 1
+
+
+class TestPooledProcessPoolExecutor:
+    def test_pooled_process_executor_records_start_overhead(self):
+        executor = PooledProcessPoolExecutor(max_workers=1)
+
+        run_jobs(executor, 1)
+
+        stats = executor.dispatch_queue.get_stats()
+        assert stats["start_overhead"]["started_jobs"] == 1
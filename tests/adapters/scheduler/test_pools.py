@@ -0,0 +1,48 @@
+from workflower.adapters.scheduler.pools import ResourcePool, ResourcePools
+
+
+class TestResourcePool:
+    def test_resource_pool_queues_jobs_beyond_its_slots(self):
+        pool = ResourcePool("alteryx", 1)
+        started = []
+
+        assert pool.acquire(lambda: started.append("first"))
+        assert not pool.acquire(lambda: started.append("second"))
+        assert not pool.acquire(lambda: started.append("third"))
+        assert pool.get_stats()["queue_depth"] == 2
+
+        pool.release()
+        assert started == ["second"]
+        pool.release()
+        pool.release()
+
+        assert started == ["second", "third"]
+        stats = pool.get_stats()
+        assert stats["in_use"] == 0
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] == 2
+        assert stats["acquired_jobs"] == 3
+        assert stats["waited_jobs"] == 2
+
+    def test_resource_pool_starts_jobs_by_priority(self):
+        pool = ResourcePool("heavy_notebooks", 1)
+        started = []
+        pool.acquire(lambda: None)
+
+        pool.acquire(lambda: started.append("low"), priority=0)
+        pool.acquire(lambda: started.append("high"), priority=5)
+        pool.acquire(lambda: started.append("next_low"), priority=0)
+        for _ in range(3):
+            pool.release()
+
+        assert started == ["high", "low", "next_low"]
+
+
+class TestResourcePools:
+    def test_resource_pools_returns_configured_pools(self):
+        pools = ResourcePools({"alteryx": 2})
+
+        assert pools.get("alteryx").slots == 2
+        assert pools.get("papermill") is None
+        assert pools.get(None) is None
+        assert [stats["name"] for stats in pools.get_stats()] == ["alteryx"]
@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from workflower.adapters.scheduler.stream import StreamTriggerListener
+from workflower.application.operators.stream import open_log_stream
+from workflower.domain.entities.job import Job
+from workflower.services.workflow.graph import DependencyGraph, DependencyNode
+
+
+def create_job(job_id, depends_on=(), **attributes):
+    job = Job(
+        name=f"job_{job_id}",
+        operator="python",
+        definition={},
+        depends_on=[create_job(dependency) for dependency in depends_on],
+        **attributes,
+    )
+    job.id = job_id
+    job.workflow_id = 1
+    return job
+
+
+def create_node(job_id, depends_on=(), **attributes):
+    return DependencyNode(create_job(job_id, depends_on, **attributes))
+
+
+@pytest.fixture
+def graph():
+    graph = DependencyGraph()
+    graph.replace(
+        {
+            1: [
+                create_node(1),
+                create_node(
+                    2,
+                    [1],
+                    dependency_logs_pattern="extracted",
+                    run_if_pattern_match=True,
+                    early_trigger="release",
+                ),
+                create_node(
+                    3,
+                    [1],
+                    dependency_logs_pattern="failed",
+                    run_if_pattern_match=True,
+                    early_trigger="abort",
+                ),
+            ]
+        }
+    )
+    return graph
+
+
+@pytest.fixture
+def listener(graph):
+    listener = StreamTriggerListener(graph)
+    listener.start(MagicMock())
+    yield listener
+    listener.stop()
+
+
+class TestStreamTriggerListener:
+    def test_log_stream_releases_jobs_on_match(self, listener):
+        with patch(
+            "workflower.adapters.scheduler.stream.schedule_ready_jobs"
+        ) as schedule_ready_jobs:
+            log_stream = open_log_stream(1)
+            assert not log_stream.feed("extracting")
+            assert not log_stream.feed("rows extracted")
+            assert not log_stream.feed("rows extracted")
+            log_stream.close()
+
+        assert schedule_ready_jobs.call_count == 1
+        _, ready_jobs = schedule_ready_jobs.call_args.args
+        assert [(node.id, value) for node, value in ready_jobs] == [
+            (2, "rows extracted")
+        ]
+
+    def test_log_stream_aborts_job_on_match(self, listener):
+        with patch("workflower.adapters.scheduler.stream.schedule_ready_jobs"):
+            log_stream = open_log_stream(1)
+            assert log_stream.feed("load failed")
+            log_stream.close()
+
+    def test_log_stream_is_not_opened_without_patterns(self, listener):
+        assert open_log_stream(2) is None
+
+    def test_log_stream_is_not_opened_when_listener_stopped(self, listener):
+        listener.stop()
+
+        assert open_log_stream(1) is None
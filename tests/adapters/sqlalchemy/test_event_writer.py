@@ -0,0 +1,146 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from workflower.adapters.blob.store import BlobStore
+from workflower.adapters.sqlalchemy.event_writer import EventWriter
+from workflower.adapters.sqlalchemy.setup import metadata
+from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
+from workflower.adapters.sqlalchemy.writer import DatabaseWriter
+from workflower.domain.entities.event import Event
+from workflower.domain.entities.job import Job
+
+
+@pytest.fixture
+def file_session_factory(session_factory, tmpdir_factory):
+    # Writer runs on its own thread, an in memory database would not be
+    # shared with it
+    database_path = tmpdir_factory.mktemp("database").join("app.sqlite")
+    engine = create_engine(f"sqlite:///{database_path}")
+    metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def writer(file_session_factory):
+    writer = DatabaseWriter(file_session_factory)
+    yield writer
+    writer.stop()
+
+
+@pytest.fixture
+def job_id(file_session_factory):
+    session = file_session_factory()
+    job = Job(name="job", operator="python", definition={})
+    session.add(job)
+    session.commit()
+    return job.id
+
+
+class TestEventWriter:
+    def test_event_writer_writes_events_in_order(
+        self, file_session_factory, writer
+    ):
+        event_writer = EventWriter(writer, flush_size=2, flush_latency=0.01)
+        for index in range(5):
+            event_writer.write_event(
+                name=f"event_{index}", model="job", model_id=1
+            )
+        event_writer.flush()
+
+        session = file_session_factory()
+        events = session.query(Event).order_by(Event.id).all()
+        assert [event.name for event in events] == [
+            f"event_{index}" for index in range(5)
+        ]
+        event_writer.stop()
+
+    def test_event_writer_coalesces_job_changes(
+        self, file_session_factory, writer, job_id
+    ):
+        event_writer = EventWriter(writer, flush_latency=10)
+        event_writer.change_job_status(str(job_id), "added")
+        next_run_time = datetime.datetime(
+            2022, 1, 1, 10, 0, tzinfo=datetime.timezone.utc
+        )
+        event_writer.update_next_run_time(str(job_id), next_run_time)
+        event_writer.change_job_status(str(job_id), "executed")
+        event_writer.change_job_status("not_a_workflow_job", "executed")
+        event_writer.flush()
+
+        session = file_session_factory()
+        record = session.query(Job).filter_by(id=job_id).first()
+        assert record.status == "executed"
+        assert record.next_run_time == next_run_time
+        event_writer.stop()
+
+    def test_event_writer_writes_queued_changes_on_stop(
+        self, file_session_factory, writer
+    ):
+        event_writer = EventWriter(writer, flush_latency=10)
+        event_writer.write_event(
+            name="job_error",
+            model="job",
+            model_id=1,
+            exception=ValueError("error"),
+        )
+        event_writer.stop()
+
+        session = file_session_factory()
+        events = session.query(Event).all()
+        assert len(events) == 1
+        assert events[0].exception == "error"
+
+    def test_event_writer_retries_and_reports_failed_commits(
+        self, file_session_factory, writer
+    ):
+        event_writer = EventWriter(writer, flush_latency=0.01)
+        with patch.object(
+            SqlAlchemyUnitOfWork, "commit", side_effect=OSError("disk full")
+        ) as commit, patch(
+            "workflower.adapters.sqlalchemy.event_writer.logger"
+        ) as logger:
+            event_writer.write_event(name="event", model="job", model_id=1)
+            event_writer.flush()
+            event_writer.stop()
+
+        assert commit.call_count >= 3
+        assert logger.warning.call_count == 3
+        logger.error.assert_called_once_with("Discarding 1 events changes")
+        session = file_session_factory()
+        assert session.query(Event).count() == 0
+
+    def test_event_writer_flush_returns_when_not_started(
+        self, file_session_factory, writer
+    ):
+        event_writer = EventWriter(writer)
+
+        assert event_writer.flush(timeout=1) is True
+
+    def test_event_writer_stores_large_outputs_on_blob_store(
+        self, file_session_factory, writer, tmpdir_factory
+    ):
+        blob_store = BlobStore(str(tmpdir_factory.mktemp("blobs")))
+        event_writer = EventWriter(
+            writer,
+            blob_store=blob_store,
+            output_threshold=100,
+            output_preview_size=10,
+        )
+        large_output = "Hello, World!\n" * 100
+        event_writer.write_event(
+            name="job_executed", model="job", model_id=1, output=large_output
+        )
+        event_writer.write_event(
+            name="job_executed", model="job", model_id=1, output="small"
+        )
+        event_writer.stop()
+
+        session = file_session_factory()
+        events = session.query(Event).order_by(Event.id).all()
+        assert events[0].output == large_output[:10]
+        assert blob_store.get_text(events[0].output_blob) == large_output
+        assert events[1].output == "small"
+        assert events[1].output_blob is None
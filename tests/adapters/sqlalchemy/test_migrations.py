@@ -0,0 +1,122 @@
+from sqlalchemy import create_engine, inspect
+from workflower.adapters.sqlalchemy.migrations import (
+    MIGRATIONS,
+    get_schema_version,
+    run_migrations,
+)
+from workflower.adapters.sqlalchemy.setup import metadata
+
+
+class TestRunMigrations:
+    def test_run_migrations_upgrades_old_schema(self, tmpdir_factory):
+        database_path = tmpdir_factory.mktemp("database").join("app.sqlite")
+        engine = create_engine(f"sqlite:///{database_path}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE event (id INTEGER PRIMARY KEY, model VARCHAR, "
+                "model_id VARCHAR, output VARCHAR, created_at DATETIME)"
+            )
+
+        run_migrations(engine)
+
+        columns = inspect(engine).get_columns("event")
+        assert "output_blob" in {column["name"] for column in columns}
+        with engine.connect() as connection:
+            assert get_schema_version(connection) == len(MIGRATIONS)
+
+    def test_run_migrations_on_current_schema(self, tmpdir_factory):
+        database_path = tmpdir_factory.mktemp("database").join("app.sqlite")
+        engine = create_engine(f"sqlite:///{database_path}")
+        metadata.create_all(engine)
+
+        run_migrations(engine)
+        run_migrations(engine)
+
+        with engine.connect() as connection:
+            assert get_schema_version(connection) == len(MIGRATIONS)
+
+    def test_run_migrations_types_columns_of_old_schema(self, tmpdir_factory):
+        database_path = tmpdir_factory.mktemp("database").join("app.sqlite")
+        engine = create_engine(f"sqlite:///{database_path}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE workflow (id INTEGER PRIMARY KEY, "
+                "name VARCHAR, file_last_modified_at VARCHAR)"
+            )
+            connection.exec_driver_sql(
+                "CREATE TABLE job (id INTEGER PRIMARY KEY, name VARCHAR, "
+                "workflow_id INTEGER REFERENCES workflow (id), "
+                "depends_on VARCHAR, next_run_time VARCHAR)"
+            )
+            connection.exec_driver_sql(
+                "CREATE TABLE event (id INTEGER PRIMARY KEY, model VARCHAR, "
+                "model_id VARCHAR, output VARCHAR, created_at DATETIME)"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO workflow VALUES (1, 'workflow', '1650000000.5')"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO job VALUES "
+                "(1, 'first', 1, NULL, '2022-01-01 10:00:00-03:00'), "
+                "(2, 'second', 1, '1', NULL)"
+            )
+
+        run_migrations(engine)
+
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                "SELECT id, next_run_time, trigger_rule FROM job ORDER BY id"
+            ).fetchall()
+            assert [tuple(row) for row in rows] == [
+                (1, None, None),
+                (2, None, None),
+            ]
+            rows = connection.exec_driver_sql(
+                "SELECT job_id, depends_on_job_id FROM job_dependency"
+            ).fetchall()
+            assert [tuple(row) for row in rows] == [(2, 1)]
+            assert (
+                connection.exec_driver_sql(
+                    "SELECT file_last_modified_at FROM workflow"
+                ).scalar()
+                == 1650000000.5
+            )
+        inspector = inspect(engine)
+        assert "depends_on" not in {
+            column["name"] for column in inspector.get_columns("job")
+        }
+        assert "job_status_idx" in {
+            index["name"] for index in inspector.get_indexes("job")
+        }
+        assert "job_dependency_depends_on_job_id_idx" in {
+            index["name"] for index in inspector.get_indexes("job_dependency")
+        }
+        assert "event_model_model_id_created_at_idx" in {
+            index["name"] for index in inspector.get_indexes("event")
+        }
+
+    def test_run_migrations_moves_job_dependencies(self, tmpdir_factory):
+        database_path = tmpdir_factory.mktemp("database").join("app.sqlite")
+        engine = create_engine(f"sqlite:///{database_path}")
+        metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP TABLE job_dependency")
+            connection.exec_driver_sql(
+                "ALTER TABLE job ADD COLUMN depends_on INTEGER"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO job (id, name, depends_on) "
+                "VALUES (1, 'first', NULL), (2, 'second', 1)"
+            )
+            connection.exec_driver_sql("PRAGMA user_version = 2")
+
+        run_migrations(engine)
+
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                "SELECT job_id, depends_on_job_id FROM job_dependency"
+            ).fetchall()
+            assert [tuple(row) for row in rows] == [(2, 1)]
+        assert "depends_on" not in {
+            column["name"] for column in inspect(engine).get_columns("job")
+        }
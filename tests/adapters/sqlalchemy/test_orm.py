@@ -1,3 +1,5 @@
+import datetime
+
 from workflower.domain.entities.job import Job
 from workflower.domain.entities.workflow import Workflow
 
@@ -126,3 +128,42 @@ class TestJobMapper:
         assert record.jobs[0].name == "test"
         assert record.jobs[0].operator == "python"
         assert record.jobs[0].definition == {"trigger": "date"}
+
+    def test_job_mapper_stores_next_run_time_as_utc(self, session):
+        time_zone = datetime.timezone(datetime.timedelta(hours=-3))
+        job = Job(
+            name="test",
+            operator="python",
+            definition={"trigger": "date"},
+            next_run_time=datetime.datetime(2022, 1, 1, 7, tzinfo=time_zone),
+        )
+        session.add(job)
+        session.commit()
+        session.expire_all()
+
+        record = session.query(Job).first()
+
+        assert record.next_run_time == datetime.datetime(
+            2022, 1, 1, 10, tzinfo=datetime.timezone.utc
+        )
+
+    def test_job_dependency_lookup_uses_index(self, session):
+        query_plan = session.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM job_dependency "
+            "WHERE depends_on_job_id = 1"
+        ).fetchall()
+
+        assert "job_dependency_depends_on_job_id_idx" in str(query_plan)
+
+
+class TestEventMapper:
+    def test_event_history_lookup_uses_index(self, session):
+        query_plan = session.execute(
+            """
+            EXPLAIN QUERY PLAN SELECT * FROM event
+            WHERE model = 'job' AND model_id = '1'
+            ORDER BY created_at
+            """
+        ).fetchall()
+
+        assert "event_model_model_id_created_at_idx" in str(query_plan)
@@ -0,0 +1,214 @@
+import datetime
+import gzip
+
+import pytest
+from sqlalchemy import create_engine, event
+from workflower.adapters.blob.store import BlobStore
+from workflower.adapters.sqlalchemy.retention import (
+    EventRetention,
+    enable_incremental_vacuum,
+    get_archive_file_path,
+    query_archived_events,
+)
+from workflower.adapters.sqlalchemy.setup import metadata
+from workflower.domain.entities.event import Event
+
+
+@pytest.fixture
+def archive_dir(tmpdir_factory):
+    return str(tmpdir_factory.mktemp("archive"))
+
+
+def add_events(session, days_ago_list):
+    now = datetime.datetime.utcnow()
+    for index, days_ago in enumerate(days_ago_list):
+        event = Event(name=f"event_{index}", model="job", model_id=str(index))
+        event.created_at = now - datetime.timedelta(days=days_ago)
+        session.add(event)
+    session.commit()
+
+
+class TestEventRetention:
+    def test_roll_over_archives_events_older_than_max_age(
+        self, in_memory_db, session, writer, archive_dir
+    ):
+        add_events(session, [40, 35, 1, 0])
+        retention = EventRetention(
+            archive_dir=archive_dir,
+            max_age_days=30,
+            max_rows=0,
+            batch_size=1,
+            engine=in_memory_db,
+            writer=writer,
+        )
+
+        assert retention.roll_over() == 2
+
+        events = session.query(Event).order_by(Event.id).all()
+        assert [event.name for event in events] == ["event_2", "event_3"]
+        archived_events = list(query_archived_events(archive_dir))
+        assert [event["name"] for event in archived_events] == [
+            "event_0",
+            "event_1",
+        ]
+
+    def test_roll_over_keeps_newest_max_rows(
+        self, in_memory_db, session, writer, archive_dir
+    ):
+        add_events(session, [0, 0, 0, 0, 0])
+        retention = EventRetention(
+            archive_dir=archive_dir,
+            max_age_days=0,
+            max_rows=2,
+            engine=in_memory_db,
+            writer=writer,
+        )
+
+        assert retention.roll_over() == 3
+
+        assert session.query(Event).count() == 2
+        assert len(list(query_archived_events(archive_dir))) == 3
+
+    def test_roll_over_without_limits_keeps_events(
+        self, in_memory_db, session, writer, archive_dir
+    ):
+        add_events(session, [400])
+        retention = EventRetention(
+            archive_dir=archive_dir,
+            max_age_days=0,
+            max_rows=0,
+            engine=in_memory_db,
+            writer=writer,
+        )
+
+        assert retention.roll_over() == 0
+        assert session.query(Event).count() == 1
+
+
+class TestQueryArchivedEvents:
+    def test_query_archived_events_filters_by_day_and_attributes(
+        self, in_memory_db, session, writer, archive_dir
+    ):
+        add_events(session, [50, 40, 40])
+        EventRetention(
+            archive_dir=archive_dir,
+            max_age_days=30,
+            engine=in_memory_db,
+            writer=writer,
+        ).roll_over()
+        start_date = (
+            datetime.datetime.utcnow() - datetime.timedelta(days=45)
+        ).date()
+
+        archived_events = list(
+            query_archived_events(
+                archive_dir, start_date=start_date, model_id="2"
+            )
+        )
+
+        assert [event["name"] for event in archived_events] == ["event_2"]
+
+    def test_query_archived_events_filters_by_model_id_of_any_type(
+        self, in_memory_db, session, writer, archive_dir
+    ):
+        add_events(session, [40, 40, 40])
+        EventRetention(
+            archive_dir=archive_dir,
+            max_age_days=30,
+            engine=in_memory_db,
+            writer=writer,
+        ).roll_over()
+
+        for model_id in [1, "1"]:
+            archived_events = list(
+                query_archived_events(archive_dir, model_id=model_id)
+            )
+
+            assert [event["name"] for event in archived_events] == ["event_1"]
+
+    def test_roll_over_archives_whole_outputs_and_removes_their_blobs(
+        self, in_memory_db, session, writer, archive_dir, tmpdir_factory
+    ):
+        blob_store = BlobStore(str(tmpdir_factory.mktemp("blobs")))
+        rolled_key = blob_store.put("rolled output")
+        shared_key = blob_store.put("shared output")
+        add_events(session, [40, 40, 0])
+        events = session.query(Event).order_by(Event.id).all()
+        for event_, key in zip(events, [rolled_key, shared_key, shared_key]):
+            event_.output = "preview"
+            event_.output_blob = key
+        session.commit()
+        retention = EventRetention(
+            archive_dir=archive_dir,
+            max_age_days=30,
+            max_rows=0,
+            engine=in_memory_db,
+            writer=writer,
+            blob_store=blob_store,
+        )
+
+        assert retention.roll_over() == 2
+
+        archived_events = list(query_archived_events(archive_dir))
+        assert [event_["output"] for event_ in archived_events] == [
+            "rolled output",
+            "shared output",
+        ]
+        assert archived_events[0]["output_blob"] is None
+        assert not blob_store.exists(rolled_key)
+        assert blob_store.exists(shared_key)
+
+    def test_query_archived_events_skips_duplicated_and_truncated_events(
+        self, archive_dir
+    ):
+        file_path = get_archive_file_path(archive_dir, "2022-01-01")
+        lines = [
+            '{"id": 1, "name": "event_0"}\n',
+            '{"id": 1, "name": "event_0"}\n',
+            '{"id": 2, "name": "event_1"}\n',
+        ]
+        with gzip.open(file_path, "wt") as archive_file:
+            archive_file.writelines(lines)
+        with open(file_path, "ab") as archive_file:
+            archive_file.write(gzip.compress(b'{"id": 3}\n')[:-8])
+
+        archived_events = list(query_archived_events(archive_dir))
+
+        assert [event["id"] for event in archived_events] == [1, 2]
+
+
+@pytest.fixture
+def sqlite_engine(tmpdir_factory):
+    database_path = tmpdir_factory.mktemp("database").join("app.sqlite")
+    engine = create_engine(f"sqlite:///{database_path}")
+    statements = engine.statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return engine
+
+
+def get_auto_vacuum(engine):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+
+def test_enable_incremental_vacuum_rebuilds_database_once(sqlite_engine):
+    metadata.create_all(sqlite_engine)
+
+    enable_incremental_vacuum(sqlite_engine)
+    enable_incremental_vacuum(sqlite_engine)
+
+    assert get_auto_vacuum(sqlite_engine) == 2
+    assert sqlite_engine.statements.count("VACUUM") == 1
+
+
+def test_enable_incremental_vacuum_without_rebuild(sqlite_engine):
+    metadata.create_all(sqlite_engine)
+
+    enable_incremental_vacuum(sqlite_engine, rebuild=False)
+
+    assert get_auto_vacuum(sqlite_engine) == 0
+    assert "VACUUM" not in sqlite_engine.statements
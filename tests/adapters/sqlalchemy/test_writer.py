@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+from workflower.application.job.commands import ChangeJobStatusCommand
+from workflower.domain.entities.job import Job
+
+
+def add_job(uow, name):
+    with uow:
+        job = Job(name=name, operator="python", definition={})
+        uow.jobs.add(job)
+    return job.id
+
+
+class TestDatabaseWriter:
+    def test_writer_runs_writes_in_submission_order(self, writer, session):
+        futures = [
+            writer.submit(add_job, f"job_{index}") for index in range(5)
+        ]
+        jobs_ids = [future.result() for future in futures]
+
+        jobs = session.query(Job).order_by(Job.id).all()
+        assert [job.id for job in jobs] == jobs_ids
+        assert [job.name for job in jobs] == [
+            f"job_{index}" for index in range(5)
+        ]
+
+    def test_writer_runs_writes_on_one_thread(self, writer):
+        def get_thread_name(uow):
+            return threading.current_thread().name
+
+        threads_names = {writer.execute(get_thread_name) for _ in range(3)}
+
+        assert threads_names == {"database-writer"}
+
+    def test_writer_raises_write_errors_to_caller(self, writer, session):
+        def add_job_and_fail(uow):
+            add_job(uow, "job")
+            uow.jobs.add(
+                Job(name="pending_job", operator="python", definition={})
+            )
+            raise ValueError("error")
+
+        with pytest.raises(ValueError):
+            writer.execute(add_job_and_fail)
+
+        assert [job.name for job in session.query(Job).all()] == ["job"]
+        assert writer.execute(add_job, "other_job")
+
+    def test_writer_executes_commands(self, writer, session):
+        job_id = writer.execute(add_job, "job")
+
+        writer.execute_command(ChangeJobStatusCommand, job_id, "pending")
+
+        job = session.query(Job).filter_by(id=job_id).first()
+        assert job.status == "pending"
+
+    def test_writer_runs_nested_writes_immediately(self, writer):
+        def add_nested_job(uow):
+            return writer.execute(add_job, "nested_job")
+
+        assert writer.execute(add_nested_job)
+
+    def test_writer_restarts_after_stop(self, writer):
+        writer.execute(add_job, "job")
+        writer.stop()
+
+        assert writer.execute(add_job, "other_job")
+
+    def test_writer_calls_do_not_see_stale_objects(self, writer, session):
+        job_id = writer.execute(add_job, "job")
+
+        def get_job(uow):
+            with uow:
+                return uow.jobs.get(id=job_id).is_active
+
+        def bulk_deactivate_job(uow):
+            with uow:
+                uow.jobs.bulk_update([dict(id=job_id, is_active=False)])
+
+        def activate_job(uow):
+            with uow:
+                uow.jobs.get(id=job_id).is_active = True
+
+        assert writer.execute(get_job)
+        writer.execute(bulk_deactivate_job)
+        writer.execute(activate_job)
+
+        assert session.query(Job).filter_by(id=job_id).first().is_active
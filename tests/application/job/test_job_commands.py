@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
 
 from workflower.application.job import commands
 from workflower.domain.entities.job import Job
@@ -86,7 +87,7 @@ class TestUpdateNextRunTimeCommand:
             uow.jobs.add(new_job)
             new_workflow.add_job(new_job)
 
-        next_run_time = str(datetime.now())
+        next_run_time = datetime.now(timezone.utc)
         command = commands.UpdateNextRunTimeCommand(
             uow, new_job.id, next_run_time
         )
@@ -119,3 +120,17 @@ class RemoveJobCommand:
         session = session_factory()
         job = session.query(Job).filter_by(id=new_job.id).first()
         assert job is None
+
+
+class TestAddSchedulerJob:
+    def test_add_scheduler_job_uses_definition_executor(self):
+        scheduler = MagicMock()
+        schedule_params = {"trigger": "date", "executor": "processpool"}
+
+        commands.add_scheduler_job(scheduler, 1, schedule_params)
+        commands.add_scheduler_job(scheduler, 2, {"trigger": "date"})
+
+        first_call, second_call = scheduler.add_job.call_args_list
+        assert first_call.kwargs["executor"] == "processpool"
+        assert second_call.kwargs["executor"] == "default"
+        assert schedule_params["executor"] == "processpool"
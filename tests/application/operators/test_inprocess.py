@@ -0,0 +1,79 @@
+import pytest
+from workflower.application.operators.inprocess import (
+    has_stuck_executions,
+    run_in_process,
+)
+
+
+@pytest.fixture
+def lines():
+    return []
+
+
+@pytest.fixture
+def on_line(lines):
+    def _on_line(line):
+        lines.append(line)
+        return False
+
+    return _on_line
+
+
+class TestRunInProcess:
+    """
+    Test case for run_in_process function.
+    """
+
+    def test_code_output_is_captured(cls, lines, on_line):
+        status = run_in_process(on_line, code="print('a')\nprint('b')")
+        assert status == "completed"
+        assert lines == ["a", "b"]
+
+    def test_script_gets_job_return_value(cls, tmpdir, lines, on_line):
+        script = tmpdir.join("script.py")
+        script.write("print(job_return_value)")
+        status = run_in_process(
+            on_line,
+            script_path=str(script),
+            init_globals=dict(job_return_value="previous"),
+        )
+        assert status == "completed"
+        assert lines == ["previous"]
+
+    def test_error_traceback_is_captured(cls, lines, on_line):
+        status = run_in_process(on_line, code="raise ValueError('boom')")
+        assert status == "failed"
+        assert lines[-1] == "ValueError: boom"
+
+    def test_system_exit_zero_completes(cls, lines, on_line):
+        assert run_in_process(on_line, code="import sys; sys.exit(0)") == (
+            "completed"
+        )
+        assert run_in_process(on_line, code="import sys; sys.exit(2)") == (
+            "failed"
+        )
+
+    def test_run_is_aborted_when_on_line_returns_true(cls, lines):
+        def on_line(line):
+            lines.append(line)
+            return line == "stop"
+
+        status = run_in_process(
+            on_line, code="print('stop')\nprint('not printed')"
+        )
+        assert status == "aborted"
+        assert lines == ["stop"]
+
+    def test_run_times_out(cls, lines, on_line):
+        status = run_in_process(
+            on_line, code="while True:\n    pass", timeout=0.2
+        )
+        assert status == "timed_out"
+        assert not has_stuck_executions()
+
+    def test_run_blocked_on_a_call_is_stuck(cls, lines, on_line):
+        status = run_in_process(
+            on_line, code="import time\ntime.sleep(1.5)", timeout=0.1
+        )
+        assert status == "timed_out"
+        assert has_stuck_executions()
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from workflower.application.operators.operator import stop_process
+
+
+class TestStopProcess:
+    """
+    Test case for stop_process function.
+    """
+
+    def test_stopped_process_is_waited(cls):
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"]
+        )
+        stop_process(process)
+        assert process.returncode is not None
+
+    @pytest.mark.skipif(os.name == "nt", reason="terminate is kill on windows")
+    def test_process_ignoring_terminate_is_killed(cls):
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import signal, sys, time\n"
+                "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+                "print('ready', flush=True)\n"
+                "time.sleep(30)",
+            ],
+            stdout=subprocess.PIPE,
+        )
+        process.stdout.readline()
+        started_at = time.monotonic()
+        stop_process(process, timeout=0.2)
+        process.stdout.close()
+        assert process.returncode == -9
+        assert time.monotonic() - started_at < 5
@@ -1,4 +1,5 @@
 import os
+from unittest.mock import patch
 
 import pytest
 from workflower.application.workflow import commands
@@ -182,9 +183,7 @@ class TestUpdateModifiedWorkflowFileStateCommand:
         workflow = (
             session.query(Workflow).filter_by(id=new_workflow.id).first()
         )
-        assert workflow.file_last_modified_at == str(
-            os.path.getmtime(file_path)
-        )
+        assert workflow.file_last_modified_at == os.path.getmtime(file_path)
 
     def test_update_modified_file_state_command_updates_modified_since_load_f(
         self, session_factory, workflow_file, uow
@@ -360,10 +359,54 @@ class TestLoadWorkflowFromYamlFileCommand:
         assert workflow.jobs_count == 2
         assert workflow.jobs[0].name == "first_job"
         assert workflow.jobs[0].operator == "python"
-        assert workflow.jobs[0].depends_on is None
+        assert workflow.jobs[0].depends_on == []
         assert workflow.jobs[1].name == "second_job"
         assert workflow.jobs[1].operator == "python"
-        assert workflow.jobs[1].depends_on == str(workflow.jobs[0].id)
+        assert workflow.jobs[1].depends_on == [workflow.jobs[0]]
+        assert workflow.jobs[1].trigger_rule == "all_success"
+
+    def test_load_workflow_form_yaml_file_command_loads_workflow_fan_in_deps(
+        self, session_factory, tmpdir_factory, uow
+    ):
+        file_content = """
+        version: "1.0"
+        workflow:
+            name: fan_in
+            jobs:
+              - name: "join_job"
+                operator: python
+                code: "print('Join Job!')"
+                trigger: dependency
+                depends_on: ["first_job", "second_job"]
+                trigger_rule: one_success
+              - name: "first_job"
+                operator: python
+                code: "print('First Job!')"
+                trigger: date
+              - name: "second_job"
+                operator: python
+                code: "print('Second Job!')"
+                trigger: date
+        """
+        file_path = tmpdir_factory.mktemp("file").join("fan_in.yaml")
+        file_path.write_text(file_content, encoding="utf-8")
+        command = commands.LoadWorkflowFromYamlFileCommand(
+            unit_of_work=uow, file_path=str(file_path)
+        )
+        new_workflow = command.execute()
+
+        session = session_factory()
+        join_job = (
+            session.query(Job)
+            .filter_by(workflow_id=new_workflow.id, name="join_job")
+            .first()
+        )
+        assert sorted(job.name for job in join_job.depends_on) == [
+            "first_job",
+            "second_job",
+        ]
+        assert join_job.trigger_rule == "one_success"
+        assert join_job.depends_on[0].dependency_jobs == [join_job]
 
     def test_load_workflow_form_yaml_file_command_loads_workflow_job_exists(
         self, session_factory, workflow_file, uow
@@ -449,6 +492,50 @@ class TestLoadWorkflowFromYamlFileCommand:
         assert record.jobs[1].name == "second_job"
         assert record.jobs[1].operator == "python"
 
+    def test_load_workflow_form_yaml_file_command_commits_once(
+        self, workflow_file_with_dependencies, uow
+    ):
+        file_path = str(workflow_file_with_dependencies)
+        command = commands.LoadWorkflowFromYamlFileCommand(
+            unit_of_work=uow, file_path=file_path, trigger="on_demand"
+        )
+        with patch.object(
+            uow.session, "commit", wraps=uow.session.commit
+        ) as commit:
+            workflow = command.execute()
+
+        assert commit.call_count == 1
+        assert workflow.trigger == "on_demand"
+        assert workflow.is_active is True
+        assert workflow.jobs_count == 2
+
+    def test_load_workflow_form_yaml_file_command_deactivates_removed_jobs(
+        self, session_factory, workflow_file, uow
+    ):
+        new_workflow = Workflow(name="python_code_sample_interval_trigger")
+        removed_job = Job(
+            name="removed_job",
+            operator="python",
+            definition={"trigger": "interval"},
+            is_active=True,
+        )
+        with uow:
+            uow.workflows.add(new_workflow)
+            new_workflow.add_job(removed_job)
+
+        file_path = str(workflow_file)
+        command = commands.LoadWorkflowFromYamlFileCommand(
+            unit_of_work=uow, file_path=file_path
+        )
+        workflow = command.execute()
+
+        session = session_factory()
+        record = session.query(Job).filter_by(id=removed_job.id).first()
+        assert workflow.jobs_count == 1
+        assert workflow.jobs[0].name == "hello_python_code"
+        assert record.is_active is False
+        assert record.workflow_id is None
+
 
 class TestDeactivateWorkflowJobsCommand:
     def test_deactivate_workflow_jobs_command_should_update_is_active_false(
@@ -526,3 +613,110 @@ class TestActivateWorkflowJobsCommand:
         assert updated_record.jobs[0].name == "hello_python_code"
         assert updated_record.jobs[0].operator == "python"
         assert updated_record.jobs[0].is_active is True
+
+
+class TestScanWorkflowFilesCommand:
+    def test_scan_workflow_files_command_returns_new_files(
+        self, workflow_file, uow
+    ):
+        file_path = str(workflow_file)
+        command = commands.ScanWorkflowFilesCommand(
+            unit_of_work=uow, path=os.path.dirname(file_path)
+        )
+        modified_files, removed_files = command.execute()
+
+        assert len(modified_files) == 1
+        assert modified_files[0].file_path == file_path
+        assert modified_files[0].file_size == os.path.getsize(file_path)
+        assert removed_files == []
+
+    def test_scan_workflow_files_command_skips_indexed_files(
+        self, workflow_file, uow
+    ):
+        file_path = str(workflow_file)
+        command = commands.ScanWorkflowFilesCommand(
+            unit_of_work=uow, path=os.path.dirname(file_path)
+        )
+        modified_files, _ = command.execute()
+        index_command = commands.IndexWorkflowFilesCommand(
+            unit_of_work=uow, workflow_files=modified_files
+        )
+        index_command.execute()
+
+        modified_files, removed_files = command.execute()
+
+        assert modified_files == []
+        assert removed_files == []
+
+    def test_scan_workflow_files_command_skips_touched_files(
+        self, workflow_file, uow
+    ):
+        file_path = str(workflow_file)
+        command = commands.ScanWorkflowFilesCommand(
+            unit_of_work=uow, path=os.path.dirname(file_path)
+        )
+        modified_files, _ = command.execute()
+        commands.IndexWorkflowFilesCommand(
+            unit_of_work=uow, workflow_files=modified_files
+        ).execute()
+
+        file_last_modified_at = os.path.getmtime(file_path) + 10
+        os.utime(file_path, (file_last_modified_at, file_last_modified_at))
+
+        modified_files, _ = command.execute()
+
+        assert modified_files == []
+        with uow:
+            indexed_file = uow.workflow_files.get(file_path=file_path)
+            assert indexed_file.file_last_modified_at == file_last_modified_at
+
+    def test_scan_workflow_files_command_returns_modified_files(
+        self, workflow_file, uow
+    ):
+        file_path = str(workflow_file)
+        command = commands.ScanWorkflowFilesCommand(
+            unit_of_work=uow, path=os.path.dirname(file_path)
+        )
+        modified_files, _ = command.execute()
+        commands.IndexWorkflowFilesCommand(
+            unit_of_work=uow, workflow_files=modified_files
+        ).execute()
+
+        with open(file_path, "a") as f:
+            f.write("# new line\n")
+
+        modified_files, _ = command.execute()
+
+        assert len(modified_files) == 1
+        assert modified_files[0].file_path == file_path
+
+    def test_scan_workflow_files_command_returns_removed_files(
+        self, session_factory, workflow_file, uow
+    ):
+        file_path = str(workflow_file)
+        new_workflow = Workflow(
+            name="python_code_sample_interval_trigger",
+            file_path=file_path,
+            file_exists=True,
+        )
+        with uow:
+            uow.workflows.add(new_workflow)
+        command = commands.ScanWorkflowFilesCommand(
+            unit_of_work=uow, path=os.path.dirname(file_path)
+        )
+        modified_files, _ = command.execute()
+        commands.IndexWorkflowFilesCommand(
+            unit_of_work=uow, workflow_files=modified_files
+        ).execute()
+
+        os.remove(file_path)
+
+        modified_files, removed_files = command.execute()
+
+        assert modified_files == []
+        assert removed_files == [file_path]
+        session = session_factory()
+        workflow = (
+            session.query(Workflow).filter_by(id=new_workflow.id).first()
+        )
+        assert workflow.file_exists is False
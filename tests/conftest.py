@@ -4,14 +4,29 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm import Session, clear_mappers, sessionmaker
+from sqlalchemy.pool import StaticPool
 from workflower.adapters.sqlalchemy.orm import run_mappers
 from workflower.adapters.sqlalchemy.setup import metadata
 from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
+from workflower.adapters.sqlalchemy.writer import DatabaseWriter
+from workflower.services.schema.cache import definition_cache
 from workflower.domain.entities.event import Event
 from workflower.domain.entities.job import Job
 from workflower.domain.entities.workflow import Workflow
 
 
+@pytest.fixture(autouse=True)
+def isolated_definition_cache(tmpdir_factory, monkeypatch):
+    monkeypatch.setattr(
+        definition_cache,
+        "directory",
+        str(tmpdir_factory.mktemp("definitions")),
+    )
+    definition_cache.clear()
+    yield definition_cache
+    definition_cache.clear()
+
+
 @pytest.fixture
 def workflow_factory():
     def _workflow_factory(
@@ -72,7 +87,12 @@ def event_factory():
 
 @pytest.fixture
 def in_memory_db() -> Engine:
-    engine = create_engine("sqlite:///:memory:")
+    # Shared by the database writer thread
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     metadata.create_all(engine)
     return engine
 
@@ -84,6 +104,13 @@ def session_factory(in_memory_db) -> Generator[sessionmaker, None, None]:
     clear_mappers()
 
 
+@pytest.fixture
+def writer(session_factory) -> Generator[DatabaseWriter, None, None]:
+    writer = DatabaseWriter(session_factory)
+    yield writer
+    writer.stop()
+
+
 @pytest.fixture
 def session(session_factory) -> Session:
     return session_factory()
@@ -0,0 +1,64 @@
+import os
+
+from workflower.services.schema.cache import DefinitionCache
+
+
+class TestDefinitionCache:
+    def test_definition_cache_returns_cached_value(self):
+        cache = DefinitionCache()
+        key = cache.make_key("hash", "file.yml", 1)
+        cache.set(key, dict(name="workflow", jobs=[dict(name="job")]))
+
+        assert cache.get(key) == dict(name="workflow", jobs=[dict(name="job")])
+        assert cache.get(cache.make_key("hash", "file.yml", 2)) is None
+
+    def test_definition_cache_returns_copies(self):
+        cache = DefinitionCache()
+        cache.set("key", dict(jobs=[]))
+        cache.get("key")["jobs"].append("job")
+
+        assert cache.get("key") == dict(jobs=[])
+
+    def test_definition_cache_evicts_least_recently_used(self):
+        cache = DefinitionCache(memory_size=2)
+        cache.set("first", dict(name="first"))
+        cache.set("second", dict(name="second"))
+        cache.get("first")
+        cache.set("third", dict(name="third"))
+
+        assert cache.get("first") == dict(name="first")
+        assert cache.get("second") is None
+        assert cache.get("third") == dict(name="third")
+
+    def test_definition_cache_reads_from_disk(self, tmpdir_factory):
+        directory = str(tmpdir_factory.mktemp("definitions"))
+        DefinitionCache(directory=directory).set("key", dict(name="first"))
+
+        assert DefinitionCache(directory=directory).get("key") == dict(
+            name="first"
+        )
+
+    def test_definition_cache_evicts_disk_entries(self, tmpdir_factory):
+        directory = str(tmpdir_factory.mktemp("definitions"))
+        cache = DefinitionCache(directory=directory, disk_size=2)
+        for index, key in enumerate(["first", "second", "third"]):
+            cache.set(key, dict(name=key))
+            file_path = os.path.join(directory, key + cache.file_extension)
+            os.utime(file_path, (index, index))
+
+        cache.set("fourth", dict(name="fourth"))
+
+        assert sorted(os.listdir(directory)) == [
+            "fourth" + cache.file_extension,
+            "third" + cache.file_extension,
+        ]
+
+    def test_definition_cache_discards_invalid_entries(self, tmpdir_factory):
+        directory = str(tmpdir_factory.mktemp("definitions"))
+        cache = DefinitionCache(directory=directory)
+        file_path = os.path.join(directory, "key" + cache.file_extension)
+        with open(file_path, "wb") as f:
+            f.write(b"invalid")
+
+        assert cache.get("key") is None
+        assert os.listdir(directory) == []
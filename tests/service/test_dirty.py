@@ -0,0 +1,31 @@
+from workflower.services.workflow.dirty import DirtyWorkflows
+
+
+class TestDirtyWorkflows:
+    def test_dirty_workflows_drain_returns_and_clears_changes(self):
+        dirty_workflows = DirtyWorkflows()
+        dirty_workflows.mark_file_paths(["first.yml", "second.yml"])
+        dirty_workflows.mark_job("1")
+        dirty_workflows.mark_job(2)
+
+        file_paths, job_ids = dirty_workflows.drain()
+
+        assert file_paths == {"first.yml", "second.yml"}
+        assert job_ids == {1, 2}
+        assert dirty_workflows.drain() == (set(), set())
+
+    def test_dirty_workflows_ignores_non_workflow_jobs(self):
+        dirty_workflows = DirtyWorkflows()
+        dirty_workflows.mark_job("maintenance")
+
+        assert dirty_workflows.drain() == (set(), set())
+
+    def test_dirty_workflows_has_changes_until_drained(self):
+        dirty_workflows = DirtyWorkflows()
+        assert not dirty_workflows.has_changes()
+
+        dirty_workflows.mark_job("1")
+
+        assert dirty_workflows.has_changes()
+        dirty_workflows.drain()
+        assert not dirty_workflows.has_changes()
@@ -0,0 +1,303 @@
+from unittest.mock import patch
+
+from workflower.domain.entities.job import Job
+from workflower.domain.entities.workflow import Workflow
+from workflower.services.workflow.graph import DependencyGraph, DependencyNode
+from workflower.utils.pattern import PatternMatcher
+
+match = PatternMatcher.match
+
+
+def create_job(job_id, depends_on=(), workflow_id=1, **attributes):
+    job = Job(
+        name=f"job_{job_id}",
+        operator="python",
+        definition={},
+        depends_on=[create_job(dependency) for dependency in depends_on],
+        **attributes,
+    )
+    job.id = job_id
+    job.workflow_id = workflow_id
+    return job
+
+
+def create_node(
+    job_id,
+    depends_on=(),
+    workflow_id=1,
+    dependency_logs_pattern=None,
+    run_if_pattern_match=True,
+    trigger_rule=None,
+    **attributes,
+):
+    return DependencyNode(
+        create_job(
+            job_id,
+            depends_on,
+            workflow_id,
+            dependency_logs_pattern=dependency_logs_pattern,
+            run_if_pattern_match=run_if_pattern_match,
+            trigger_rule=trigger_rule,
+            **attributes,
+        )
+    )
+
+
+def completed_jobs(ready_jobs):
+    return [
+        (node.id, job_return_value) for node, job_return_value in ready_jobs
+    ]
+
+
+class TestDependencyNode:
+    def test_dependency_node_should_run_without_pattern(self):
+        node = create_node(2, depends_on=[1])
+
+        assert node.should_run(None)
+        assert node.depends_on == (1,)
+        assert node.trigger_rule == "all_success"
+
+    def test_dependency_node_should_run_if_pattern_match(self):
+        node = create_node(2, depends_on=[1], dependency_logs_pattern="Done")
+
+        assert node.should_run(True)
+        assert not node.should_run(False)
+        assert node.get_pattern() == (2, "Done", "literal", False)
+
+    def test_dependency_node_should_run_if_pattern_does_not_match(self):
+        node = create_node(
+            2,
+            depends_on=[1],
+            dependency_logs_pattern="error",
+            run_if_pattern_match=False,
+        )
+
+        assert not node.should_run(True)
+        assert node.should_run(False)
+
+
+class TestDependencyGraph:
+    def test_dependency_graph_returns_dependency_jobs(self):
+        graph = DependencyGraph()
+        graph.replace(
+            {
+                1: [
+                    create_node(1),
+                    create_node(2, depends_on=[1]),
+                    create_node(3, depends_on=[1]),
+                    create_node(4, depends_on=[2, 3]),
+                ]
+            }
+        )
+
+        assert graph.is_loaded
+        assert [node.id for node in graph.get_dependency_jobs("1")] == [2, 3]
+        assert [node.id for node in graph.get_dependency_jobs(2)] == [4]
+        assert [node.id for node in graph.get_dependency_jobs(3)] == [4]
+        assert graph.get_dependency_jobs(4) == []
+        assert graph.get_dependency_jobs("maintenance") == []
+
+    def test_dependency_graph_completes_job_with_pattern(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1,
+            [
+                create_node(1),
+                create_node(2, depends_on=[1], dependency_logs_pattern="done"),
+                create_node(3, depends_on=[1], dependency_logs_pattern="fail"),
+            ],
+        )
+
+        ready_jobs = graph.complete_job("1", "Done")
+
+        assert completed_jobs(ready_jobs) == [(2, "Done")]
+        assert graph.complete_job("1", "Done", succeeded=False) == []
+
+    def test_dependency_graph_completes_job_with_pattern_modes(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1,
+            [
+                create_node(1),
+                create_node(
+                    2,
+                    depends_on=[1],
+                    dependency_logs_pattern=r"rows: [1-9]\d*",
+                    dependency_logs_pattern_mode="regex",
+                ),
+                create_node(
+                    3,
+                    depends_on=[1],
+                    dependency_logs_pattern="ERROR",
+                    dependency_logs_pattern_case_sensitive=True,
+                    run_if_pattern_match=False,
+                ),
+                create_node(4, depends_on=[1], dependency_logs_pattern="ROWS"),
+            ],
+        )
+
+        with patch.object(
+            PatternMatcher, "match", autospec=True, side_effect=match
+        ) as mock:
+            ready_jobs = graph.complete_job(1, "Rows: 10, error: none")
+
+        assert mock.call_count == 1
+        assert [node.id for node, _ in ready_jobs] == [2, 3, 4]
+        assert graph.complete_job(1, "rows: 0, ERROR") == [
+            (graph.get_dependency_jobs(1)[2], "rows: 0, ERROR")
+        ]
+
+    def test_dependency_graph_joins_all_success(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1, [create_node(1), create_node(2), create_node(3, [1, 2])]
+        )
+
+        assert graph.complete_job(1, "first") == []
+        ready_jobs = graph.complete_job(2, "second")
+
+        assert completed_jobs(ready_jobs) == [
+            (3, {"job_1": "first", "job_2": "second"})
+        ]
+
+    def test_dependency_graph_join_starts_over_after_failure(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1, [create_node(1), create_node(2), create_node(3, [1, 2])]
+        )
+
+        assert graph.complete_job(1, "error", succeeded=False) == []
+        assert graph.complete_job(2, "second") == []
+        assert graph.complete_job(1, "first") == []
+        assert len(graph.complete_job(2, "second")) == 1
+
+    def test_dependency_graph_joins_one_success(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1,
+            [
+                create_node(1),
+                create_node(2),
+                create_node(3, [1, 2], trigger_rule="one_success"),
+            ],
+        )
+
+        assert completed_jobs(graph.complete_job(2, "second")) == [
+            (3, {"job_2": "second"})
+        ]
+        assert graph.complete_job(1, "first") == []
+        assert len(graph.complete_job(1, "first")) == 1
+
+    def test_dependency_graph_joins_all_done(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1,
+            [
+                create_node(1),
+                create_node(2),
+                create_node(3, [1, 2], trigger_rule="all_done"),
+            ],
+        )
+
+        assert graph.complete_job(1, "error", succeeded=False) == []
+        assert len(graph.complete_job(2, "second")) == 1
+
+    def test_dependency_graph_returns_ready_jobs_in_topological_order(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1,
+            [
+                create_node(1),
+                create_node(3),
+                create_node(2, [3, 1], trigger_rule="one_success"),
+                create_node(4, [1]),
+            ],
+        )
+
+        ready_jobs = graph.complete_job(1, None)
+
+        assert [node.id for node, _ in ready_jobs] == [4, 2]
+
+    def test_dependency_graph_keeps_joins_when_workflow_is_replaced(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1, [create_node(1), create_node(2), create_node(3, [1, 2])]
+        )
+        graph.complete_job(1, "first")
+
+        graph.set_workflow(
+            1, [create_node(1), create_node(2), create_node(3, [1, 2])]
+        )
+
+        assert len(graph.complete_job(2, "second")) == 1
+
+    def test_dependency_graph_replaces_workflow_jobs(self):
+        graph = DependencyGraph()
+        graph.set_workflow(1, [create_node(1), create_node(2, [1])])
+        graph.set_workflow(
+            2, [create_node(3), create_node(4, [3], workflow_id=2)]
+        )
+
+        graph.set_workflow(1, [create_node(1), create_node(5, [1])])
+        graph.remove_workflow(2)
+
+        assert [node.id for node in graph.get_dependency_jobs(1)] == [5]
+        assert graph.get_dependency_jobs(3) == []
+
+    def test_dependency_graph_removes_jobs(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1, [create_node(1), create_node(2, [1]), create_node(3, [1])]
+        )
+
+        graph.remove_jobs([2])
+
+        assert [node.id for node in graph.get_dependency_jobs(1)] == [3]
+
+    def test_dependency_graph_loads_active_workflows(self, uow):
+        workflow = Workflow(name="workflow")
+        first_job = Job(name="first", operator="python", definition={})
+        second_job = Job(
+            name="second",
+            operator="python",
+            definition={},
+            depends_on=[first_job],
+        )
+        with uow:
+            uow.workflows.add(workflow)
+            workflow.add_job(first_job)
+            workflow.add_job(second_job)
+        graph = DependencyGraph()
+
+        graph.load(uow)
+
+        assert graph.is_loaded
+        dependency_jobs = graph.get_dependency_jobs(first_job.id)
+        assert [node.name for node in dependency_jobs] == ["second"]
+
+    def test_dependency_graph_releases_job_on_logs_match(self):
+        graph = DependencyGraph()
+        graph.set_workflow(
+            1,
+            [
+                create_node(1),
+                create_node(
+                    2,
+                    [1],
+                    dependency_logs_pattern="ready",
+                    early_trigger="release",
+                ),
+                create_node(3, [1], dependency_logs_pattern="ready"),
+            ],
+        )
+
+        assert graph.get_stream_patterns(1) == [
+            ((2, "ready", "literal", False), "release")
+        ]
+        assert completed_jobs(graph.release_job(1, 2, "ready")) == [
+            (2, "ready")
+        ]
+        assert graph.release_job(1, 2, "ready") == []
+        assert graph.release_job(1, 3, "ready") == []
+        assert completed_jobs(graph.complete_job(1, "ready")) == [(3, "ready")]
+        assert len(graph.complete_job(1, "ready")) == 2
@@ -0,0 +1,52 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from workflower.domain.entities.workflow_file import WorkflowFile
+from workflower.services.workflow.loader import WorkflowLoaderService
+
+WORKFLOW_FILE_CONTENT = """
+version: "1.0"
+workflow:
+  name: {name}
+  jobs:
+    - name: "hello_python_code"
+      operator: python
+      code: "print('Hello, World!')"
+      trigger: interval
+      minutes: 2
+"""
+
+
+@pytest.fixture
+def writer(writer):
+    with patch(
+        "workflower.services.workflow.loader.database_writer", writer
+    ), patch("workflower.services.workflow.loader.dirty_workflows"):
+        yield writer
+
+
+@pytest.fixture
+def workflows_dir(tmpdir_factory):
+    workflows_dir = tmpdir_factory.mktemp("workflows")
+    workflows_dir.join("loaded.yml").write(
+        WORKFLOW_FILE_CONTENT.format(name="loaded")
+    )
+    workflows_dir.join("mismatch.yml").write(
+        WORKFLOW_FILE_CONTENT.format(name="other_name")
+    )
+    return str(workflows_dir)
+
+
+class TestWorkflowLoaderService:
+    def test_loader_indexes_only_loaded_files(
+        self, writer, session, workflows_dir
+    ):
+        workflows = WorkflowLoaderService().load_all_from_dir(workflows_dir)
+
+        assert [workflow["name"] for workflow in workflows] == ["loaded"]
+        indexed_files = session.query(WorkflowFile).all()
+        assert [
+            os.path.basename(workflow_file.file_path)
+            for workflow_file in indexed_files
+        ] == ["loaded.yml"]
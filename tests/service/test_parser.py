@@ -0,0 +1,111 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+from workflower.application.exceptions import InvalidSchemaError
+from workflower.services.schema.parser import (
+    get_job_default_executor,
+    parse_workflow_file,
+)
+
+
+class TestParseWorkflowFile:
+    def test_parse_workflow_file_returns_workflow_dict(self, workflow_file):
+        file_path = str(workflow_file)
+        workflow_dict = parse_workflow_file(file_path)
+
+        assert workflow_dict["name"] == "python_code_sample_interval_trigger"
+        assert workflow_dict["file_path"] == file_path
+        assert len(workflow_dict["jobs"]) == 1
+        assert workflow_dict["jobs"][0]["name"] == "hello_python_code"
+        assert workflow_dict["jobs"][0]["operator"] == "python"
+        assert workflow_dict["jobs"][0]["depends_on"] == []
+        assert workflow_dict["jobs"][0]["trigger_rule"] is None
+        assert workflow_dict["jobs"][0]["definition"]["trigger"] == "interval"
+        assert workflow_dict["jobs"][0]["definition"]["executor"] == (
+            "subprocess"
+        )
+
+    def test_parse_workflow_file_runs_in_process_python_on_warm_workers(
+        self, tmpdir_factory
+    ):
+        file_content = """
+        version: "1.0"
+        workflow:
+            name: in_process
+            jobs:
+              - name: "hello_python_code"
+                operator: python
+                code: "print('Hello, World!')"
+                isolation: none
+                trigger: interval
+                minutes: 2
+        """
+        p = tmpdir_factory.mktemp("file").join("in_process.yaml")
+        p.write_text(file_content, encoding="utf-8")
+
+        workflow_dict = parse_workflow_file(str(p))
+
+        assert (
+            workflow_dict["jobs"][0]["definition"]["executor"]
+            == "warm_processpool"
+        )
+
+    def test_parse_workflow_file_result_can_be_pickled(self, workflow_file):
+        workflow_dict = parse_workflow_file(str(workflow_file))
+
+        assert pickle.loads(pickle.dumps(workflow_dict)) == workflow_dict
+
+    def test_parse_workflow_file_returns_none_if_name_mismatch(
+        self, tmpdir_factory
+    ):
+        file_content = """
+        version: "1.0"
+        workflow:
+            name: python_code_sample_interval_trigger
+            jobs:
+              - name: "hello_python_code"
+                operator: python
+                code: "print('Hello, World!')"
+                trigger: interval
+                minutes: 2
+        """
+        p = tmpdir_factory.mktemp("file").join("_disabled.yaml")
+        p.write_text(file_content, encoding="utf-8")
+
+        assert parse_workflow_file(str(p)) is None
+
+    def test_parse_workflow_file_uses_cached_definition(self, workflow_file):
+        file_path = str(workflow_file)
+        first_workflow_dict = parse_workflow_file(file_path)
+
+        with patch(
+            "workflower.services.schema.parser.yaml_file_to_dict"
+        ) as yaml_file_to_dict:
+            workflow_dict = parse_workflow_file(file_path)
+
+        assert yaml_file_to_dict.call_count == 0
+        assert workflow_dict == first_workflow_dict
+
+    def test_parse_workflow_file_parses_modified_file(self, workflow_file):
+        file_path = str(workflow_file)
+        parse_workflow_file(file_path)
+        file_content = workflow_file.read_text("utf-8")
+        workflow_file.write_text(
+            file_content.replace("minutes: 2", "minutes: 3"), encoding="utf-8"
+        )
+
+        workflow_dict = parse_workflow_file(file_path)
+
+        assert workflow_dict["jobs"][0]["definition"]["minutes"] == 3
+
+
+class TestGetJobDefaultExecutor:
+    def test_get_job_default_executor_of_operator(self):
+        assert get_job_default_executor(dict(operator="module")) == (
+            "warm_processpool"
+        )
+
+    def test_get_job_default_executor_raises_on_unknown_operator(self):
+        with pytest.raises(InvalidSchemaError):
+            get_job_default_executor(dict(operator="bash"))
@@ -0,0 +1,210 @@
+import datetime
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+from workflower.domain.entities.event import Event
+from workflower.domain.entities.job import Job
+from workflower.domain.entities.workflow import Workflow
+from workflower.services.workflow.graph import DependencyGraph
+from workflower.services.workflow.reconciler import WorkflowReconciler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = MagicMock()
+    scheduler.get_jobs.return_value = []
+    scheduler.add_job.return_value.next_run_time = datetime.datetime(
+        2022, 1, 1, 10, 0, tzinfo=datetime.timezone.utc
+    )
+    return scheduler
+
+
+def create_workflow(uow, tmpdir_factory, name, jobs_count=1):
+    file_path = tmpdir_factory.mktemp("workflows").join(f"{name}.yml")
+    file_path.write_text("version: '1.0'\n", encoding="utf-8")
+    workflow = Workflow(
+        name=name,
+        trigger="on_schedule",
+        file_path=str(file_path),
+        file_exists=True,
+    )
+    with uow:
+        uow.workflows.add(workflow)
+        for index in range(jobs_count):
+            workflow.add_job(
+                Job(
+                    name=f"job_{index}",
+                    operator="python",
+                    definition=dict(trigger="interval", minutes=1, kwargs={}),
+                )
+            )
+    return workflow
+
+
+class TestWorkflowReconciler:
+    def test_reconciler_schedules_active_jobs(
+        self, session_factory, tmpdir_factory, uow, scheduler, writer
+    ):
+        workflow = create_workflow(uow, tmpdir_factory, "first", 2)
+        with uow:
+            workflow.jobs[1].depends_on = [workflow.jobs[0]]
+            job_id = workflow.jobs[0].id
+
+        WorkflowReconciler(uow, scheduler, writer=writer).reconcile()
+
+        assert scheduler.add_job.call_count == 1
+        assert scheduler.add_job.call_args.kwargs["id"] == str(job_id)
+        session = session_factory()
+        job = session.query(Job).filter_by(id=job_id).first()
+        assert job.status == "scheduled"
+        assert job.next_run_time == datetime.datetime(
+            2022, 1, 1, 10, 0, tzinfo=datetime.timezone.utc
+        )
+        events = session.query(Event).all()
+        assert [event.name for event in events] == ["job_scheduled"]
+
+    def test_reconciler_updates_next_run_time_of_scheduled_jobs(
+        self, session_factory, tmpdir_factory, uow, scheduler, writer
+    ):
+        workflow = create_workflow(uow, tmpdir_factory, "first")
+        job_id = workflow.jobs[0].id
+        time_zone = datetime.timezone(datetime.timedelta(hours=-3))
+        scheduled_job = MagicMock(
+            id=str(job_id),
+            next_run_time=datetime.datetime(
+                2022, 1, 2, 7, 0, tzinfo=time_zone
+            ),
+        )
+        scheduler.get_jobs.return_value = [scheduled_job]
+
+        WorkflowReconciler(uow, scheduler, writer=writer).reconcile()
+
+        assert scheduler.add_job.call_count == 0
+        session = session_factory()
+        job = session.query(Job).filter_by(id=job_id).first()
+        assert job.next_run_time == datetime.datetime(
+            2022, 1, 2, 10, 0, tzinfo=datetime.timezone.utc
+        )
+        assert session.query(Event).all() == []
+
+    def test_reconciler_unschedules_jobs_of_removed_files(
+        self, session_factory, tmpdir_factory, uow, scheduler, writer
+    ):
+        workflow = create_workflow(uow, tmpdir_factory, "first")
+        job_id = workflow.jobs[0].id
+        workflow_id = workflow.id
+        scheduler.get_jobs.return_value = [MagicMock(id=str(job_id))]
+        os.remove(workflow.file_path)
+
+        WorkflowReconciler(uow, scheduler, writer=writer).reconcile()
+
+        scheduler.remove_job.assert_called_once_with(str(job_id))
+        session = session_factory()
+        record = session.query(Workflow).filter_by(id=workflow_id).first()
+        job = session.query(Job).filter_by(id=job_id).first()
+        assert record.file_exists is False
+        assert record.is_active is False
+        assert job.is_active is False
+        assert job.status == "unscheduled"
+        events = session.query(Event).all()
+        assert [event.name for event in events] == ["job_unscheduled"]
+
+    def test_reconciler_removes_jobs_without_workflow(
+        self, session_factory, uow, scheduler, writer
+    ):
+        job = Job(
+            name="dangling",
+            operator="python",
+            definition=dict(trigger="interval", minutes=1, kwargs={}),
+        )
+        with uow:
+            uow.jobs.add(job)
+
+        WorkflowReconciler(uow, scheduler, writer=writer).reconcile()
+
+        session = session_factory()
+        assert session.query(Job).all() == []
+
+    def test_reconciler_statements_do_not_grow_with_jobs(
+        self, in_memory_db, tmpdir_factory, uow, scheduler, writer
+    ):
+        statements = []
+
+        def count_statement(*args):
+            statements.append(args)
+
+        def count_reconcile_statements(workflows_count):
+            for index in range(workflows_count):
+                create_workflow(
+                    uow, tmpdir_factory, f"workflow_{workflows_count}_{index}"
+                )
+            statements.clear()
+            event.listen(
+                in_memory_db, "before_cursor_execute", count_statement
+            )
+            try:
+                WorkflowReconciler(uow, scheduler, writer=writer).reconcile()
+            finally:
+                event.remove(
+                    in_memory_db, "before_cursor_execute", count_statement
+                )
+            with uow:
+                for workflow in uow.workflows.list():
+                    workflow.trigger = "on_demand"
+            return len(statements)
+
+        assert count_reconcile_statements(2) == count_reconcile_statements(20)
+
+    def test_reconciler_visits_only_changed_workflows(
+        self, tmpdir_factory, uow, scheduler, writer
+    ):
+        first_workflow = create_workflow(uow, tmpdir_factory, "first")
+        create_workflow(uow, tmpdir_factory, "second")
+        third_workflow = create_workflow(uow, tmpdir_factory, "third")
+        first_job_id = first_workflow.jobs[0].id
+        third_job_id = third_workflow.jobs[0].id
+
+        WorkflowReconciler(uow, scheduler, writer=writer).reconcile(
+            file_paths=[first_workflow.file_path], job_ids=[third_job_id]
+        )
+
+        scheduled_ids = {
+            call.kwargs["id"] for call in scheduler.add_job.call_args_list
+        }
+        assert scheduled_ids == {str(first_job_id), str(third_job_id)}
+
+    def test_reconciler_updates_dependency_graph(
+        self, tmpdir_factory, uow, scheduler, writer
+    ):
+        first_workflow = create_workflow(uow, tmpdir_factory, "first", 3)
+        second_workflow = create_workflow(uow, tmpdir_factory, "second", 2)
+        with uow:
+            first_workflow.jobs[1].depends_on = [first_workflow.jobs[0]]
+            first_workflow.jobs[2].depends_on = [first_workflow.jobs[0]]
+            second_workflow.jobs[1].depends_on = [second_workflow.jobs[0]]
+            first_job_id = first_workflow.jobs[0].id
+            dependency_jobs_ids = [
+                first_workflow.jobs[1].id,
+                first_workflow.jobs[2].id,
+            ]
+            second_job_id = second_workflow.jobs[0].id
+        graph = DependencyGraph()
+        reconciler = WorkflowReconciler(
+            uow, scheduler, writer=writer, graph=graph
+        )
+
+        reconciler.reconcile()
+
+        assert graph.is_loaded
+        assert [
+            node.id for node in graph.get_dependency_jobs(first_job_id)
+        ] == dependency_jobs_ids
+        assert len(graph.get_dependency_jobs(second_job_id)) == 1
+
+        os.remove(second_workflow.file_path)
+        reconciler.reconcile(file_paths=[second_workflow.file_path])
+
+        assert graph.get_dependency_jobs(second_job_id) == []
+        assert len(graph.get_dependency_jobs(first_job_id)) == 2
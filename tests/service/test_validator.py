@@ -260,6 +260,176 @@ class TestJobSchemaValidation:
         pass
 
 
+class TestDependencyJobSchemaValidation:
+    @pytest.fixture(scope="function")
+    def jobs_names(cls):
+        return ["first_job", "second_job", "join_job"]
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            ({"name": "join_job", "depends_on": "first_job"}),
+            ({"name": "join_job", "depends_on": ["first_job", "second_job"]}),
+        ],
+    )
+    def test_dependency_trigger_depends_on_existing_job(
+        cls, test_input, jobs_names
+    ):
+        """
+        Dependency trigger depends_on may be a job name or a list of them.
+        """
+        assert (
+            validator.dependency_trigger_depends_on_existing_job(
+                test_input, jobs_names
+            )
+            is True
+        )
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            ({"name": "join_job", "depends_on": "missing_job"}),
+            ({"name": "join_job", "depends_on": ["first_job", "missing"]}),
+            ({"name": "join_job", "depends_on": ["join_job"]}),
+            ({"name": "join_job", "depends_on": []}),
+        ],
+    )
+    def test_dependency_trigger_depends_on_existing_job_not_existing(
+        cls, test_input, jobs_names
+    ):
+        with pytest.raises(InvalidSchemaError):
+            validator.dependency_trigger_depends_on_existing_job(
+                test_input, jobs_names
+            )
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            ({"depends_on": 1}),
+            ({"depends_on": {"name": "first_job"}}),
+            ({"depends_on": ["first_job", 1]}),
+        ],
+    )
+    def test_dependency_trigger_depends_on_is_string_or_list_type_not(
+        cls, test_input
+    ):
+        with pytest.raises(InvalidTypeError):
+            validator.dependency_trigger_depends_on_is_string_or_list_type(
+                test_input
+            )
+
+    def test_dependency_trigger_rule_has_expected_options(cls):
+        assert validator.dependency_trigger_rule_has_expected_options(
+            {"trigger_rule": "one_success"}
+        )
+        with pytest.raises(InvalidSchemaError):
+            validator.dependency_trigger_rule_has_expected_options(
+                {"trigger_rule": "any"}
+            )
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            ({"dependency_logs_pattern": "done"}),
+            (
+                {
+                    "dependency_logs_pattern": r"rows: \d+",
+                    "dependency_logs_pattern_mode": "regex",
+                }
+            ),
+        ],
+    )
+    def test_dependency_logs_pattern_is_valid(cls, test_input):
+        assert validator.dependency_logs_pattern_is_valid(test_input) is True
+
+    @pytest.mark.parametrize(
+        "test_input",
+        [
+            (
+                {
+                    "dependency_logs_pattern": "done",
+                    "dependency_logs_pattern_mode": "glob",
+                }
+            ),
+            (
+                {
+                    "dependency_logs_pattern": "rows: (",
+                    "dependency_logs_pattern_mode": "regex",
+                }
+            ),
+        ],
+    )
+    def test_dependency_logs_pattern_is_valid_not_valid(cls, test_input):
+        with pytest.raises(InvalidSchemaError):
+            validator.dependency_logs_pattern_is_valid(test_input)
+
+    def test_job_executor_has_expected_options(cls):
+        assert validator.job_executor_has_expected_options(
+            {"executor": "processpool"}
+        )
+        assert validator.job_executor_has_expected_options({})
+        with pytest.raises(InvalidSchemaError):
+            validator.job_executor_has_expected_options({"executor": "gpu"})
+
+    def test_job_resource_pool_is_configured(cls):
+        with unittest.mock.patch.dict(
+            validator.Config.RESOURCE_POOLS, {"alteryx": 2}
+        ):
+            assert validator.job_resource_pool_is_configured(
+                {"resource_pool": "alteryx"}
+            )
+            with pytest.raises(InvalidSchemaError):
+                validator.job_resource_pool_is_configured(
+                    {"resource_pool": "gpu"}
+                )
+
+    def test_job_priority_is_int_type(cls):
+        assert validator.job_priority_is_int_type({"priority": 5})
+        assert validator.job_priority_is_int_type({})
+        with pytest.raises(InvalidTypeError):
+            validator.job_priority_is_int_type({"priority": "high"})
+
+    def test_dependency_early_trigger_has_expected_options(cls):
+        assert validator.dependency_early_trigger_has_expected_options(
+            {
+                "early_trigger": "abort",
+                "dependency_logs_pattern": "done",
+                "run_if_pattern_match": True,
+            }
+        )
+        with pytest.raises(InvalidSchemaError):
+            validator.dependency_early_trigger_has_expected_options(
+                {
+                    "early_trigger": "skip",
+                    "dependency_logs_pattern": "done",
+                    "run_if_pattern_match": True,
+                }
+            )
+        with pytest.raises(InvalidSchemaError):
+            validator.dependency_early_trigger_has_expected_options(
+                {"early_trigger": "release", "run_if_pattern_match": True}
+            )
+
+    def test_workflow_jobs_dependencies_are_acyclic(cls):
+        workflow_jobs = [
+            {"name": "first_job"},
+            {"name": "second_job", "depends_on": "first_job"},
+            {"name": "join_job", "depends_on": ["first_job", "second_job"]},
+        ]
+
+        assert validator.workflow_jobs_dependencies_are_acyclic(workflow_jobs)
+
+    def test_workflow_jobs_dependencies_are_acyclic_with_cycle(cls):
+        workflow_jobs = [
+            {"name": "first_job", "depends_on": "join_job"},
+            {"name": "second_job", "depends_on": "first_job"},
+            {"name": "join_job", "depends_on": ["second_job"]},
+        ]
+
+        with pytest.raises(InvalidSchemaError):
+            validator.workflow_jobs_dependencies_are_acyclic(workflow_jobs)
+
+
 class TestPapermillJobSchemaValidation:
     """
     Papermill operator schema validation.
@@ -570,4 +740,50 @@ class TestAlteryxJobSchemaValidation:
 
 
 class TestPythonJobSchemaValidation:
-    pass
+    def test_python_job_isolation_has_expected_options(cls):
+        assert validator.python_job_isolation_has_expected_options(
+            {"code": "print(1)", "isolation": "none"}
+        )
+        assert validator.python_job_isolation_has_expected_options(
+            {"code": "print(1)"}
+        )
+        with pytest.raises(InvalidSchemaError):
+            validator.python_job_isolation_has_expected_options(
+                {"code": "print(1)", "isolation": "docker"}
+            )
+        with pytest.raises(InvalidSchemaError):
+            validator.python_job_isolation_has_expected_options(
+                {
+                    "code": "print(1)",
+                    "isolation": "none",
+                    "requirements_path": "requirements.txt",
+                }
+            )
+
+    def test_python_job_without_isolation_needs_process_pool_executor(cls):
+        for executor in ["processpool", "warm_processpool"]:
+            assert validator.python_job_isolation_has_expected_options(
+                {"code": "print(1)", "isolation": "none", "executor": executor}
+            )
+        for executor in ["default", "subprocess"]:
+            with pytest.raises(InvalidSchemaError):
+                validator.python_job_isolation_has_expected_options(
+                    {
+                        "code": "print(1)",
+                        "isolation": "none",
+                        "executor": executor,
+                    }
+                )
+        assert validator.python_job_isolation_has_expected_options(
+            {"code": "print(1)", "executor": "subprocess"}
+        )
+
+    def test_python_job_timeout_is_positive_number(cls):
+        assert validator.python_job_timeout_is_positive_number(
+            {"timeout": 2.5}
+        )
+        assert validator.python_job_timeout_is_positive_number({})
+        with pytest.raises(InvalidTypeError):
+            validator.python_job_timeout_is_positive_number({"timeout": 0})
+        with pytest.raises(InvalidTypeError):
+            validator.python_job_timeout_is_positive_number({"timeout": "1m"})
@@ -0,0 +1,40 @@
+import asyncio
+import os
+
+from workflower.services.workflow.watcher import WorkflowDirectoryWatcher
+
+
+class TestWorkflowDirectoryWatcher:
+    def test_watcher_returns_changed_workflow_files(self, tmpdir_factory):
+        directory = str(tmpdir_factory.mktemp("workflows"))
+
+        async def watch():
+            watcher = WorkflowDirectoryWatcher(
+                directory, debounce=0.2, polling_interval=0.1
+            )
+            watcher.start(asyncio.get_event_loop())
+            try:
+                with open(os.path.join(directory, "first.yml"), "w") as f:
+                    f.write("version: '1.0'\n")
+                with open(os.path.join(directory, "notes.txt"), "w") as f:
+                    f.write("not a workflow\n")
+                return await watcher.get_changes(timeout=5)
+            finally:
+                watcher.stop()
+
+        changed_paths = asyncio.run(watch())
+
+        assert changed_paths == {os.path.join(directory, "first.yml")}
+
+    def test_watcher_returns_empty_set_on_timeout(self, tmpdir_factory):
+        directory = str(tmpdir_factory.mktemp("workflows"))
+
+        async def watch():
+            watcher = WorkflowDirectoryWatcher(directory, debounce=0.1)
+            watcher.start(asyncio.get_event_loop())
+            try:
+                return await watcher.get_changes(timeout=0.2)
+            finally:
+                watcher.stop()
+
+        assert asyncio.run(watch()) == set()
@@ -0,0 +1,358 @@
+import os
+import subprocess
+import time
+from unittest.mock import patch
+
+import pytest
+from workflower.utils.environment import (
+    EnvironmentCache,
+    KernelPool,
+    clone_venv,
+    create_venv,
+    discard_venv,
+    pip_install,
+    temporary_environment,
+)
+
+
+def _create_venv(name, environments_dir, with_pip=True):
+    env_path = os.path.join(environments_dir, name)
+    os.makedirs(os.path.join(env_path, "bin"))
+    return env_path, os.path.join(env_path, "bin", "python")
+
+
+class TestCloneVenv:
+    """
+    Test case for clone_venv function.
+    """
+
+    def test_cloned_environment_runs_on_its_own_prefix(cls, tmpdir):
+        template_path, _ = create_venv("template", str(tmpdir), False)
+        env_path, env_executable = clone_venv(
+            template_path, str(tmpdir.join("clone"))
+        )
+        process = subprocess.run(
+            [env_executable, "-c", "import sys; print(sys.prefix)"],
+            capture_output=True,
+            text=True,
+        )
+        assert os.path.samefile(process.stdout.strip(), env_path)
+
+    def test_clone_rewrites_template_path_on_scripts(cls, tmpdir):
+        template_path, template_executable = create_venv(
+            "template", str(tmpdir), False
+        )
+        scripts_dir = os.path.dirname(template_executable)
+        with open(os.path.join(scripts_dir, "tool"), "w") as script:
+            script.write(f"#!{template_executable}\n")
+        env_path, env_executable = clone_venv(
+            template_path, str(tmpdir.join("clone"))
+        )
+        cloned_script = os.path.join(os.path.dirname(env_executable), "tool")
+        with open(cloned_script) as script:
+            assert script.read() == f"#!{env_executable}\n"
+
+    @pytest.mark.skipif(os.name == "nt", reason="hard links need posix")
+    def test_clone_hard_links_files(cls, tmpdir):
+        template_path = tmpdir.mkdir("template")
+        template_path.mkdir("lib").join("module.py").write("x = 1")
+        env_path, _ = clone_venv(str(template_path), str(tmpdir.join("clone")))
+        assert os.path.samefile(
+            str(template_path.join("lib", "module.py")),
+            os.path.join(env_path, "lib", "module.py"),
+        )
+
+
+class TestDiscardVenv:
+    """
+    Test case for discard_venv function.
+    """
+
+    def test_discarded_environment_is_moved_out(cls, tmpdir):
+        env_path = tmpdir.mkdir("env")
+        env_path.join("file.txt").write("content")
+        discard_venv(str(env_path))
+        assert not os.path.exists(str(env_path))
+
+    def test_missing_environment_is_ignored(cls, tmpdir):
+        discard_venv(str(tmpdir.join("missing")))
+
+
+@pytest.fixture
+def requirements_factory(tmpdir):
+    def _requirements_factory(content, name="requirements.txt"):
+        path = tmpdir.join(name)
+        path.write(content)
+        return str(path)
+
+    return _requirements_factory
+
+
+@pytest.fixture
+def build_mocks():
+    with patch(
+        "workflower.utils.environment.create_venv", side_effect=_create_venv
+    ) as create_venv_mock, patch(
+        "workflower.utils.environment.install_requirements",
+        return_value=True,
+    ) as install_mock:
+        yield create_venv_mock, install_mock
+
+
+class TestEnvironmentCache:
+    """
+    Test case for EnvironmentCache class.
+    """
+
+    def test_same_requirements_reuse_environment(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        create_venv_mock, install_mock = build_mocks
+        cache = EnvironmentCache(str(tmpdir.join("cache")))
+        requirements_path = requirements_factory("pandas==1.4.0\n")
+        with cache.get_environment(requirements_path) as env_executable:
+            first_executable = env_executable
+        with cache.get_environment(requirements_path) as env_executable:
+            assert env_executable == first_executable
+        assert create_venv_mock.call_count == 1
+        assert install_mock.call_count == 1
+
+    def test_changed_requirements_build_new_environment(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        create_venv_mock, _ = build_mocks
+        cache = EnvironmentCache(str(tmpdir.join("cache")))
+        requirements_path = requirements_factory("pandas==1.4.0\n")
+        first_key = cache.make_key(requirements_path)
+        with cache.get_environment(requirements_path):
+            pass
+        requirements_factory("pandas==1.5.0\n")
+        assert cache.make_key(requirements_path) != first_key
+        with cache.get_environment(requirements_path):
+            pass
+        assert create_venv_mock.call_count == 2
+
+    def test_failed_install_environment_is_removed(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        _, install_mock = build_mocks
+        install_mock.return_value = False
+        cache = EnvironmentCache(str(tmpdir.join("cache")))
+        requirements_path = requirements_factory("not-a-package\n")
+        key = cache.make_key(requirements_path)
+        with cache.get_environment(requirements_path) as env_executable:
+            assert os.path.isdir(os.path.dirname(env_executable))
+        assert not cache.is_ready(key)
+        assert not os.path.isdir(os.path.join(cache.directory, key))
+
+    def test_least_recently_used_environments_are_evicted(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        cache = EnvironmentCache(str(tmpdir.join("cache")), max_environments=2)
+        requirements_paths = [
+            requirements_factory(f"package-{index}\n", f"{index}.txt")
+            for index in range(3)
+        ]
+        keys = [cache.make_key(path) for path in requirements_paths]
+        for requirements_path in requirements_paths[:2]:
+            with cache.get_environment(requirements_path):
+                pass
+            time.sleep(0.01)
+        # First environment is now the most recently used
+        with cache.get_environment(requirements_paths[0]):
+            pass
+        time.sleep(0.01)
+        with cache.get_environment(requirements_paths[2]):
+            pass
+        assert cache.is_ready(keys[0])
+        assert not cache.is_ready(keys[1])
+        assert cache.is_ready(keys[2])
+
+    def test_environment_in_use_is_not_evicted(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        cache = EnvironmentCache(str(tmpdir.join("cache")), max_environments=1)
+        first_path = requirements_factory("package-a\n", "a.txt")
+        second_path = requirements_factory("package-b\n", "b.txt")
+        with cache.get_environment(first_path):
+            with cache.get_environment(second_path):
+                pass
+            assert cache.is_ready(cache.make_key(first_path))
+        cache.evict()
+        assert (
+            cache.is_ready(cache.make_key(first_path))
+            + cache.is_ready(cache.make_key(second_path))
+            == 1
+        )
+
+    def test_prewarm_builds_environment(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        cache = EnvironmentCache(str(tmpdir.join("cache")))
+        requirements_path = requirements_factory("pandas==1.4.0\n")
+        cache.prewarm(requirements_path)
+        cache._prewarm_executor.shutdown(wait=True)
+        assert cache.is_ready(cache.make_key(requirements_path))
+
+
+@pytest.fixture
+def kernel_build_mocks():
+    with patch(
+        "workflower.utils.environment.create_venv", side_effect=_create_venv
+    ) as create_venv_mock, patch(
+        "workflower.utils.environment.install_kernel",
+        side_effect=lambda kernel_name, env_executable, kernel_specs_dir, *_: (
+            os.path.join(kernel_specs_dir, kernel_name),
+            True,
+        ),
+    ) as install_mock, patch(
+        "workflower.utils.environment.uninstall_kernel"
+    ) as uninstall_mock:
+        yield create_venv_mock, install_mock, uninstall_mock
+
+
+@pytest.fixture
+def kernel_pool_factory(tmpdir):
+    def _kernel_pool_factory(**kwargs):
+        return KernelPool(
+            str(tmpdir.join("kernels")), str(tmpdir.join("specs")), **kwargs
+        )
+
+    return _kernel_pool_factory
+
+
+class TestTemporaryEnvironment:
+    """
+    Test case for temporary_environment function.
+    """
+
+    def test_environment_is_created_and_removed_without_cache(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        create_venv_mock, install_mock = build_mocks
+        requirements_path = requirements_factory("pandas==1.4.0\n")
+        with patch(
+            "workflower.utils.environment.Config.ENVIRONMENT_CACHE", False
+        ), temporary_environment(
+            str(tmpdir), requirements_path
+        ) as env_executable:
+            assert os.path.isdir(os.path.dirname(env_executable))
+        assert not os.path.exists(os.path.dirname(env_executable))
+        assert create_venv_mock.call_count == 1
+        assert install_mock.call_args[0][1] == requirements_path
+        assert not os.path.exists(str(tmpdir.join("cache")))
+
+    def test_environment_is_cloned_from_cache(
+        cls, tmpdir, requirements_factory, build_mocks
+    ):
+        create_venv_mock, _ = build_mocks
+        requirements_path = requirements_factory("pandas==1.4.0\n")
+        with patch(
+            "workflower.utils.environment.Config.ENVIRONMENT_CACHE", True
+        ), patch(
+            "workflower.utils.environment.environment_cache",
+            EnvironmentCache(str(tmpdir.join("cache"))),
+        ):
+            for _ in range(2):
+                with temporary_environment(str(tmpdir), requirements_path):
+                    pass
+        assert create_venv_mock.call_count == 1
+
+
+class TestKernelPool:
+    """
+    Test case for KernelPool class.
+    """
+
+    def test_released_kernel_is_leased_again(
+        cls, kernel_pool_factory, kernel_build_mocks
+    ):
+        create_venv_mock, _, _ = kernel_build_mocks
+        pool = kernel_pool_factory()
+        with pool.lease() as kernel_name:
+            first_kernel_name = kernel_name
+        with pool.lease() as kernel_name:
+            assert kernel_name == first_kernel_name
+        assert create_venv_mock.call_count == 1
+
+    def test_leased_kernel_is_not_leased_twice(
+        cls, kernel_pool_factory, kernel_build_mocks
+    ):
+        pool = kernel_pool_factory()
+        with pool.lease() as first_kernel_name:
+            with pool.lease() as second_kernel_name:
+                assert first_kernel_name != second_kernel_name
+
+    def test_kernels_beyond_size_are_removed(
+        cls, kernel_pool_factory, kernel_build_mocks
+    ):
+        _, _, uninstall_mock = kernel_build_mocks
+        pool = kernel_pool_factory(size=1)
+        with pool.lease():
+            with pool.lease():
+                pass
+        assert uninstall_mock.call_count == 1
+        assert len(pool._list_kernels()) == 1
+
+    def test_kernel_is_recycled_after_max_uses(
+        cls, kernel_pool_factory, kernel_build_mocks
+    ):
+        create_venv_mock, _, _ = kernel_build_mocks
+        pool = kernel_pool_factory(max_uses=2)
+        for _ in range(3):
+            with pool.lease():
+                pass
+        assert create_venv_mock.call_count == 2
+
+    def test_idle_kernels_are_evicted(
+        cls, kernel_pool_factory, kernel_build_mocks
+    ):
+        pool = kernel_pool_factory(idle_timeout=0)
+        with pool.lease():
+            pass
+        pool.evict()
+        assert pool._list_kernels() == []
+
+    def test_environment_spec_change_leases_other_kernel(
+        cls, kernel_pool_factory, kernel_build_mocks
+    ):
+        pool = kernel_pool_factory()
+        with pool.lease() as first_kernel_name:
+            pass
+        with pool.lease(pip_index_url="https://mirror/simple") as kernel_name:
+            assert kernel_name != first_kernel_name
+
+
+class TestPipInstall:
+    """
+    Test case for pip_install function.
+    """
+
+    def test_install_from_wheelhouse_when_built(cls):
+        with patch(
+            "workflower.utils.environment.Config.WHEELHOUSE", True
+        ), patch(
+            "workflower.utils.environment.wheelhouse.get_install_args",
+            return_value=["--no-index", "--find-links=wheels"],
+        ), patch(
+            "workflower.utils.environment._run_pip", return_value=True
+        ) as run_pip_mock:
+            assert pip_install("python", packages=["ipykernel"])
+        assert run_pip_mock.call_count == 1
+        assert "--no-index" in run_pip_mock.call_args[0][0]
+
+    def test_failed_wheelhouse_install_falls_back_to_index(cls):
+        with patch(
+            "workflower.utils.environment.Config.WHEELHOUSE", True
+        ), patch(
+            "workflower.utils.environment.wheelhouse.get_install_args",
+            return_value=["--no-index", "--find-links=wheels"],
+        ), patch(
+            "workflower.utils.environment._run_pip", side_effect=[False, True]
+        ) as run_pip_mock:
+            assert pip_install(
+                "python", packages=["ipykernel"], pip_index_url="https://pi"
+            )
+        pip_args = run_pip_mock.call_args[0][0]
+        assert "--no-index" not in pip_args
+        assert "--index-url=https://pi" in pip_args
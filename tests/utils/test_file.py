@@ -6,8 +6,12 @@ from unittest.mock import MagicMock
 import pytest
 import yaml
 from workflower.utils.file import (
+    FileLock,
+    get_directory_size,
+    get_file_hash,
     get_file_modification_date,
     get_file_name,
+    get_workflow_files_paths,
     yaml_file_to_dict,
 )
 
@@ -94,6 +98,137 @@ class TestGetFileModificationDate:
         assert isinstance(file_modification_date, float)
 
 
+class TestGetFileHash:
+    """
+    Test case for get_file_hash function.
+    """
+
+    def test_get_file_hash_returns_same_hash_for_same_content(
+        cls, temp_workflow_file
+    ):
+        """
+        Hash must not change if file content did not change.
+        """
+        assert get_file_hash(temp_workflow_file) == get_file_hash(
+            temp_workflow_file
+        )
+
+    def test_get_file_hash_returns_new_hash_for_new_content(
+        cls, temp_workflow_file
+    ):
+        """
+        Hash must change if file content changed.
+        """
+        file_hash = get_file_hash(temp_workflow_file)
+        with open(temp_workflow_file, "a") as f:
+            f.write("# new line\n")
+        assert get_file_hash(temp_workflow_file) != file_hash
+
+
+class TestGetDirectorySize:
+    """
+    Test case for get_directory_size function.
+    """
+
+    def test_get_directory_size_sums_nested_files(cls, tmpdir):
+        tmpdir.join("a.txt").write("abc")
+        tmpdir.mkdir("nested").join("b.txt").write("defgh")
+        assert get_directory_size(str(tmpdir)) == 8
+
+
+class FakeMsvcrt:
+    """
+    Windows byte range locks, held by file descriptor.
+    """
+
+    LK_UNLCK = 0
+    LK_NBLCK = 2
+
+    def __init__(self):
+        self.locks = {}
+
+    def locking(self, fd, mode, nbytes):
+        inode = os.fstat(fd).st_ino
+        offset = os.lseek(fd, 0, os.SEEK_CUR)
+        region = range(offset, offset + nbytes)
+        owners = self.locks.setdefault(inode, {})
+        if mode == self.LK_UNLCK:
+            for byte in region:
+                del owners[byte]
+            return
+        if any(byte in owners for byte in region):
+            raise OSError("Locked")
+        owners.update({byte: fd for byte in region})
+
+
+@pytest.fixture
+def windows_locks():
+    with unittest.mock.patch(
+        "workflower.utils.file.fcntl", None
+    ), unittest.mock.patch(
+        "workflower.utils.file.msvcrt", FakeMsvcrt(), create=True
+    ):
+        yield
+
+
+class TestFileLock:
+    """
+    Test case for FileLock class.
+    """
+
+    def test_exclusive_lock_is_not_acquired_while_held(cls, tmpdir):
+        path = str(tmpdir.join("env.lock"))
+        with FileLock(path):
+            assert not FileLock(path).acquire(blocking=False)
+        file_lock = FileLock(path)
+        assert file_lock.acquire(blocking=False)
+        file_lock.release()
+
+    def test_shared_locks_block_exclusive_lock_only(cls, tmpdir):
+        path = str(tmpdir.join("env.lock"))
+        with FileLock(path, shared=True):
+            shared_lock = FileLock(path, shared=True)
+            assert shared_lock.acquire(blocking=False)
+            shared_lock.release()
+            assert not FileLock(path).acquire(blocking=False)
+
+    def test_windows_shared_locks_block_exclusive_lock_only(
+        cls, tmpdir, windows_locks
+    ):
+        path = str(tmpdir.join("env.lock"))
+        with FileLock(path, shared=True):
+            shared_lock = FileLock(path, shared=True)
+            assert shared_lock.acquire(blocking=False)
+            assert not FileLock(path).acquire(blocking=False)
+            shared_lock.release()
+            assert not FileLock(path).acquire(blocking=False)
+        file_lock = FileLock(path)
+        assert file_lock.acquire(blocking=False)
+        assert not FileLock(path, shared=True).acquire(blocking=False)
+        file_lock.release()
+
+
+class TestGetWorkflowFilesPaths:
+    """
+    Test case for get_workflow_files_paths function.
+    """
+
+    def test_get_workflow_files_paths_returns_only_yaml_files(
+        cls, tmpdir_factory
+    ):
+        """
+        Only .yml and .yaml files must be returned.
+        """
+        directory = tmpdir_factory.mktemp("workflows")
+        directory.join("first.yml").write_text("", encoding="utf-8")
+        directory.join("second.yaml").write_text("", encoding="utf-8")
+        directory.join("third.txt").write_text("", encoding="utf-8")
+        files_paths = sorted(get_workflow_files_paths(str(directory)))
+        assert len(files_paths) == 2
+        assert files_paths[0].endswith("first.yml")
+        assert files_paths[1].endswith("second.yaml")
+
+
 class TestYamlFileToDict:
     """
     Test case for yaml_file_to_dict function.
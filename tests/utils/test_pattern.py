@@ -0,0 +1,71 @@
+import re
+
+import pytest
+from workflower.utils.pattern import LiteralMatcher, Pattern, PatternMatcher
+
+
+class TestLiteralMatcher:
+    def test_literal_matcher_finds_overlapping_words(self):
+        matcher = LiteralMatcher(["he", "she", "his", "hers", "she"])
+
+        assert matcher.find("ushers") == {0, 1, 3, 4}
+        assert matcher.find("hi") == set()
+
+    def test_literal_matcher_escapes_words(self):
+        assert LiteralMatcher(["a.c", "(x)"]).find("abc (x)") == {1}
+
+    def test_literal_matcher_without_words(self):
+        assert LiteralMatcher([]).find("text") == set()
+
+
+class TestPatternMatcher:
+    def test_pattern_matcher_matches_literals(self):
+        matcher = PatternMatcher(
+            [
+                Pattern("done", "Done"),
+                Pattern("error", "ERROR", case_sensitive=True),
+                Pattern("missing", "missing"),
+            ]
+        )
+
+        assert matcher.match("Process DONE with error") == {"done"}
+        assert matcher.match("ERROR") == {"error"}
+
+    def test_pattern_matcher_matches_regexes(self):
+        matcher = PatternMatcher(
+            [
+                Pattern("rows", r"rows: \d+", "regex"),
+                Pattern("any_row", r"row", "regex"),
+                Pattern("failed", r"fail(ed)?", "regex"),
+                Pattern("exit", r"(?i)exit code [1-9]", "regex"),
+                Pattern("upper", r"ROWS", "regex", case_sensitive=True),
+            ]
+        )
+
+        assert matcher.match("Rows: 10, Exit code 2") == {
+            "rows",
+            "any_row",
+            "exit",
+        }
+        assert matcher.match("job failed") == {"failed"}
+        assert matcher.match("nothing") == set()
+
+    def test_pattern_matcher_raises_on_invalid_regex(self):
+        with pytest.raises(re.error):
+            PatternMatcher([Pattern("invalid", "(", "regex")])
+
+    def test_pattern_matcher_agrees_with_substring_loop(self):
+        output = "\n".join(
+            f"2022-03-01 10:00:00 INFO Processed batch {index} DONE"
+            for index in range(0, 500, 7)
+        )
+        words = [f"batch {index} done" for index in range(50)]
+        matcher = PatternMatcher(
+            Pattern(index, word) for index, word in enumerate(words)
+        )
+
+        assert matcher.match(output) == {
+            index
+            for index, word in enumerate(words)
+            if word.lower() in output.lower()
+        }
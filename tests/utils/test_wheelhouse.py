@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from workflower.utils.wheelhouse import Wheelhouse
+
+
+@pytest.fixture
+def requirements_path(tmpdir):
+    path = tmpdir.join("requirements.txt")
+    path.write("requests==2.27.1\n")
+    return str(path)
+
+
+@pytest.fixture
+def pip_mock():
+    with patch(
+        "workflower.utils.wheelhouse.subprocess.run",
+        return_value=MagicMock(returncode=0),
+    ) as mock:
+        yield mock
+
+
+class TestWheelhouse:
+    """
+    Test case for Wheelhouse class.
+    """
+
+    def test_build_makes_requirements_ready(
+        cls, tmpdir, requirements_path, pip_mock
+    ):
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheels")))
+        assert wheelhouse.build(requirements_path)
+        assert wheelhouse.is_ready(requirements_path)
+        pip_args = pip_mock.call_args[0][0]
+        assert "wheel" in pip_args
+        assert pip_args[-2:] == ["-r", requirements_path]
+
+    def test_built_requirements_are_not_built_again(
+        cls, tmpdir, requirements_path, pip_mock
+    ):
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheels")))
+        wheelhouse.build(requirements_path)
+        wheelhouse.build(requirements_path)
+        assert pip_mock.call_count == 1
+
+    def test_changed_requirements_are_not_ready(
+        cls, tmpdir, requirements_path, pip_mock
+    ):
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheels")))
+        wheelhouse.build(requirements_path)
+        with open(requirements_path, "a") as requirements_file:
+            requirements_file.write("pandas==1.4.0\n")
+        assert not wheelhouse.is_ready(requirements_path)
+
+    def test_failed_build_is_not_ready(
+        cls, tmpdir, requirements_path, pip_mock
+    ):
+        pip_mock.return_value = MagicMock(returncode=1)
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheels")))
+        assert not wheelhouse.build(requirements_path)
+        assert not wheelhouse.is_ready(requirements_path)
+
+    def test_packages_are_built(cls, tmpdir, pip_mock):
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheels")))
+        assert wheelhouse.build(packages=["ipykernel"])
+        assert wheelhouse.is_ready(packages=["ipykernel"])
+        assert pip_mock.call_args[0][0][-1] == "ipykernel"
+
+    def test_install_args_refresh_wheels_when_not_ready(
+        cls, tmpdir, requirements_path, pip_mock
+    ):
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheels")))
+        assert wheelhouse.get_install_args(requirements_path) is None
+        wheelhouse._executor.shutdown(wait=True)
+        assert wheelhouse.get_install_args(requirements_path) == [
+            "--no-index",
+            f"--find-links={wheelhouse.directory}",
+        ]
@@ -0,0 +1,152 @@
+"""
+Content addressed blob store.
+"""
+import hashlib
+import logging
+import os
+import zlib
+
+from workflower.config import Config
+
+logger = logging.getLogger("workflower.adapters.blob.store")
+
+
+class BlobStore:
+    """
+    Store large values on disk, compressed and addressed by the sha256 hash
+    of their content, so equal values are stored once.
+
+    Blobs are written to a temporary file and then moved in place, readers
+    never see a partially written blob.
+
+    Args:
+        - directory (str): blobs directory.
+        - compression_level (int, optional): zlib compression level.
+        - chunk_size (int, optional): bytes read per chunk when streaming.
+    """
+
+    file_extension = ".z"
+
+    def __init__(
+        self,
+        directory: str,
+        compression_level: int = 6,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        self.directory = directory
+        self.compression_level = compression_level
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _to_bytes(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode("utf-8")
+
+    def _get_file_path(self, key: str) -> str:
+        # Spread blobs over sub directories, keeping directories small
+        return os.path.join(self.directory, key[:2], key + self.file_extension)
+
+    def put(self, value) -> str:
+        """
+        Store a value, str values are stored utf-8 encoded.
+
+        Returns the blob key.
+        """
+        data = self._to_bytes(value)
+        key = hashlib.sha256(data).hexdigest()
+        file_path = self._get_file_path(key)
+        if os.path.exists(file_path):
+            # Stored again, so it is not removed as unused
+            try:
+                os.utime(file_path)
+                return key
+            except FileNotFoundError:
+                pass
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temporary_file_path, "wb") as f:
+            f.write(zlib.compress(data, self.compression_level))
+        os.replace(temporary_file_path, file_path)
+        logger.debug(f"Stored blob {key} of {len(data)} bytes")
+        return key
+
+    def exists(self, key: str) -> bool:
+        """
+        Check if a blob is stored.
+        """
+        return os.path.exists(self._get_file_path(key))
+
+    def open(self, key: str):
+        """
+        Stream a blob content as bytes chunks, without loading it whole in
+        memory.
+        """
+        decompressor = zlib.decompressobj()
+        with open(self._get_file_path(key), "rb") as f:
+            while True:
+                compressed_chunk = f.read(self.chunk_size)
+                if not compressed_chunk:
+                    break
+                chunk = decompressor.decompress(compressed_chunk)
+                if chunk:
+                    yield chunk
+        chunk = decompressor.flush()
+        if chunk:
+            yield chunk
+
+    def get(self, key: str) -> bytes:
+        """
+        Get a blob content.
+        """
+        return b"".join(self.open(key))
+
+    def get_text(self, key: str) -> str:
+        """
+        Get a blob content decoded as utf-8 text.
+        """
+        return self.get(key).decode("utf-8")
+
+    def get_output(self, output: str, output_blob: str = None) -> str:
+        """
+        Whole output of an output preview stored along with its blob key,
+        the preview itself if the blob is missing.
+        """
+        if not output_blob:
+            return output
+        try:
+            return self.get_text(output_blob)
+        except FileNotFoundError:
+            logger.warning(f"Output blob {output_blob} not found")
+            return output
+
+    def remove(self, key: str, unused_since: float = None) -> bool:
+        """
+        Remove a blob, unless it was stored again after unused_since
+        timestamp.
+
+        Returns False if it was kept.
+        """
+        file_path = self._get_file_path(key)
+        try:
+            if unused_since and os.path.getmtime(file_path) > unused_since:
+                return False
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        return True
+
+
+blob_store = BlobStore(Config.BLOB_STORE_DIR)
+
+
+def get_event_output(event, store: BlobStore = None) -> str:
+    """
+    Event whole output, read from blob store when the event only keeps its
+    preview. Takes an Event, or an event dict as archived.
+    """
+    if isinstance(event, dict):
+        output, output_blob = event.get("output"), event.get("output_blob")
+    else:
+        output, output_blob = event.output, event.output_blob
+    return (store or blob_store).get_output(output, output_blob)
@@ -0,0 +1,128 @@
+"""
+Jobs dispatch queue.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger("workflower.adapters.scheduler.dispatch")
+
+
+class DispatchQueue:
+    """
+    Hold jobs submitted while every executor worker is busy, dispatching
+    them as workers are released, by priority and age.
+
+    A job priority increases by one for every aging interval it waits, so
+    low priority jobs are not starved by higher priority ones.
+
+    Args:
+        - workers (int, optional): executor workers, unlimited if None.
+        - aging_interval (float, optional): seconds waited worth a priority
+        level.
+    """
+
+    def __init__(self, workers: int = None, aging_interval: float = 60):
+        self.workers = workers
+        self.aging_interval = aging_interval
+        self._lock = threading.Lock()
+        self._busy_workers = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._max_queue_depth = 0
+        # Dispatched jobs count, total and max delay, by priority
+        self._delays: Dict[int, List[float]] = {}
+        # Started jobs count, total and max overhead
+        self._start_overheads = [0, 0.0, 0.0]
+
+    def _get_order(self, priority: int) -> float:
+        # Waiting jobs age at the same rate, so comparing their priorities
+        # plus age, now - queued_at, is comparing priority minus queued_at
+        return time.monotonic() / self.aging_interval - priority
+
+    def submit(self, dispatch: Callable[[], None], priority: int = 0) -> bool:
+        """
+        Take a worker, returning True, or queue the job dispatch until a
+        worker is released for it, returning False.
+        """
+        with self._lock:
+            if self.workers is None or self._busy_workers < self.workers:
+                self._busy_workers += 1
+                return True
+            heapq.heappush(
+                self._queue,
+                (self._get_order(priority), next(self._sequence), dispatch),
+            )
+            self._max_queue_depth = max(
+                self._max_queue_depth, len(self._queue)
+            )
+            return False
+
+    def release(self) -> None:
+        """
+        Release a worker, dispatching the first job waiting, if any.
+        """
+        with self._lock:
+            if not self._queue:
+                self._busy_workers = max(self._busy_workers - 1, 0)
+                return
+            _, _, dispatch = heapq.heappop(self._queue)
+        dispatch()
+
+    def record_delay(self, priority: int, delay: float) -> None:
+        """
+        Record a job dispatch delay, from its scheduled run time.
+        """
+        with self._lock:
+            delays = self._delays.setdefault(priority, [0, 0.0, 0.0])
+            delays[0] += 1
+            delays[1] += delay
+            delays[2] = max(delays[2], delay)
+
+    def record_start_overhead(self, overhead: float) -> None:
+        """
+        Record how long a dispatched job took to start on its worker.
+        """
+        with self._lock:
+            overheads = self._start_overheads
+            overheads[0] += 1
+            overheads[1] += overhead
+            overheads[2] = max(overheads[2], overhead)
+
+    def get_stats(self) -> dict:
+        """
+        Queue depth and dispatch delay statistics by priority.
+        """
+        with self._lock:
+            started_jobs, total_overhead, max_overhead = self._start_overheads
+            return dict(
+                workers=self.workers,
+                busy_workers=self._busy_workers,
+                queue_depth=len(self._queue),
+                max_queue_depth=self._max_queue_depth,
+                priorities=[
+                    dict(
+                        priority=priority,
+                        dispatched_jobs=count,
+                        mean_delay=total_delay / count,
+                        max_delay=max_delay,
+                    )
+                    for priority, (count, total_delay, max_delay) in sorted(
+                        self._delays.items(), reverse=True
+                    )
+                ],
+                start_overhead=dict(
+                    started_jobs=started_jobs,
+                    mean_overhead=(
+                        total_overhead / started_jobs if started_jobs else 0.0
+                    ),
+                    max_overhead=max_overhead,
+                ),
+            )
+
+
+# Executors dispatch queues, by executor alias
+dispatch_queues: Dict[str, DispatchQueue] = {}
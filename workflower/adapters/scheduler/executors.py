@@ -0,0 +1,474 @@
+"""
+Scheduler executors.
+"""
+import asyncio
+import concurrent.futures
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+
+from apscheduler.executors.base import BaseExecutor, run_job
+from apscheduler.executors.base_py3 import run_coroutine_job
+from apscheduler.executors.pool import BasePoolExecutor, ThreadPoolExecutor
+from apscheduler.util import iscoroutinefunction_partial
+from workflower.adapters.scheduler.dispatch import (
+    DispatchQueue,
+    dispatch_queues,
+)
+from workflower.adapters.scheduler import pools
+from workflower.adapters.sqlalchemy.event_writer import event_writer
+from workflower.application.operators.inprocess import (
+    has_stuck_executions,
+    install_streams,
+)
+from workflower.config import Config
+
+try:
+    import resource
+except ImportError:
+    # Not available on windows
+    resource = None
+
+logger = logging.getLogger("workflower.adapters.scheduler.executors")
+
+
+def get_job_priority(job) -> int:
+    return job.kwargs.get("priority", 0)
+
+
+class DispatchQueueMixin:
+    """
+    Hold jobs submitted while every executor worker is busy, instead of
+    queueing them on the executor in submission order, dispatching them by
+    priority and age as workers are released.
+
+    Each job dispatch delay, from its scheduled run time, is recorded.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        pool = getattr(self, "_pool", None)
+        self.dispatch_queue = DispatchQueue(
+            getattr(pool, "_max_workers", None),
+            Config.DISPATCH_AGING_INTERVAL,
+        )
+        self._dispatched_jobs = {}
+        self._dispatched_jobs_lock = threading.Lock()
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        dispatch_queues[alias] = self.dispatch_queue
+
+    def _do_submit_job(self, job, run_times):
+        with self._dispatched_jobs_lock:
+            self._dispatched_jobs[job.id] = (
+                self._dispatched_jobs.get(job.id, 0) + 1
+            )
+        if not self.dispatch_queue.submit(
+            lambda: self._dispatch_queued_job(job, run_times),
+            get_job_priority(job),
+        ):
+            return
+        try:
+            self._dispatch_job(job, run_times)
+        except Exception:
+            self._release_worker(job.id)
+            raise
+
+    def _dispatch_job(self, job, run_times):
+        super()._do_submit_job(job, run_times)
+        priority = get_job_priority(job)
+        delay = (datetime.now(timezone.utc) - run_times[-1]).total_seconds()
+        self.dispatch_queue.record_delay(priority, delay)
+        self._record_dispatch(job, priority, delay)
+
+    def _dispatch_queued_job(self, job, run_times):
+        try:
+            self._dispatch_job(job, run_times)
+        except Exception:
+            self._run_job_error(job.id, *sys.exc_info()[1:])
+
+    def _record_dispatch(self, job, priority: int, delay: float) -> None:
+        event_writer.write_event(
+            name="job_dispatched",
+            model="job",
+            model_id=job.id,
+            exception=None,
+            output=str(dict(priority=priority, dispatch_delay=delay)),
+        )
+
+    def _release_worker(self, job_id):
+        with self._dispatched_jobs_lock:
+            dispatched_jobs = self._dispatched_jobs.get(job_id)
+            if not dispatched_jobs:
+                return
+            if dispatched_jobs == 1:
+                del self._dispatched_jobs[job_id]
+            else:
+                self._dispatched_jobs[job_id] = dispatched_jobs - 1
+        self.dispatch_queue.release()
+
+    def _run_job_success(self, job_id, events):
+        super()._run_job_success(job_id, events)
+        self._release_worker(job_id)
+
+    def _run_job_error(self, job_id, exc, traceback=None):
+        super()._run_job_error(job_id, exc, traceback)
+        self._release_worker(job_id)
+
+
+class ResourcePoolMixin:
+    """
+    Hold jobs declaring a resource pool until they get one of its slots,
+    before they are submitted to the executor, releasing it once they
+    finish.
+    """
+
+    resource_pools: pools.ResourcePools = pools.resource_pools
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._acquired_pools = {}
+        self._acquired_pools_lock = threading.Lock()
+
+    def _do_submit_job(self, job, run_times):
+        pool = self.resource_pools.get(job.kwargs.get("resource_pool"))
+        if pool is None:
+            return super()._do_submit_job(job, run_times)
+        with self._acquired_pools_lock:
+            self._acquired_pools.setdefault(job.id, []).append(pool)
+        if not pool.acquire(
+            lambda: self._submit_queued_job(job, run_times),
+            get_job_priority(job),
+        ):
+            return
+        try:
+            super()._do_submit_job(job, run_times)
+        except Exception:
+            self._release_pool(job.id)
+            raise
+
+    def _submit_queued_job(self, job, run_times):
+        try:
+            super()._do_submit_job(job, run_times)
+        except Exception:
+            self._run_job_error(job.id, *sys.exc_info()[1:])
+
+    def _release_pool(self, job_id):
+        with self._acquired_pools_lock:
+            job_pools = self._acquired_pools.get(job_id)
+            if not job_pools:
+                return
+            pool = job_pools.pop(0)
+            if not job_pools:
+                del self._acquired_pools[job_id]
+        pool.release()
+
+    def _run_job_success(self, job_id, events):
+        super()._run_job_success(job_id, events)
+        self._release_pool(job_id)
+
+    def _run_job_error(self, job_id, exc, traceback=None):
+        super()._run_job_error(job_id, exc, traceback)
+        self._release_pool(job_id)
+
+
+class PooledThreadPoolExecutor(
+    ResourcePoolMixin, DispatchQueueMixin, ThreadPoolExecutor
+):
+    """
+    Thread pool executor, holding jobs until they get their resource pool
+    slot, then a worker.
+    """
+
+
+def get_worker_memory():
+    """
+    Process peak resident memory, in megabytes, None if not available.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports it in kilobytes, macOS in bytes
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def preload_modules(modules: list) -> None:
+    """
+    Import modules on a pool worker before it runs any job.
+    """
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as error:
+            logger.warning(f"Could not preload {module}: {error}")
+
+
+def init_worker(modules: list) -> None:
+    """
+    Start a pool worker, capturing in process executions output by thread,
+    and importing modules before it runs any job.
+    """
+    install_streams()
+    preload_modules(modules)
+
+
+def run_worker_job(job, jobstore_alias, run_times, logger_name):
+    """
+    Run a job on a pool worker, returning its events along with when it
+    started, the worker pid, its peak memory and whether a timed out in
+    process execution is stuck on it.
+    """
+    started_at = time.time()
+    events = run_job(job, jobstore_alias, run_times, logger_name)
+    return (
+        events,
+        started_at,
+        os.getpid(),
+        get_worker_memory(),
+        has_stuck_executions(),
+    )
+
+
+class ProcessPoolJobsMixin:
+    """
+    Submit jobs to a process pool, recording how long they take to start on
+    a worker once dispatched.
+    """
+
+    def _do_submit_job(self, job, run_times):
+        pool = self._pool
+        submitted_at = time.time()
+
+        def callback(future):
+            exc, tb = (
+                future.exception_info()
+                if hasattr(future, "exception_info")
+                else (
+                    future.exception(),
+                    getattr(future.exception(), "__traceback__", None),
+                )
+            )
+            if exc:
+                self._run_job_error(job.id, exc, tb)
+                return
+            events, started_at, pid, memory, stuck = future.result()
+            self.dispatch_queue.record_start_overhead(
+                max(started_at - submitted_at, 0.0)
+            )
+            self._on_worker_job_done(pool, pid, memory, stuck)
+            self._run_job_success(job.id, events)
+
+        try:
+            future = pool.submit(
+                run_worker_job,
+                job,
+                job._jobstore_alias,
+                run_times,
+                self._logger.name,
+            )
+        except BrokenProcessPool:
+            self._logger.warning(
+                "Process pool is broken; replacing pool with a fresh instance"
+            )
+            pool = self._pool = self._create_pool()
+            future = pool.submit(
+                run_worker_job,
+                job,
+                job._jobstore_alias,
+                run_times,
+                self._logger.name,
+            )
+        future.add_done_callback(callback)
+
+    def _create_pool(self):
+        return concurrent.futures.ProcessPoolExecutor(self._pool._max_workers)
+
+    def _on_worker_job_done(self, pool, pid, memory, stuck) -> None:
+        pass
+
+
+class PooledProcessPoolExecutor(
+    ResourcePoolMixin,
+    DispatchQueueMixin,
+    ProcessPoolJobsMixin,
+    BasePoolExecutor,
+):
+    """
+    Process pool executor, holding jobs until they get their resource pool
+    slot, then a worker.
+
+    Workers are started as jobs are submitted, importing what a job needs
+    the first time they run it.
+    """
+
+    def __init__(self, max_workers=10, pool_kwargs=None):
+        pool_kwargs = pool_kwargs or {}
+        super().__init__(
+            concurrent.futures.ProcessPoolExecutor(
+                int(max_workers), **pool_kwargs
+            )
+        )
+
+
+class WarmProcessPoolExecutor(
+    ResourcePoolMixin,
+    DispatchQueueMixin,
+    ProcessPoolJobsMixin,
+    BasePoolExecutor,
+):
+    """
+    Process pool executor whose workers are started along with it, from a
+    fork server with the heavy modules jobs need already imported, so jobs
+    do not pay for starting a worker or for its imports.
+
+    Workers are replaced after running max_tasks_per_child jobs, and the
+    whole pool once a worker peak memory goes over max_memory, or a timed
+    out in process execution is stuck on it, running jobs finishing on the
+    replaced one.
+
+    Args:
+        - max_workers (int, optional): pool workers.
+        - preload (list, optional): modules imported before workers start.
+        - max_tasks_per_child (int, optional): jobs run by a worker before
+        it is replaced, never if 0.
+        - max_memory (float, optional): worker peak memory, in megabytes,
+        before the pool is replaced, unlimited if 0.
+    """
+
+    def __init__(
+        self,
+        max_workers=10,
+        preload=(),
+        max_tasks_per_child=0,
+        max_memory=0,
+    ):
+        self.max_workers = int(max_workers)
+        self.preload = list(preload)
+        self.max_tasks_per_child = int(max_tasks_per_child)
+        self.max_memory = float(max_memory)
+        self._pool_lock = threading.Lock()
+        self._worker_tasks = {}
+        self.recycled_pools = 0
+        super().__init__(self._create_pool())
+
+    def _create_pool(self):
+        pool_kwargs = dict(initializer=init_worker, initargs=(self.preload,))
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            # Workers are forked from a server that imported them once
+            context.set_forkserver_preload(self.preload)
+        else:
+            context = multiprocessing.get_context("spawn")
+        pool_kwargs.update(dict(mp_context=context))
+        # Python 3.11 replaces workers on its own
+        if self.max_tasks_per_child and sys.version_info >= (3, 11):
+            pool_kwargs.update(
+                dict(max_tasks_per_child=self.max_tasks_per_child)
+            )
+        return concurrent.futures.ProcessPoolExecutor(
+            self.max_workers, **pool_kwargs
+        )
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self.warm_up()
+
+    def warm_up(self) -> None:
+        """
+        Start every pool worker.
+        """
+        for _ in range(self.max_workers):
+            self._pool.submit(preload_modules, [])
+
+    def _on_worker_job_done(self, pool, pid, memory, stuck) -> None:
+        with self._pool_lock:
+            if pool is not self._pool:
+                return
+            tasks = self._worker_tasks[pid] = (
+                self._worker_tasks.get(pid, 0) + 1
+            )
+            over_tasks = (
+                self.max_tasks_per_child
+                and sys.version_info < (3, 11)
+                and tasks >= self.max_tasks_per_child
+            )
+            over_memory = (
+                self.max_memory and memory and memory > self.max_memory
+            )
+            if not over_tasks and not over_memory and not stuck:
+                return
+            logger.info(
+                f"Replacing process pool, worker {pid} ran {tasks} jobs, "
+                f"peak memory {memory}MB, stuck execution {stuck}"
+            )
+            self._pool = self._create_pool()
+            self._worker_tasks = {}
+            self.recycled_pools += 1
+        pool.shutdown(wait=False)
+        self.warm_up()
+
+
+class EventLoopExecutor(ResourcePoolMixin, DispatchQueueMixin, BaseExecutor):
+    """
+    Run jobs on an asyncio event loop of its own, on a background thread, as
+    the scheduler is not an asyncio one.
+
+    Coroutine jobs run concurrently on the event loop, other jobs on the
+    event loop default executor.
+    """
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self._eventloop = asyncio.new_event_loop()
+        self._pending_futures = set()
+        self._thread = threading.Thread(
+            target=self._eventloop.run_forever,
+            name=f"{alias}-executor",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def shutdown(self, wait=True):
+        for future in list(self._pending_futures):
+            if not future.done():
+                future.cancel()
+        self._pending_futures.clear()
+        self._eventloop.call_soon_threadsafe(self._eventloop.stop)
+        if wait:
+            self._thread.join()
+
+    def _do_submit_job(self, job, run_times):
+        async def run():
+            if iscoroutinefunction_partial(job.func):
+                return await run_coroutine_job(
+                    job, job._jobstore_alias, run_times, self._logger.name
+                )
+            return await asyncio.get_running_loop().run_in_executor(
+                None,
+                run_job,
+                job,
+                job._jobstore_alias,
+                run_times,
+                self._logger.name,
+            )
+
+        def callback(future):
+            self._pending_futures.discard(future)
+            try:
+                events = future.result()
+            except BaseException:
+                self._run_job_error(job.id, *sys.exc_info()[1:])
+            else:
+                self._run_job_success(job.id, events)
+
+        # Scheduler submits jobs from its own thread
+        future = asyncio.run_coroutine_threadsafe(run(), self._eventloop)
+        self._pending_futures.add(future)
+        future.add_done_callback(callback)
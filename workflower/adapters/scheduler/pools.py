@@ -0,0 +1,130 @@
+"""
+Jobs resource pools.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from workflower.config import Config
+
+logger = logging.getLogger("workflower.adapters.scheduler.pools")
+
+
+class ResourcePool:
+    """
+    Limit how many jobs use a resource at once, as an Alteryx license or
+    machine memory. Jobs beyond its slots wait for one to be released, by
+    priority then arrival order.
+
+    Args:
+        - name (str): resource pool name.
+        - slots (int): how many jobs may hold the resource at once.
+    """
+
+    def __init__(self, name: str, slots: int) -> None:
+        self.name = name
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._max_queue_depth = 0
+        self._acquired_jobs = 0
+        self._waited_jobs = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def acquire(self, start: Callable[[], None], priority: int = 0) -> bool:
+        """
+        Take a slot, returning True, or queue the job start until a slot is
+        released for it, returning False.
+        """
+        with self._lock:
+            if self._in_use >= self.slots:
+                heapq.heappush(
+                    self._queue,
+                    (-priority, next(self._sequence), time.monotonic(), start),
+                )
+                self._max_queue_depth = max(
+                    self._max_queue_depth, len(self._queue)
+                )
+                logger.debug(
+                    f"Resource pool {self.name} full, "
+                    f"{len(self._queue)} jobs waiting"
+                )
+                return False
+            self._in_use += 1
+            self._acquired_jobs += 1
+        return True
+
+    def release(self) -> None:
+        """
+        Release a slot, handing it to the first job waiting, if any.
+        """
+        with self._lock:
+            if not self._queue:
+                self._in_use = max(self._in_use - 1, 0)
+                return
+            _, _, queued_at, start = heapq.heappop(self._queue)
+            wait_time = time.monotonic() - queued_at
+            self._acquired_jobs += 1
+            self._waited_jobs += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+        logger.debug(
+            f"Resource pool {self.name} slot acquired after {wait_time:.3f}s"
+        )
+        start()
+
+    def get_stats(self) -> dict:
+        """
+        Slots usage, queue depth and wait time statistics.
+        """
+        with self._lock:
+            return dict(
+                name=self.name,
+                slots=self.slots,
+                in_use=self._in_use,
+                queue_depth=len(self._queue),
+                max_queue_depth=self._max_queue_depth,
+                acquired_jobs=self._acquired_jobs,
+                waited_jobs=self._waited_jobs,
+                mean_wait_time=(
+                    self._total_wait_time / self._acquired_jobs
+                    if self._acquired_jobs
+                    else 0.0
+                ),
+                max_wait_time=self._max_wait_time,
+            )
+
+
+class ResourcePools:
+    """
+    Configured resource pools, by name.
+
+    Args:
+        - slots (dict): slots of each resource pool, by name.
+    """
+
+    def __init__(self, slots: Dict[str, int]) -> None:
+        self._pools = {
+            name: ResourcePool(name, pool_slots)
+            for name, pool_slots in slots.items()
+        }
+
+    def get(self, name: str) -> Optional[ResourcePool]:
+        if name is None:
+            return None
+        pool = self._pools.get(name)
+        if pool is None:
+            logger.warning(f"Resource pool {name} is not configured")
+        return pool
+
+    def get_stats(self) -> List[dict]:
+        return [pool.get_stats() for pool in self._pools.values()]
+
+
+resource_pools = ResourcePools(Config.RESOURCE_POOLS)
@@ -26,7 +26,7 @@ def create_scheduler(**options):
         callbacks.job_executed_callback(event, scheduler)
 
     def on_job_error(event):
-        callbacks.job_error_callback(event)
+        callbacks.job_error_callback(event, scheduler)
 
     def on_job_removed(event):
         callbacks.job_removed_callback(event)
@@ -0,0 +1,120 @@
+"""
+Stream trigger listener.
+"""
+import logging
+import os
+import threading
+from multiprocessing.connection import Listener
+
+from workflower.adapters.scheduler.callbacks import schedule_ready_jobs
+from workflower.application.operators.stream import (
+    STREAM_TRIGGER_ADDRESS_ENV,
+    STREAM_TRIGGER_AUTHKEY_ENV,
+)
+from workflower.services.workflow.graph import (
+    DependencyGraph,
+    dependency_graph,
+)
+
+logger = logging.getLogger("workflower.adapters.scheduler.stream")
+
+
+class StreamTriggerListener:
+    """
+    Listen to running jobs log streams, on the scheduler process, releasing
+    jobs depending on them as soon as their logs match.
+
+    Its address and authentication key are set on environment before the
+    executor workers start, so their jobs connect to it. Each running job
+    subscribes with its id and gets the logs patterns to match, if any, and
+    reports matches while running.
+
+    Args:
+        - graph (DependencyGraph, optional): jobs dependency graph.
+        - family (str, optional): multiprocessing connection family, by
+        default the platform one.
+    """
+
+    def __init__(
+        self, graph: DependencyGraph = dependency_graph, family: str = None
+    ) -> None:
+        self.graph = graph
+        self.family = family
+        self.scheduler = None
+        self._listener = None
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._listener.address if self._listener else None
+
+    def start(self, scheduler) -> None:
+        """
+        Start listening, must be called before scheduler executors start.
+        """
+        if self._listener is not None:
+            return
+        self.scheduler = scheduler
+        authkey = os.urandom(32)
+        self._listener = Listener(family=self.family, authkey=authkey)
+        os.environ[STREAM_TRIGGER_ADDRESS_ENV] = str(self._listener.address)
+        os.environ[STREAM_TRIGGER_AUTHKEY_ENV] = authkey.hex()
+        self._thread = threading.Thread(
+            target=self._accept, name="stream-trigger-listener", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Stream trigger listening on {self._listener.address}")
+
+    def _accept(self) -> None:
+        listener = self._listener
+        while True:
+            try:
+                connection = listener.accept()
+            except OSError:
+                # Listener closed
+                return
+            except Exception as error:
+                logger.warning(f"Log stream connection refused: {error}")
+                continue
+            threading.Thread(
+                target=self._serve, args=(connection,), daemon=True
+            ).start()
+
+    def _serve(self, connection) -> None:
+        """
+        Serve one running job log stream.
+        """
+        try:
+            _, job_id = connection.recv()
+            # Dependency graph is loaded on first reconciliation, until then
+            # jobs run without early trigger
+            stream_patterns = []
+            if self.graph.is_loaded:
+                stream_patterns = self.graph.get_stream_patterns(job_id)
+            connection.send(stream_patterns)
+            while True:
+                _, dependency_job_id, log_line = connection.recv()
+                schedule_ready_jobs(
+                    self.scheduler,
+                    self.graph.release_job(
+                        job_id, dependency_job_id, log_line
+                    ),
+                )
+                connection.send(True)
+        except (EOFError, OSError):
+            pass
+        except Exception as error:
+            logger.error(f"Log stream error: {error}")
+        finally:
+            connection.close()
+
+    def stop(self) -> None:
+        if self._listener is None:
+            return
+        os.environ.pop(STREAM_TRIGGER_ADDRESS_ENV, None)
+        os.environ.pop(STREAM_TRIGGER_AUTHKEY_ENV, None)
+        self._listener.close()
+        self._listener = None
+
+
+stream_trigger_listener = StreamTriggerListener()
@@ -0,0 +1,261 @@
+"""
+Write-behind events writer.
+"""
+import logging
+import queue
+import threading
+import time
+
+from workflower.adapters.blob.store import BlobStore, blob_store
+from workflower.adapters.sqlalchemy.writer import (
+    DatabaseWriter,
+    database_writer,
+)
+from workflower.config import Config
+
+logger = logging.getLogger("workflower.adapters.sqlalchemy.event_writer")
+
+_STOP = object()
+
+
+class EventWriter:
+    """
+    Batch events, job status and next run time changes on a background
+    thread, so scheduler listeners do not wait for the database, and hand
+    batches to the database writer.
+
+    Changes are pushed to a bounded queue and written in batches of up to
+    flush_size changes, or every flush_latency seconds, on one transaction.
+    Events are inserted in the order they were pushed and job changes are
+    coalesced, only the last status and next run time of a job are written.
+
+    Outputs larger than output_threshold bytes are stored on the blob store,
+    and the event keeps the blob key and a preview of output_preview_size
+    characters.
+
+    Args:
+        - writer (DatabaseWriter, optional): database writer.
+        - blob_store (BlobStore, optional): large outputs store.
+        - output_threshold (int, optional): max output bytes stored on
+        database.
+        - output_preview_size (int, optional): output characters kept on
+        database when stored on blob store.
+        - max_queue_size (int, optional): queued changes before callers
+        block.
+        - flush_size (int, optional): max changes written per transaction.
+        - flush_latency (float, optional): max seconds a change waits on
+        queue before being written.
+    """
+
+    def __init__(
+        self,
+        writer: DatabaseWriter = database_writer,
+        max_queue_size: int = Config.EVENT_WRITER_QUEUE_SIZE,
+        flush_size: int = Config.EVENT_WRITER_FLUSH_SIZE,
+        flush_latency: float = Config.EVENT_WRITER_FLUSH_LATENCY,
+        blob_store: BlobStore = blob_store,
+        output_threshold: int = Config.BLOB_OUTPUT_THRESHOLD,
+        output_preview_size: int = Config.BLOB_OUTPUT_PREVIEW_SIZE,
+    ) -> None:
+        self.writer = writer
+        self.blob_store = blob_store
+        self.output_threshold = output_threshold
+        self.output_preview_size = output_preview_size
+        self.flush_size = flush_size
+        self.flush_latency = flush_latency
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="event-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _put(self, item) -> None:
+        self._ensure_started()
+        self._queue.put(item)
+
+    def write_event(
+        self,
+        name: str,
+        model: str,
+        model_id,
+        exception: str = None,
+        output: str = None,
+    ) -> None:
+        """
+        Queue an event to be written, exception and output are stored as
+        strings.
+        """
+        if exception is not None:
+            exception = str(exception)
+        if output is not None:
+            output = str(output)
+        self._put(
+            (
+                "event",
+                dict(
+                    name=name,
+                    model=model,
+                    model_id=model_id,
+                    exception=exception,
+                    output=output,
+                ),
+            )
+        )
+
+    def change_job_status(self, job_id, status: str) -> None:
+        """
+        Queue a job status change.
+        """
+        self._put(("job", job_id, dict(status=status)))
+
+    def update_next_run_time(self, job_id, next_run_time) -> None:
+        """
+        Queue a job next run time change.
+        """
+        self._put(("job", job_id, dict(next_run_time=next_run_time)))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every change queued so far has been written.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return True
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        return flushed.wait(timeout)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Write queued changes and stop writer thread.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        logger.info("Writing queued events")
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _store_outputs(self, batch: list) -> None:
+        """
+        Move large events outputs to blob store.
+        """
+        for item in batch:
+            if item[0] != "event":
+                continue
+            attributes = item[1]
+            output = attributes["output"]
+            if output is None or len(output) <= self.output_threshold // 4:
+                # Characters are at most 4 utf-8 bytes
+                continue
+            data = output.encode("utf-8")
+            if len(data) <= self.output_threshold:
+                continue
+            try:
+                attributes["output_blob"] = self.blob_store.put(data)
+            except OSError as error:
+                logger.warning(f"Error storing output, keeping it: {error}")
+                continue
+            attributes["output"] = output[: self.output_preview_size]
+
+    def _write(self, uow, batch: list) -> None:
+        events = []
+        jobs_updates = {}
+        for item in batch:
+            if item[0] == "event":
+                events.append(item[1])
+                continue
+            _, job_id, attributes = item
+            try:
+                job_id = int(job_id)
+            except (TypeError, ValueError):
+                # Not a workflow job
+                continue
+            jobs_updates.setdefault(job_id, dict(id=job_id)).update(attributes)
+        with uow:
+            if events:
+                uow.events.bulk_add(events)
+            if jobs_updates:
+                uow.jobs.bulk_update(list(jobs_updates.values()))
+            # Unit of work exit swallows commit errors, batch is retried
+            uow.commit()
+        logger.debug(
+            f"Written {len(events)} events and {len(jobs_updates)} jobs"
+        )
+
+    def _write_with_retry(self, batch: list) -> None:
+        for attempt in range(3):
+            try:
+                self.writer.execute(self._write, batch)
+                return
+            except Exception as error:
+                logger.warning(f"Error writing events, retrying: {error}")
+                time.sleep(self.flush_latency * (attempt + 1))
+        logger.error(f"Discarding {len(batch)} events changes")
+
+    def _get_batch(self):
+        """
+        Wait for queued changes, returning them once flush_size changes are
+        queued, flush_latency seconds passed, or a flush or stop has been
+        requested.
+        """
+        batch = []
+        waiting = []
+        stopping = False
+        item = self._queue.get()
+        deadline = time.monotonic() + self.flush_latency
+        while True:
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiting.append(item)
+            else:
+                batch.append(item)
+            if stopping or waiting or len(batch) >= self.flush_size:
+                break
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+        return batch, waiting, stopping
+
+    def _drain(self):
+        batch = []
+        waiting = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, waiting
+            if isinstance(item, threading.Event):
+                waiting.append(item)
+            elif item is not _STOP:
+                batch.append(item)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, waiting, stopping = self._get_batch()
+            if stopping:
+                remaining_batch, remaining_waiting = self._drain()
+                batch.extend(remaining_batch)
+                waiting.extend(remaining_waiting)
+            self._store_outputs(batch)
+            for index in range(0, len(batch), self.flush_size):
+                self._write_with_retry(batch[index : index + self.flush_size])
+            for flushed in waiting:
+                flushed.set()
+
+
+event_writer = EventWriter()
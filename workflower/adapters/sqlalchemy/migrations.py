@@ -0,0 +1,212 @@
+"""
+Database schema migrations.
+"""
+import logging
+
+from workflower.adapters.sqlalchemy.orm import (
+    event,
+    job,
+    job_dependency,
+    workflow,
+)
+
+from sqlalchemy import MetaData, Table, inspect
+
+logger = logging.getLogger("workflower.adapters.sqlalchemy.migrations")
+
+
+def _get_columns_types(connection, table_name: str) -> dict:
+    if not inspect(connection).has_table(table_name):
+        return {}
+    return {
+        column["name"]: str(column["type"])
+        for column in inspect(connection).get_columns(table_name)
+    }
+
+
+def _add_column(connection, table_name: str, column_name: str, type_: str):
+    if column_name in _get_columns_types(connection, table_name):
+        return
+    connection.exec_driver_sql(
+        f"ALTER TABLE {table_name} ADD COLUMN {column_name} {type_}"
+    )
+
+
+def _create_indexes(connection, table: Table) -> None:
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def _rebuild_table(connection, table: Table, converted_columns: dict):
+    """
+    Recreate a table with its current definition, copying its rows.
+
+    SQLite can not change columns types in place, so rows are copied to a
+    new table, that replaces the old one.
+
+    Args:
+        - table (Table): current table definition.
+        - converted_columns (dict): SQL expressions, by column name, used
+        to copy columns whose values are converted.
+    """
+    new_table_name = f"_new_{table.name}"
+    # Referenced tables are copied too, for foreign keys to be resolved
+    metadata = MetaData()
+    for referenced_table in table.metadata.sorted_tables:
+        referenced_table.to_metadata(metadata)
+    new_table = table.to_metadata(metadata, name=new_table_name)
+    # Indexes names are unique per database, they are created once the old
+    # table, with its indexes, is dropped
+    new_table.indexes.clear()
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {new_table_name}")
+    new_table.create(connection)
+
+    old_columns = _get_columns_types(connection, table.name)
+    columns = [column.name for column in table.columns]
+    values = [
+        converted_columns.get(column, column)
+        if column in old_columns
+        else "NULL"
+        for column in columns
+    ]
+    connection.exec_driver_sql(
+        f"INSERT INTO {new_table_name} ({', '.join(columns)}) "
+        f"SELECT {', '.join(values)} FROM {table.name}"
+    )
+    connection.exec_driver_sql(f"DROP TABLE {table.name}")
+    connection.exec_driver_sql(
+        f"ALTER TABLE {new_table_name} RENAME TO {table.name}"
+    )
+    _create_indexes(connection, table)
+
+
+def _copy_job_dependencies(connection) -> None:
+    """
+    Copy dependencies from job depends_on column, which held one job id, to
+    job_dependency table.
+    """
+    job_dependency.create(connection, checkfirst=True)
+    connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO job_dependency (job_id, depends_on_job_id) "
+        "SELECT id, CAST(depends_on AS INTEGER) FROM job "
+        "WHERE depends_on IS NOT NULL AND depends_on != ''"
+    )
+
+
+def add_event_output_blob(connection) -> None:
+    """
+    Event outputs stored on blob store.
+    """
+    _add_column(connection, "event", "output_blob", "VARCHAR")
+
+
+def type_columns_and_add_indexes(connection) -> None:
+    """
+    Typed job next_run_time and workflow file_last_modified_at columns, with
+    job and event lookup indexes.
+    """
+    job_columns_types = _get_columns_types(connection, "job")
+    if job_columns_types.get("next_run_time") == "VARCHAR":
+        # Current job definition has no depends_on column
+        if "depends_on" in job_columns_types:
+            _copy_job_dependencies(connection)
+        # Next run times were stored with their offset, they are written
+        # again on next reconciliation
+        _rebuild_table(connection, job, dict(next_run_time="NULL"))
+    workflow_columns_types = _get_columns_types(connection, "workflow")
+    if workflow_columns_types.get("file_last_modified_at") == "VARCHAR":
+        _rebuild_table(
+            connection,
+            workflow,
+            dict(file_last_modified_at="CAST(file_last_modified_at AS REAL)"),
+        )
+    for table in (job, event):
+        if inspect(connection).has_table(table.name):
+            _create_indexes(connection, table)
+
+
+def add_job_dependencies_and_trigger_rule(connection) -> None:
+    """
+    Many dependencies per job, on job_dependency table, with job
+    trigger_rule column.
+    """
+    job_columns_types = _get_columns_types(connection, "job")
+    if not job_columns_types:
+        return
+    job_dependency.create(connection, checkfirst=True)
+    if "depends_on" in job_columns_types:
+        _copy_job_dependencies(connection)
+        _rebuild_table(connection, job, {})
+    _add_column(connection, "job", "trigger_rule", "VARCHAR")
+
+
+def add_job_dependency_logs_pattern_options(connection) -> None:
+    """
+    Job dependency logs pattern mode and case sensitivity columns.
+    """
+    if not _get_columns_types(connection, "job"):
+        return
+    _add_column(connection, "job", "dependency_logs_pattern_mode", "VARCHAR")
+    _add_column(
+        connection, "job", "dependency_logs_pattern_case_sensitive", "BOOLEAN"
+    )
+
+
+def add_job_early_trigger(connection) -> None:
+    """
+    Job early_trigger column.
+    """
+    if not _get_columns_types(connection, "job"):
+        return
+    _add_column(connection, "job", "early_trigger", "VARCHAR")
+
+
+# Migrations run in order, each one exactly once per database, new
+# migrations must be appended
+MIGRATIONS = [
+    add_event_output_blob,
+    type_columns_and_add_indexes,
+    add_job_dependencies_and_trigger_rule,
+    add_job_dependency_logs_pattern_options,
+    add_job_early_trigger,
+]
+
+
+def get_schema_version(connection) -> int:
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(engine) -> None:
+    """
+    Upgrade database schema, created by an older version, to current one.
+
+    Applied migrations are tracked on SQLite user_version pragma, all of
+    them run on a single transaction.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        # Leave transaction handling to SQLite, so it wraps schema changes
+        # too
+        connection = connection.execution_options(
+            isolation_level="AUTOCOMMIT", autocommit=False
+        )
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            schema_version = get_schema_version(connection)
+            for version, migration in enumerate(MIGRATIONS, start=1):
+                if version <= schema_version:
+                    continue
+                logger.info(
+                    f"Running migration {version}: {migration.__name__}"
+                )
+                migration(connection)
+            connection.exec_driver_sql(
+                f"PRAGMA user_version = {len(MIGRATIONS)}"
+            )
+        except Exception:
+            # Failed statements may have rolled transaction back already
+            if connection.connection.dbapi_connection.in_transaction:
+                connection.exec_driver_sql("ROLLBACK")
+            raise
+        connection.exec_driver_sql("COMMIT")
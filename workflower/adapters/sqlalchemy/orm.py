@@ -5,26 +5,53 @@
 # - https://github.com/pcieslinski/courses_platform
 # - https://github.com/evoludigit/clean_fastapi
 # - https://github.com/kurosouza/webshop
+import datetime
+
 from workflower.adapters.sqlalchemy.setup import metadata
 from workflower.domain.entities.event import Event
 from workflower.domain.entities.job import Job
 from workflower.domain.entities.workflow import Workflow
+from workflower.domain.entities.workflow_file import WorkflowFile
 
 from sqlalchemy import (
     JSON,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Table,
+    TypeDecorator,
     UniqueConstraint,
 )
 from sqlalchemy.orm import mapper, relationship
 from sqlalchemy.sql import func
 
+
+class UTCDateTime(TypeDecorator):
+    """
+    Timezone aware datetime stored as naive UTC, naive datetimes are taken
+    as UTC.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc)
+            value = value.replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value
+
+
 workflow: Table = Table(
     "workflow",
     metadata,
@@ -62,7 +89,7 @@ workflow: Table = Table(
     ),
     Column(
         "file_last_modified_at",
-        String,
+        Float,
     ),
     Column(
         "modified_since_last_load",
@@ -108,13 +135,26 @@ job: Table = Table(
         JSON,
     ),
     Column(
-        "depends_on",
+        "trigger_rule",
         String,
     ),
     Column(
         "dependency_logs_pattern",
         String,
     ),
+    Column(
+        "dependency_logs_pattern_mode",
+        String,
+    ),
+    Column(
+        "dependency_logs_pattern_case_sensitive",
+        Boolean,
+        default=False,
+    ),
+    Column(
+        "early_trigger",
+        String,
+    ),
     Column(
         "run_if_pattern_match",
         Boolean,
@@ -132,7 +172,7 @@ job: Table = Table(
     ),
     Column(
         "next_run_time",
-        String,
+        UTCDateTime,
     ),
     Column(
         "created_at",
@@ -146,6 +186,27 @@ job: Table = Table(
     ),
     UniqueConstraint("name", "workflow_id", name="_name_workflow_id_uc"),
     Index("name_workflow_id_idx", "name", "workflow_id"),
+    Index("job_status_idx", "status"),
+    Index("job_workflow_id_is_active_idx", "workflow_id", "is_active"),
+)
+
+job_dependency: Table = Table(
+    "job_dependency",
+    metadata,
+    Column(
+        "job_id",
+        Integer,
+        ForeignKey("job.id"),
+        primary_key=True,
+    ),
+    Column(
+        "depends_on_job_id",
+        Integer,
+        ForeignKey("job.id"),
+        primary_key=True,
+    ),
+    # Dependency fan out
+    Index("job_dependency_depends_on_job_id_idx", "depends_on_job_id"),
 )
 
 event: Table = Table(
@@ -178,6 +239,57 @@ event: Table = Table(
         "output",
         String,
     ),
+    Column(
+        "output_blob",
+        String,
+    ),
+    Column(
+        "created_at",
+        DateTime(timezone=True),
+        server_default=func.now(),
+    ),
+    Column(
+        "updated_at",
+        DateTime(timezone=True),
+        onupdate=func.now(),
+    ),
+    # Model history
+    Index(
+        "event_model_model_id_created_at_idx",
+        "model",
+        "model_id",
+        "created_at",
+    ),
+)
+
+workflow_file: Table = Table(
+    "workflow_file",
+    metadata,
+    Column(
+        "id",
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        index=True,
+    ),
+    Column(
+        "file_path",
+        String,
+        unique=True,
+        index=True,
+    ),
+    Column(
+        "file_size",
+        Integer,
+    ),
+    Column(
+        "file_last_modified_at",
+        Float,
+    ),
+    Column(
+        "file_hash",
+        String,
+    ),
     Column(
         "created_at",
         DateTime(timezone=True),
@@ -199,6 +311,16 @@ def run_mappers():
     mapper(
         Job,
         job,
-        properties={"workflow": relationship(Workflow, back_populates="jobs")},
+        properties={
+            "workflow": relationship(Workflow, back_populates="jobs"),
+            "depends_on": relationship(
+                Job,
+                secondary=job_dependency,
+                primaryjoin=job.c.id == job_dependency.c.job_id,
+                secondaryjoin=job.c.id == job_dependency.c.depends_on_job_id,
+                backref="dependency_jobs",
+            ),
+        },
     )
     mapper(Event, event)
+    mapper(WorkflowFile, workflow_file)
@@ -1,11 +1,14 @@
 import logging
+from typing import List
 
 from workflower.application.interfaces.repository import (
     Entity,
     Model,
+    Relationships,
     Repository,
 )
 
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
 
 logger = logging.getLogger("workflower.adapters.repository")
@@ -49,6 +52,72 @@ class SqlAlchemyRepository(Repository):
         """
         return self.session.query(self.model).filter_by(**kwargs).all()
 
+    def list_with_relationships(
+        self, relationships: List[Relationships], **kwargs
+    ):
+        """
+        Get list of objects of a model type, eager loading the given
+        relationships with one extra query each instead of one per object.
+
+        Relationships of related objects are given as dotted paths, like
+        "jobs.depends_on". Filters given as list, set or tuple match any of
+        their values.
+        """
+        options = [
+            self._get_load_option(relationship)
+            for relationship in relationships
+        ]
+        query = self.session.query(self.model).options(*options)
+        for attribute, value in kwargs.items():
+            if isinstance(value, (list, set, tuple)):
+                query = query.filter(getattr(self.model, attribute).in_(value))
+            else:
+                query = query.filter_by(**{attribute: value})
+        return query.all()
+
+    def _get_load_option(self, relationship: str):
+        """
+        Chain eager loading through a dotted relationships path.
+        """
+        option = None
+        model = self.model
+        for name in relationship.split("."):
+            attribute = getattr(model, name)
+            option = (
+                selectinload(attribute)
+                if option is None
+                else option.selectinload(attribute)
+            )
+            model = attribute.property.mapper.class_
+        return option
+
+    def bulk_add(self, mappings: List[dict]) -> None:
+        """
+        Insert many objects of model type from attributes dicts.
+        """
+        logger.debug(f"Bulk adding {len(mappings)} {self.model}")
+        self.session.bulk_insert_mappings(self.model, mappings)
+
+    def bulk_update(self, mappings: List[dict]) -> None:
+        """
+        Update many objects of model type from attributes dicts including
+        their primary key.
+
+        Mappings with the same attributes are sent as one statement.
+        """
+        logger.debug(f"Bulk updating {len(mappings)} {self.model}")
+        mappings = sorted(mappings, key=lambda mapping: sorted(mapping))
+        self.session.bulk_update_mappings(self.model, mappings)
+
+    def bulk_remove(self, ids: List[int]) -> None:
+        """
+        Remove many objects of model type by their ids.
+        """
+        logger.debug(f"Bulk deleting {len(ids)} {self.model}")
+        self.session.query(self.model).filter(self.model.id.in_(ids)).delete(
+            synchronize_session=False
+        )
+
     def update(self, filter_dict: dict, new_attributes_dict: dict):
         """
         Update a object of model type.
@@ -0,0 +1,322 @@
+"""
+Events retention.
+"""
+import datetime
+import glob
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+
+from workflower.adapters.blob.store import BlobStore, blob_store
+from workflower.adapters.sqlalchemy.orm import event
+from workflower.adapters.sqlalchemy.setup import read_engine
+from workflower.adapters.sqlalchemy.writer import (
+    DatabaseWriter,
+    database_writer,
+)
+from workflower.config import Config
+
+from sqlalchemy import or_, select, text
+
+logger = logging.getLogger("workflower.adapters.sqlalchemy.retention")
+
+ARCHIVE_FILE_PREFIX = "events-"
+ARCHIVE_FILE_SUFFIX = ".jsonl.gz"
+UNDATED_PARTITION = "undated"
+
+
+def _serialize_date(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def get_archive_file_path(archive_dir: str, partition: str) -> str:
+    """
+    Archive file of a day partition.
+    """
+    return os.path.join(
+        archive_dir, f"{ARCHIVE_FILE_PREFIX}{partition}{ARCHIVE_FILE_SUFFIX}"
+    )
+
+
+def _get_partition(created_at) -> str:
+    if created_at is None:
+        return UNDATED_PARTITION
+    if isinstance(created_at, str):
+        return created_at[:10]
+    return created_at.date().isoformat()
+
+
+def _read_archive_file(file_path: str):
+    """
+    Read events of one archive file, member by member, a file truncated by
+    an interrupted rollover is read up to its last complete member.
+    """
+    with open(file_path, "rb") as archive_file:
+        data = archive_file.read()
+    while data:
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        try:
+            content = decompressor.decompress(data)
+        except zlib.error as error:
+            logger.warning(f"Archive file {file_path} is corrupted: {error}")
+            return
+        if not decompressor.eof:
+            logger.warning(f"Archive file {file_path} is truncated")
+            return
+        for line in content.decode("utf-8").splitlines():
+            if line.strip():
+                yield json.loads(line)
+        data = decompressor.unused_data
+
+
+def query_archived_events(
+    archive_dir: str = Config.EVENT_ARCHIVE_DIR,
+    start_date: datetime.date = None,
+    end_date: datetime.date = None,
+    **filters,
+):
+    """
+    Query archived events.
+
+    Args:
+        - archive_dir (str, optional): events archive directory.
+        - start_date (datetime.date, optional): first day of events.
+        - end_date (datetime.date, optional): last day of events.
+        - filters: event attributes to match, like model or model_id,
+        compared as strings.
+
+    Yields events as dicts, ordered by day and id, only day partitions
+    between start_date and end_date are read.
+    """
+    pattern = get_archive_file_path(archive_dir, "*")
+    file_paths = sorted(glob.glob(pattern))
+    for file_path in file_paths:
+        partition = os.path.basename(file_path)[
+            len(ARCHIVE_FILE_PREFIX) : -len(ARCHIVE_FILE_SUFFIX)
+        ]
+        if partition != UNDATED_PARTITION:
+            partition_date = datetime.date.fromisoformat(partition)
+            if start_date and partition_date < start_date:
+                continue
+            if end_date and partition_date > end_date:
+                continue
+        seen_ids = set()
+        events = []
+        for archived_event in _read_archive_file(file_path):
+            # Events archived again after an interrupted rollover
+            if archived_event["id"] in seen_ids:
+                continue
+            seen_ids.add(archived_event["id"])
+            if all(
+                str(archived_event.get(attribute)) == str(value)
+                for attribute, value in filters.items()
+            ):
+                events.append(archived_event)
+        yield from sorted(events, key=lambda item: item["id"])
+
+
+def enable_incremental_vacuum(engine, rebuild: bool = True) -> None:
+    """
+    Set SQLite database auto vacuum to incremental. Unless the database is
+    empty, it takes a full vacuum rebuilding it, run once, if rebuild is
+    set.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+
+        def get_auto_vacuum():
+            return connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+        # 2 is incremental
+        if get_auto_vacuum() == 2:
+            return
+        connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        if get_auto_vacuum() == 2 or not rebuild:
+            return
+        logger.info("Rebuilding database to enable incremental vacuum")
+        connection.exec_driver_sql("VACUUM")
+
+
+class EventRetention:
+    """
+    Keep only recent events on database.
+
+    Events older than max_age_days, or beyond the newest max_rows, are
+    rolled over to gzip compressed JSON lines archives, one per day, and
+    deleted from database in batches. Freed pages are then given back to
+    the file system with an incremental vacuum.
+
+    An archive is written before its events are deleted, so an interrupted
+    rollover may archive events twice, but never loses them. Outputs stored
+    on the blob store are archived whole, and their blobs removed once no
+    event on database refers to them.
+
+    Args:
+        - archive_dir (str, optional): events archive directory.
+        - max_age_days (int, optional): days events stay on database, 0 keeps
+        them regardless of age.
+        - max_rows (int, optional): events kept on database, 0 keeps them
+        regardless of count.
+        - batch_size (int, optional): events rolled over per transaction.
+        - vacuum_pages (int, optional): max pages freed per rollover.
+        - engine (sqlalchemy.engine.Engine, optional): engine events are read
+        from.
+        - writer (DatabaseWriter, optional): database writer.
+        - blob_store (BlobStore, optional): large outputs store.
+    """
+
+    def __init__(
+        self,
+        archive_dir: str = Config.EVENT_ARCHIVE_DIR,
+        max_age_days: int = Config.EVENT_RETENTION_DAYS,
+        max_rows: int = Config.EVENT_RETENTION_MAX_ROWS,
+        batch_size: int = Config.EVENT_ROLLOVER_BATCH_SIZE,
+        vacuum_pages: int = Config.EVENT_VACUUM_PAGES,
+        engine=read_engine,
+        writer: DatabaseWriter = database_writer,
+        blob_store: BlobStore = blob_store,
+    ) -> None:
+        self.archive_dir = archive_dir
+        self.max_age_days = max_age_days
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.engine = engine
+        self.writer = writer
+        self.blob_store = blob_store
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Whether events are rolled over at all.
+        """
+        return bool(self.max_age_days or self.max_rows)
+
+    def _get_rollover_conditions(self, connection) -> list:
+        conditions = []
+        if self.max_age_days:
+            cutoff = datetime.datetime.utcnow() - datetime.timedelta(
+                days=self.max_age_days
+            )
+            conditions.append(event.c.created_at < cutoff)
+        if self.max_rows:
+            last_rolled_id = connection.execute(
+                select(event.c.id)
+                .order_by(event.c.id.desc())
+                .limit(1)
+                .offset(self.max_rows)
+            ).scalar()
+            if last_rolled_id is not None:
+                conditions.append(event.c.id <= last_rolled_id)
+        return conditions
+
+    def _get_batch(self, connection, conditions: list, after_id: int):
+        query = (
+            select(event)
+            .where(or_(*conditions), event.c.id > after_id)
+            .order_by(event.c.id)
+            .limit(self.batch_size)
+        )
+        return [dict(row._mapping) for row in connection.execute(query)]
+
+    def _archive(self, batch: list) -> None:
+        partitions = {}
+        for row in batch:
+            partition = _get_partition(row["created_at"])
+            partitions.setdefault(partition, []).append(row)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        for partition, rows in partitions.items():
+            file_path = get_archive_file_path(self.archive_dir, partition)
+            # Each batch is appended as a new gzip member
+            with open(file_path, "ab") as raw_file:
+                with gzip.GzipFile(fileobj=raw_file, mode="ab") as gzip_file:
+                    for row in rows:
+                        if row.get("output_blob"):
+                            # Blob is removed along with the event
+                            row = dict(
+                                row,
+                                output=self.blob_store.get_output(
+                                    row["output"], row["output_blob"]
+                                ),
+                                output_blob=None,
+                            )
+                        line = json.dumps(
+                            {
+                                key: _serialize_date(value)
+                                for key, value in row.items()
+                            }
+                        )
+                        gzip_file.write(f"{line}\n".encode("utf-8"))
+                raw_file.flush()
+                os.fsync(raw_file.fileno())
+
+    def _delete(self, uow, ids: list, blob_keys: set) -> list:
+        """
+        Delete events, returning their blobs keys no other event refers to.
+        """
+        with uow:
+            uow.events.bulk_remove(ids)
+            referenced_keys = set()
+            if blob_keys:
+                referenced_keys = set(
+                    uow.session.execute(
+                        select(event.c.output_blob).where(
+                            event.c.output_blob.in_(blob_keys)
+                        )
+                    ).scalars()
+                )
+            uow.commit()
+        return [key for key in blob_keys if key not in referenced_keys]
+
+    def _vacuum(self, uow) -> None:
+        result = uow.session.execute(
+            text(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})")
+        )
+        # Pages are only freed as the statement rows are fetched
+        if result.returns_rows:
+            result.fetchall()
+
+    def roll_over(self) -> int:
+        """
+        Archive and delete events out of retention window.
+
+        Returns the number of events rolled over.
+        """
+        rolled_over_count = 0
+        started_at = time.time()
+        with self.engine.connect() as connection:
+            conditions = self._get_rollover_conditions(connection)
+            if not conditions:
+                return 0
+            after_id = 0
+            while True:
+                batch = self._get_batch(connection, conditions, after_id)
+                if not batch:
+                    break
+                self._archive(batch)
+                ids = [row["id"] for row in batch]
+                blob_keys = {
+                    row["output_blob"] for row in batch if row["output_blob"]
+                }
+                unreferenced_keys = self.writer.execute(
+                    self._delete, ids, blob_keys
+                )
+                for key in unreferenced_keys:
+                    # Unless stored again for an event not written yet
+                    self.blob_store.remove(key, unused_since=started_at)
+                rolled_over_count += len(batch)
+                after_id = ids[-1]
+        if rolled_over_count:
+            logger.info(f"Rolled over {rolled_over_count} events")
+            if self.engine.dialect.name == "sqlite" and self.vacuum_pages:
+                self.writer.execute(self._vacuum)
+        return rolled_over_count
+
+
+event_retention = EventRetention()
@@ -3,7 +3,7 @@ import logging
 from workflower.config import Config
 
 from sqlalchemy import MetaData, create_engine, event
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 logger = logging.getLogger("workflower.adapters.sqlalchemy.setup")
@@ -27,6 +27,48 @@ Session = scoped_session(
 )
 
 
+def get_read_only_database_url(database_url: str) -> str:
+    """
+    Read only URL of a SQLite database file, None for other databases.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return None
+    if not url.database or url.database == ":memory:":
+        return None
+    return f"sqlite:///file:{url.database}?mode=ro&uri=true"
+
+
+# Only the database writer thread writes through this session factory, a
+# session by call, objects are not expired on commit so their attributes are
+# read after it
+write_session_factory = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
+
+_read_only_database_url = get_read_only_database_url(Config.APP_DATABASE_URL)
+if _read_only_database_url:
+    read_engine = create_engine(
+        _read_only_database_url,
+        connect_args={
+            "timeout": 15,
+        },
+    )
+else:
+    read_engine = engine
+
+ReadSession = scoped_session(
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=read_engine,
+    )
+)
+
+
 @event.listens_for(Engine, "connect")
 def connect(dbapi_con, connection_record):
     """
@@ -38,5 +80,10 @@ def connect(dbapi_con, connection_record):
 
     logger.debug("Setting Wall Mode")
     cursor = dbapi_con.cursor()
-    cursor.execute("pragma journal_mode=WAL")
-    cursor.close()
+    try:
+        cursor.execute("pragma journal_mode=WAL")
+    except Exception as error:
+        # Read only connections can not change journal mode
+        logger.debug(f"Could not set WAL mode: {error}")
+    finally:
+        cursor.close()
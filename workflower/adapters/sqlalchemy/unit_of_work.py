@@ -5,6 +5,7 @@ from workflower.application.interfaces.unit_of_work import UnitOfWork
 from workflower.domain.entities.event import Event
 from workflower.domain.entities.job import Job
 from workflower.domain.entities.workflow import Workflow
+from workflower.domain.entities.workflow_file import WorkflowFile
 
 
 class SqlAlchemyUnitOfWork(UnitOfWork):
@@ -20,6 +21,9 @@ class SqlAlchemyUnitOfWork(UnitOfWork):
         self.workflows = SqlAlchemyRepository(self.session, model=Workflow)
         self.jobs = SqlAlchemyRepository(self.session, model=Job)
         self.events = SqlAlchemyRepository(self.session, model=Event)
+        self.workflow_files = SqlAlchemyRepository(
+            self.session, model=WorkflowFile
+        )
         return self
 
     def __exit__(self, *args: Any):
@@ -28,6 +32,9 @@ class SqlAlchemyUnitOfWork(UnitOfWork):
         except Exception:
             self.rollback()
 
+    def flush(self):
+        self.session.flush()
+
     def commit(self):
         self.session.commit()
 
@@ -0,0 +1,126 @@
+"""
+Single database writer.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from workflower.adapters.sqlalchemy.setup import write_session_factory
+from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
+
+logger = logging.getLogger("workflower.adapters.sqlalchemy.writer")
+
+_STOP = object()
+
+
+class DatabaseWriter:
+    """
+    Serialize database writes on one thread, so writers queue in memory
+    instead of retrying on database locks.
+
+    Submitted functions receive a unit of work bound to a new session,
+    closed once they return, and run in submission order. Functions
+    submitted from the writer thread itself run immediately, on the running
+    function unit of work.
+
+    Sessions are not shared between calls, so bulk writes bypassing the
+    identity map never leave other calls with stale objects. Functions must
+    return plain data, not objects attached to their session.
+
+    Args:
+        - session_factory (callable, optional): creates writer sessions.
+    """
+
+    def __init__(self, session_factory=write_session_factory) -> None:
+        self.session_factory = session_factory
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._uow = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="database-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _is_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Queue fn(uow, *args, **kwargs) to run on the writer thread.
+        """
+        if self._is_writer_thread():
+            future = Future()
+            self._call(future, fn, args, kwargs)
+            return future
+        self._ensure_started()
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def execute(self, fn, *args, **kwargs):
+        """
+        Run fn(uow, *args, **kwargs) on the writer thread and wait for its
+        result.
+        """
+        return self.submit(fn, *args, **kwargs).result()
+
+    def execute_command(self, command_class, *args, **kwargs):
+        """
+        Execute a command built with the writer unit of work.
+        """
+        return self.execute(
+            lambda uow: command_class(uow, *args, **kwargs).execute()
+        )
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Run queued writes and stop writer thread.
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _call(self, future: Future, fn, args, kwargs) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        # Nested writes join the running function unit of work
+        if self._uow is not None:
+            self._call_with_uow(future, self._uow, fn, args, kwargs)
+            return
+        session = self.session_factory()
+        self._uow = SqlAlchemyUnitOfWork(session)
+        try:
+            self._call_with_uow(future, self._uow, fn, args, kwargs)
+        finally:
+            self._uow = None
+            session.close()
+
+    @staticmethod
+    def _call_with_uow(future: Future, uow, fn, args, kwargs) -> None:
+        try:
+            result = fn(uow, *args, **kwargs)
+        except BaseException as error:
+            uow.rollback()
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            future, fn, args, kwargs = item
+            self._call(future, fn, args, kwargs)
+
+
+database_writer = DatabaseWriter()
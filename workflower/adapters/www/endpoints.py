@@ -1,7 +1,16 @@
+import datetime
+import itertools
 from pathlib import Path
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
+from workflower.adapters.blob.store import blob_store, get_event_output
+from workflower.adapters.scheduler.dispatch import dispatch_queues
+from workflower.adapters.scheduler.pools import resource_pools
+from workflower.adapters.sqlalchemy.retention import query_archived_events
+from workflower.adapters.sqlalchemy.setup import ReadSession
+from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
 
 BASE_PATH = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_PATH / "templates"))
@@ -17,3 +26,53 @@ async def serve_home(request: Request):
 @router.get("/hello")
 async def say_hello():
     return {"message": "Hello, World!"}
+
+
+@router.get("/resource_pools")
+async def get_resource_pools():
+    return resource_pools.get_stats()
+
+
+@router.get("/dispatch_queues")
+async def get_dispatch_queues():
+    return {
+        alias: dispatch_queue.get_stats()
+        for alias, dispatch_queue in dispatch_queues.items()
+    }
+
+
+@router.get("/archived_events")
+def get_archived_events(
+    start_date: datetime.date = None,
+    end_date: datetime.date = None,
+    model: str = None,
+    model_id: str = None,
+    name: str = None,
+    limit: int = 100,
+):
+    # Archives are read from disk, so it runs on a worker thread
+    filters = dict(model=model, model_id=model_id, name=name)
+    archived_events = query_archived_events(
+        start_date=start_date,
+        end_date=end_date,
+        **{key: value for key, value in filters.items() if value is not None},
+    )
+    return list(itertools.islice(archived_events, limit))
+
+
+@router.get("/events/{event_id}/output")
+def get_event_whole_output(event_id: int):
+    try:
+        with SqlAlchemyUnitOfWork(ReadSession()) as uow:
+            event = uow.events.get(id=event_id)
+            if event is None:
+                raise HTTPException(status_code=404, detail="Event not found")
+            output_blob = event.output_blob
+            if not output_blob or not blob_store.exists(output_blob):
+                return {"output": get_event_output(event)}
+    finally:
+        ReadSession.remove()
+    # Large outputs are streamed from the blob store, not loaded in memory
+    return StreamingResponse(
+        blob_store.open(output_blob), media_type="text/plain; charset=utf-8"
+    )
@@ -4,9 +4,10 @@ from typing import List, Literal, Type, Union
 from workflower.domain.entities.event import Event
 from workflower.domain.entities.job import Job
 from workflower.domain.entities.workflow import Workflow
+from workflower.domain.entities.workflow_file import WorkflowFile
 
-Model = Union[Type[Workflow], Type[Job], Type[Event]]
-Entity = Union[Workflow, Job, Event]
+Model = Union[Type[Workflow], Type[Job], Type[Event], Type[WorkflowFile]]
+Entity = Union[Workflow, Job, Event, WorkflowFile]
 Relationships = Literal["jobs"]
 
 
@@ -27,6 +28,24 @@ class Repository(ABC):
     def list(self, entity: Entity) -> List[Entity]:
         raise NotImplementedError
 
+    @abstractclassmethod
+    def list_with_relationships(
+        self, relationships: List[Relationships]
+    ) -> List[Entity]:
+        raise NotImplementedError
+
+    @abstractclassmethod
+    def bulk_add(self, mappings: List[dict]):
+        raise NotImplementedError
+
+    @abstractclassmethod
+    def bulk_update(self, mappings: List[dict]):
+        raise NotImplementedError
+
+    @abstractclassmethod
+    def bulk_remove(self, ids: List[int]):
+        raise NotImplementedError
+
     @abstractclassmethod
     def update(self, entity: Entity):
         raise NotImplementedError
@@ -1,3 +1,4 @@
+import datetime
 import logging
 import traceback
 
@@ -7,6 +8,7 @@ from workflower.application.interfaces.unit_of_work import UnitOfWork
 from workflower.domain.entities.job import Job
 from workflower.application.operators.factory import create_operator
 from workflower.plugins.factory import create_plugin
+from workflower.utils.pattern import Pattern, PatternMatcher
 
 logger = logging.getLogger("workflower.application.job.commands")
 
@@ -19,11 +21,11 @@ class CreateJobCommand:
         operator: str,
         definition: dict,
         workflow=None,
-        depends_on: str = None,
+        depends_on: list = None,
         dependency_logs_pattern: str = None,
         run_if_pattern_match: bool = None,
         is_active: bool = True,
-        next_run_time: bool = None,
+        next_run_time: datetime.datetime = None,
     ) -> None:
         self.unit_of_work = unit_of_work
         self.name = name
@@ -157,6 +159,69 @@ class UnscheduleJobCommand:
             logger.error(f"Error: {traceback.print_exc()}")
 
 
+def get_job_schedule_params(
+    job: Job, job_return_value=None, kwargs: dict = None
+) -> dict:
+    """
+    Build scheduler add_job parameters from a job definition.
+    """
+    schedule_params = job.definition.copy()
+    schedule_kwargs = dict(schedule_params.get("kwargs"))
+    schedule_kwargs.update(dict(job_id=job.id))
+    schedule_kwargs.update(dict(job_return_value=job_return_value))
+
+    plugins = schedule_kwargs.get("plugins")
+    if plugins:
+        plugins_list = list(
+            map(
+                lambda plugin_name: create_plugin(plugin_name),
+                plugins,
+            )
+        )
+        schedule_kwargs.update(dict(plugins=plugins_list))
+    if schedule_kwargs and kwargs:
+        schedule_kwargs.update(kwargs)
+    schedule_params.update(dict(kwargs=schedule_kwargs))
+
+    operator = create_operator(job.operator)
+    schedule_params.update(dict(func=getattr(operator, "execute")))
+    return schedule_params
+
+
+def add_scheduler_job(
+    scheduler,
+    job_id,
+    schedule_params: dict,
+    executor="default",
+    jobstore="default",
+):
+    """
+    Add a job to the scheduler, returning the scheduled job or None if it
+    could not be added.
+
+    Jobs run on the executor of their definition, if any.
+    """
+    schedule_params = dict(schedule_params)
+    executor = schedule_params.pop("executor", executor)
+    try:
+        scheduled_job = scheduler.add_job(
+            id=str(job_id),
+            executor=executor,
+            jobstore=jobstore,
+            **schedule_params,
+        )
+        logger.debug(f"Job {job_id} successfully scheduled")
+        return scheduled_job
+    except ConflictingIdError:
+        logger.warning(f"Job {job_id}, already scheduled, skipping.")
+    except ValueError as error:
+        # If someone set an invalid date value it will lead
+        # to this exception
+        logger.error(f"Job {job_id} value error: {error}")
+    except Exception as error:
+        logger.error(f"Error: {error}")
+
+
 # TODO
 # Tests
 class ScheduleJobCommand:
@@ -183,53 +248,35 @@ class ScheduleJobCommand:
             with self.unit_of_work as uow:
                 job = uow.jobs.get(id=self.job_id)
                 if job:
-                    schedule_params = job.definition.copy()
-                    schedule_kwargs = schedule_params.get("kwargs")
-                    schedule_kwargs.update(dict(job_id=job.id))
-                    schedule_kwargs.update(
-                        dict(job_return_value=self.job_return_value)
+                    schedule_params = get_job_schedule_params(
+                        job, self.job_return_value, self.kwargs
                     )
-
-                    plugins = schedule_kwargs.get("plugins")
-                    if plugins:
-                        plugins_list = list(
-                            map(
-                                lambda plugin_name: create_plugin(plugin_name),
-                                plugins,
-                            )
-                        )
-                        schedule_kwargs.update(dict(plugins=plugins_list))
-                    if schedule_kwargs and self.kwargs:
-                        schedule_kwargs.update(self.kwargs)
-
-                    operator = create_operator(job.operator)
-                    schedule_params.update(
-                        dict(func=getattr(operator, "execute"))
+                    add_scheduler_job(
+                        self.scheduler,
+                        job.id,
+                        schedule_params,
+                        self.executor,
+                        self.jobstore,
                     )
 
-                    try:
-                        self.scheduler.add_job(
-                            id=str(job.id),
-                            executor=self.executor,
-                            jobstore=self.jobstore,
-                            **schedule_params,
-                        )
-                        logger.debug(f"Job {job} successfully scheduled")
-                    except ConflictingIdError:
-                        logger.warning(f"{job}, already scheduled, skipping.")
-                    except ValueError as error:
-                        # If someone set an invalid date value it will lead
-                        # to this exception
-                        logger.error(f"{job} value error: {error}")
-                    except Exception as error:
-                        logger.error(f"Error: {error}")
-
         except IntegrityError as e:
             logger.error(f"Integrity error: {e}")
         except Exception:
             logger.error(f"Error: {traceback.print_exc()}")
 
 
+def get_dependency_logs_pattern(job: Job) -> Pattern:
+    """
+    Dependency logs pattern of a job, keyed by job id.
+    """
+    return Pattern(
+        job.id,
+        str(job.dependency_logs_pattern),
+        job.dependency_logs_pattern_mode or "literal",
+        bool(job.dependency_logs_pattern_case_sensitive),
+    )
+
+
 # TODO
 # Tests
 class GetDependencyTriggerJobsCommand:
@@ -247,22 +294,20 @@ class GetDependencyTriggerJobsCommand:
             with self.unit_of_work as uow:
                 job = uow.jobs.get(id=self.job_id)
                 if job:
-                    dependency_jobs = uow.jobs.list(depends_on=self.job_id)
+                    dependency_jobs = job.dependency_jobs
                     if dependency_jobs:
+                        # Job output is scanned once for all patterns
+                        matched = PatternMatcher(
+                            get_dependency_logs_pattern(dependency_job)
+                            for dependency_job in dependency_jobs
+                            if dependency_job.dependency_logs_pattern
+                        ).match(str(self.job_return_value))
                         for dependency_job in dependency_jobs:
                             if dependency_job.dependency_logs_pattern:
                                 logger.info(
                                     "Dependency job has log pattern to match"
                                 )
-                                # Check pattern
-                                # TODO
-                                # Make it as Regex
-                                matches = (
-                                    str(
-                                        dependency_job.dependency_logs_pattern
-                                    ).lower()
-                                    in self.job_return_value.lower()
-                                )
+                                matches = dependency_job.id in matched
 
                                 # ================================== ======== #
                                 # | matches | run_if_pattern_match | schedule |
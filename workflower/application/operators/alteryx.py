@@ -4,7 +4,11 @@ Alteryx helper module
 import logging
 from subprocess import PIPE, STDOUT, CalledProcessError, Popen
 
-from workflower.application.operators.operator import BaseOperator
+from workflower.application.operators.operator import (
+    BaseOperator,
+    stop_process,
+)
+from workflower.application.operators.stream import open_log_stream
 from workflower.config import Config
 
 
@@ -27,6 +31,7 @@ class AlteryxOperator(BaseOperator):
             stderr=STDOUT,
         )
         output = {"workflow_path": workflow_file_path, "logs": []}
+        log_stream = open_log_stream(kwargs.get("job_id"))
         with process.stdout:
             try:
                 for line in iter(process.stdout.readline, b""):
@@ -36,6 +41,15 @@ class AlteryxOperator(BaseOperator):
                     ).rstrip()
                     logger.info(decoded_line)
                     output["logs"].append({"message": decoded_line})
+                    if log_stream and log_stream.feed(decoded_line):
+                        logger.info("Aborted on logs pattern match")
+                        output.update(dict(aborted=True))
+                        stop_process(process)
+                        break
             except CalledProcessError as e:
                 logger.error(f"Error: {str(e)}")
+            finally:
+                if log_stream is not None:
+                    log_stream.close()
+        process.wait()
         return str(output)
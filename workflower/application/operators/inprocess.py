@@ -0,0 +1,188 @@
+"""
+Python code execution on the executor worker process.
+"""
+import ctypes
+import logging
+import runpy
+import sys
+import threading
+import traceback
+from typing import Callable
+
+logger = logging.getLogger("workflower.application.operators.inprocess")
+
+
+class ExecutionAborted(BaseException):
+    """
+    Raised on the executing thread to abort it.
+    """
+
+
+class ExecutionTimeout(BaseException):
+    """
+    Raised on the executing thread once its timeout is reached.
+    """
+
+
+class _LineWriter:
+    """
+    Text stream passing complete lines to on_line, raising ExecutionAborted
+    on the writing thread if it returns True.
+    """
+
+    def __init__(self, on_line: Callable[[str], bool]) -> None:
+        self._on_line = on_line
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            if self._on_line(line.rstrip()):
+                raise ExecutionAborted()
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            self._on_line(line.rstrip())
+
+
+class _ThreadLocalStream:
+    """
+    Standard stream writing to the writer set for the current thread, if
+    any, so in process executions running at once capture their own output.
+    """
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._local = threading.local()
+
+    def set_writer(self, writer) -> None:
+        self._local.writer = writer
+
+    def write(self, text: str) -> int:
+        writer = getattr(self._local, "writer", None)
+        if writer is None:
+            return self._stream.write(text)
+        return writer.write(text)
+
+    def flush(self) -> None:
+        writer = getattr(self._local, "writer", None)
+        if writer is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+_streams = None
+_streams_lock = threading.Lock()
+_stuck_threads = []
+
+
+def install_streams() -> tuple:
+    """
+    Replace sys.stdout and sys.stderr by thread local streams, on the
+    executor worker startup, again only if they were replaced since.
+    """
+    global _streams
+    with _streams_lock:
+        if _streams is None or (sys.stdout, sys.stderr) != _streams:
+            _streams = (
+                _ThreadLocalStream(sys.stdout),
+                _ThreadLocalStream(sys.stderr),
+            )
+            sys.stdout, sys.stderr = _streams
+        return _streams
+
+
+def has_stuck_executions() -> bool:
+    """
+    Whether a timed out execution is still running on this process, so
+    its worker should be replaced.
+    """
+    _stuck_threads[:] = [
+        thread for thread in _stuck_threads if thread.is_alive()
+    ]
+    return bool(_stuck_threads)
+
+
+def _raise_in_thread(thread: threading.Thread, exception) -> None:
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread.ident), ctypes.py_object(exception)
+    )
+
+
+def run_in_process(
+    on_line: Callable[[str], bool],
+    script_path: str = None,
+    code: str = None,
+    init_globals: dict = None,
+    timeout: float = None,
+) -> str:
+    """
+    Run python code, or a script, on a thread of this process, passing its
+    stdout and stderr lines to on_line, which aborts the run returning True.
+
+    A timed out run is interrupted at its next python instruction, code
+    blocked on a call is left running on a daemon thread, until the worker
+    is replaced, see has_stuck_executions.
+
+    Returns "completed", "failed", "aborted" or "timed_out".
+    """
+    stdout, stderr = install_streams()
+    result = dict(status="failed")
+
+    def target():
+        writer = _LineWriter(on_line)
+        stdout.set_writer(writer)
+        stderr.set_writer(writer)
+        try:
+            try:
+                if script_path:
+                    runpy.run_path(
+                        script_path,
+                        init_globals=init_globals,
+                        run_name="__main__",
+                    )
+                else:
+                    exec(
+                        compile(code, "<code>", "exec"),
+                        dict(init_globals or {}, __name__="__main__"),
+                    )
+                result.update(status="completed")
+            except SystemExit as error:
+                if error.code in [None, 0]:
+                    result.update(status="completed")
+                else:
+                    print(f"SystemExit: {error.code}", file=sys.stderr)
+            except ExecutionAborted:
+                result.update(status="aborted")
+            except ExecutionTimeout:
+                result.update(status="timed_out")
+            except Exception:
+                traceback.print_exc()
+            writer.close()
+        except ExecutionAborted:
+            result.update(status="aborted")
+        except ExecutionTimeout:
+            result.update(status="timed_out")
+        finally:
+            stdout.set_writer(None)
+            stderr.set_writer(None)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        _raise_in_thread(thread, ExecutionTimeout)
+        thread.join(1)
+        if thread.is_alive():
+            logger.warning("Timed out execution is blocked on a call")
+            _stuck_threads.append(thread)
+        return "timed_out"
+    return result["status"]
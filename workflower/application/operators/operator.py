@@ -1,4 +1,5 @@
 from abc import ABC, abstractclassmethod
+from subprocess import Popen, TimeoutExpired
 
 
 class BaseOperator(ABC):
@@ -11,3 +12,16 @@ class BaseOperator(ABC):
         pass
 
     pass
+
+
+def stop_process(process: Popen, timeout: float = 10) -> None:
+    """
+    Terminate a subprocess, killing it if it did not exit after timeout
+    seconds, and wait for it, so it is not left as a zombie.
+    """
+    process.terminate()
+    try:
+        process.wait(timeout=timeout)
+    except TimeoutExpired:
+        process.kill()
+        process.wait()
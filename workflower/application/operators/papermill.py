@@ -1,8 +1,14 @@
 import logging
-import shutil
+from contextlib import nullcontext
 
 from workflower.application.operators.operator import BaseOperator
-from workflower.utils.environment import create_and_install_kernel
+from workflower.config import Config
+from workflower.utils.environment import (
+    create_and_install_kernel,
+    discard_venv,
+    kernel_pool,
+    uninstall_kernel,
+)
 
 import papermill as pm
 
@@ -28,7 +34,10 @@ class PapermillOperator(BaseOperator):
         """
         Run notebook with papermill.
         """
-        if create_env:
+        lease = nullcontext(kernel_name)
+        if create_env and Config.KERNEL_POOL:
+            lease = kernel_pool.lease(pip_index_url, pip_trusted_host)
+        elif create_env:
             (
                 kernel_name,
                 kernel_spec_folder,
@@ -39,21 +48,23 @@ class PapermillOperator(BaseOperator):
                 pip_index_url,
                 pip_trusted_host,
             )
+            lease = nullcontext(kernel_name)
         logger.info(f"Running notebook: {input_path}")
         try:
-            notebook = pm.execute_notebook(
-                input_path=input_path,
-                output_path=output_path,
-                log_output=False,
-                progress_bar=False,
-                kernel_name=kernel_name,
-                request_save_on_cell_execute=True,
-            )
+            with lease as leased_kernel_name:
+                notebook = pm.execute_notebook(
+                    input_path=input_path,
+                    output_path=output_path,
+                    log_output=False,
+                    progress_bar=False,
+                    kernel_name=leased_kernel_name,
+                    request_save_on_cell_execute=True,
+                )
             return str(notebook)
         except Exception as error:
             logger.error(f"Papermill execution error: {error}")
         finally:
             if env_path is not None:
-                shutil.rmtree(path=env_path)
+                discard_venv(env_path)
             if kernel_spec_folder is not None:
-                shutil.rmtree(path=kernel_spec_folder)
+                uninstall_kernel(kernel_name, kernel_spec_folder)
@@ -1,12 +1,15 @@
 import logging
-import os
-import shutil
 import subprocess
+import threading
 import traceback
-import uuid
 
-from workflower.application.operators.operator import BaseOperator
-from workflower.utils.environment import create_venv
+from workflower.application.operators.inprocess import run_in_process
+from workflower.application.operators.operator import (
+    BaseOperator,
+    stop_process,
+)
+from workflower.application.operators.stream import open_log_stream
+from workflower.utils.environment import temporary_environment
 
 logger = logging.getLogger("workflower.application.operators.python")
 
@@ -21,6 +24,8 @@ class PythonOperator(BaseOperator):
         pip_index_url=None,
         pip_trusted_host=None,
         environments_dir=None,
+        isolation="venv",
+        timeout=None,
         *args,
         **kwargs,
     ):
@@ -29,38 +34,81 @@ class PythonOperator(BaseOperator):
         """
         output = {"logs": []}
 
-        venv_name = str(uuid.uuid4())
-        env_path, env_executable = create_venv(
-            venv_name, environments_dir=environments_dir
-        )
-
-        output.update(dict(env_executable=env_executable))
+        if isolation == "none":
+            return PythonOperator._run_in_process(
+                output, script_path, code, timeout, **kwargs
+            )
 
         if requirements_path:
-            if not os.path.isfile(requirements_path):
-                logger.warning("Invalid requirements file path")
-            pip_install_args = [
-                env_executable,
-                "-m",
-                "pip",
-                "-q",
-                "install",
-                "-r",
-                requirements_path,
-            ]
             output.update(dict(requirements_path=requirements_path))
 
-            if pip_index_url:
-                pip_install_args.append(f"--index-url={pip_index_url}")
-            if pip_trusted_host:
-                pip_install_args.append(f"--trusted-host={pip_trusted_host}")
+        # Runs get their own environment, cloned from the cached one if
+        # ENVIRONMENT_CACHE is enabled, so scripts can not change it
+        with temporary_environment(
+            environments_dir,
+            requirements_path,
+            pip_index_url,
+            pip_trusted_host,
+        ) as env_executable:
+            output.update(dict(env_executable=env_executable))
+            return PythonOperator._run(
+                env_executable, output, script_path, code, timeout, **kwargs
+            )
+
+    @staticmethod
+    def _run_in_process(
+        output, script_path=None, code=None, timeout=None, **kwargs
+    ):
+        """
+        Run python on this worker, with no interpreter startup nor virtual
+        environment.
+        """
+        if script_path:
+            logger.info(f"Running python script in process: {script_path}")
+            output.update(dict(script_path=script_path))
+        elif code:
+            logger.info(f"Running python code in process: {code}")
+            output.update(dict(code=code))
+
+        # Get output from previous job
+        init_globals = {}
+        if "job_return_value" in kwargs:
+            init_globals.update(job_return_value=kwargs["job_return_value"])
+
+        log_stream = open_log_stream(kwargs.get("job_id"))
+
+        def on_line(line):
+            logger.info(line)
+            output["logs"].append({"message": line})
+            return bool(log_stream and log_stream.feed(line))
 
-            subprocess.run(
-                pip_install_args,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.STDOUT,
+        try:
+            status = run_in_process(
+                on_line, script_path, code, init_globals, timeout
             )
+            if status == "aborted":
+                logger.info("Aborted on logs pattern match")
+                output.update(dict(aborted=True))
+            elif status == "timed_out":
+                logger.warning(f"Python execution timed out after {timeout}s")
+                output.update(dict(timed_out=True))
+            return str(output)
+        except Exception:
+            logger.error(f"Python execution error: {traceback.format_exc()}")
+            return str(output)
+        finally:
+            if log_stream is not None:
+                log_stream.close()
 
+    @staticmethod
+    def _run(
+        env_executable,
+        output,
+        script_path=None,
+        code=None,
+        timeout=None,
+        **kwargs,
+    ):
         run_python_args = [env_executable]
 
         #  Run script
@@ -80,12 +128,26 @@ class PythonOperator(BaseOperator):
             run_python_args.append(code)
             output.update(dict(code=code))
 
+        log_stream = open_log_stream(kwargs.get("job_id"))
+        timer = None
         try:
             process = subprocess.Popen(
                 run_python_args,
                 stdout=subprocess.PIPE,
             )
 
+            if timeout:
+
+                def kill():
+                    logger.warning(
+                        f"Python execution timed out after {timeout}s"
+                    )
+                    output.update(dict(timed_out=True))
+                    stop_process(process)
+
+                timer = threading.Timer(timeout, kill)
+                timer.start()
+
             # Capture logs if exists
             with process.stdout:
                 try:
@@ -96,12 +158,20 @@ class PythonOperator(BaseOperator):
                         ).rstrip()
                         logger.info(decoded_line)
                         output["logs"].append({"message": decoded_line})
+                        if log_stream and log_stream.feed(decoded_line):
+                            logger.info("Aborted on logs pattern match")
+                            output.update(dict(aborted=True))
+                            stop_process(process)
+                            break
                 except subprocess.CalledProcessError as e:
                     logger.error(f"{str(e)}")
+            process.wait()
             return str(output)
         except Exception:
             logger.error(f"Python execution error: {traceback.format_exc()}")
             return str(output)
         finally:
-            if env_path is not None:
-                shutil.rmtree(path=env_path)
+            if timer is not None:
+                timer.cancel()
+            if log_stream is not None:
+                log_stream.close()
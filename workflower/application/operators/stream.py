@@ -0,0 +1,104 @@
+"""
+Job logs streaming to the scheduler.
+"""
+import logging
+import os
+from multiprocessing.connection import AuthenticationError, Client
+
+from workflower.utils.pattern import PatternMatcher
+
+logger = logging.getLogger("workflower.application.operators.stream")
+
+# Set by the scheduler process stream trigger listener, and inherited by
+# its executor workers
+STREAM_TRIGGER_ADDRESS_ENV = "WORKFLOWER_STREAM_TRIGGER_ADDRESS"
+STREAM_TRIGGER_AUTHKEY_ENV = "WORKFLOWER_STREAM_TRIGGER_AUTHKEY"
+
+
+class LogStream:
+    """
+    Match a running job log lines against the logs patterns of the jobs
+    depending on it with an early trigger, releasing them as soon as their
+    pattern matches.
+
+    Args:
+        - connection (multiprocessing.connection.Connection): connection to
+        the stream trigger listener.
+        - job_id (int): running job id.
+        - stream_patterns (list): logs patterns with their early trigger,
+        release or abort.
+    """
+
+    def __init__(self, connection, job_id, stream_patterns: list) -> None:
+        self._connection = connection
+        self.job_id = job_id
+        self._early_triggers = {
+            pattern.key: early_trigger
+            for pattern, early_trigger in stream_patterns
+        }
+        self._matcher = PatternMatcher(
+            pattern for pattern, _ in stream_patterns
+        )
+        self.aborted = False
+
+    def _release(self, dependency_job_id, line: str) -> None:
+        self._connection.send(("release", dependency_job_id, line))
+        # Waits the job to be released, so it is never released after this
+        # job completion
+        self._connection.recv()
+
+    def feed(self, line: str) -> bool:
+        """
+        Match a log line, returns True if job should be aborted.
+        """
+        if not self._early_triggers:
+            return self.aborted
+        for dependency_job_id in self._matcher.match(line):
+            early_trigger = self._early_triggers.pop(dependency_job_id, None)
+            if early_trigger is None:
+                continue
+            logger.info(
+                f"Job {self.job_id} logs matched, releasing "
+                f"{dependency_job_id}"
+            )
+            try:
+                self._release(dependency_job_id, line)
+            except (OSError, EOFError) as error:
+                logger.warning(f"Log stream closed: {error}")
+                self._early_triggers = {}
+                return self.aborted
+            if early_trigger == "abort":
+                self.aborted = True
+        return self.aborted
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def open_log_stream(job_id):
+    """
+    Open a job log stream, returns None if stream trigger is disabled or if
+    no job depends on its logs as they stream.
+    """
+    address = os.environ.get(STREAM_TRIGGER_ADDRESS_ENV)
+    if not address or job_id is None:
+        return None
+    try:
+        connection = Client(
+            address,
+            authkey=bytes.fromhex(os.environ[STREAM_TRIGGER_AUTHKEY_ENV]),
+        )
+    except (OSError, KeyError, ValueError, AuthenticationError) as error:
+        logger.warning(f"Could not open log stream: {error}")
+        return None
+    try:
+        connection.send(("subscribe", job_id))
+        stream_patterns = connection.recv()
+    except (OSError, EOFError) as error:
+        logger.warning(f"Could not open log stream: {error}")
+        connection.close()
+        return None
+    if not stream_patterns:
+        connection.close()
+        return None
+    return LogStream(connection, job_id, stream_patterns)
@@ -7,15 +7,12 @@ from sqlalchemy.exc import IntegrityError
 from workflower.application.interfaces.unit_of_work import UnitOfWork
 from workflower.domain.entities.job import Job
 from workflower.domain.entities.workflow import Workflow
-from workflower.services.schema.parser import (
-    JobSchemaParser,
-    WorkflowSchemaParser,
-)
-from workflower.services.schema.validator import validate_schema
+from workflower.domain.entities.workflow_file import WorkflowFile
+from workflower.services.schema.parser import parse_workflow_file
 from workflower.utils.file import (
+    get_file_hash,
     get_file_modification_date,
-    get_file_name,
-    yaml_file_to_dict,
+    get_workflow_files_paths,
 )
 
 logger = logging.getLogger("workflower.application.workflow.commands")
@@ -29,7 +26,7 @@ class CreateWorkflowCommand:
         is_active: bool = True,
         file_path: str = None,
         file_exists: bool = None,
-        file_last_modified_at: str = None,
+        file_last_modified_at: float = None,
         modified_since_last_load: bool = False,
         jobs: List[Job] = None,
     ) -> None:
@@ -191,8 +188,8 @@ class UpdateModifiedWorkflowFileStateCommand:
                     logger.info("No workflow file")
 
                 else:
-                    workflow_last_modified_at = str(
-                        get_file_modification_date(workflow.file_path)
+                    workflow_last_modified_at = get_file_modification_date(
+                        workflow.file_path
                     )
 
                     if (
@@ -213,27 +210,36 @@ class UpdateModifiedWorkflowFileStateCommand:
 
 
 class LoadWorkflowFromYamlFileCommand:
-    def __init__(self, unit_of_work: UnitOfWork, file_path) -> None:
+    """
+    Load a workflow and its jobs from a yaml file.
+
+    The workflow, its jobs and their dependencies are resolved in memory
+    against the jobs already stored for the workflow, then inserts, updates
+    and deactivations are written in a single transaction.
+
+    A workflow_dict already parsed by parse_workflow_file can be given, so
+    files can be parsed in parallel and only written here.
+    """
+
+    def __init__(
+        self,
+        unit_of_work: UnitOfWork,
+        file_path,
+        workflow_dict: dict = None,
+        trigger: str = None,
+    ) -> None:
         self.unit_of_work = unit_of_work
         self.file_path = file_path
+        self.workflow_dict = workflow_dict
+        self.trigger = trigger
 
     def execute(self):
-        workflow_parser = WorkflowSchemaParser()
-        configuration_dict = yaml_file_to_dict(self.file_path)
-        workflow_name, jobs_dict = workflow_parser.parse_schema(
-            configuration_dict
-        )
-        workflow_file_name = get_file_name(self.file_path)
-        logger.debug(f"Workflow file name: {workflow_file_name}")
-        # File name must match with workflow name to workflow be loaded
-        if workflow_name != workflow_file_name:
-            logger.warning(
-                f"Workflow name from {workflow_name}"
-                f"don't match with file name {self.file_path}, "
-                "skipping load"
-            )
+        workflow_dict = self.workflow_dict
+        if workflow_dict is None:
+            workflow_dict = parse_workflow_file(self.file_path)
+        if workflow_dict is None:
             return
-        validate_schema(configuration_dict)
+        workflow_name = workflow_dict["name"]
         with self.unit_of_work as uow:
             workflow = uow.workflows.get(name=workflow_name)
             if not workflow:
@@ -242,59 +248,70 @@ class LoadWorkflowFromYamlFileCommand:
                     file_path=self.file_path,
                 )
                 uow.workflows.add(workflow)
-        # Add jobs
-        jobs_list = []
-        for job_dict in jobs_dict:
-            job_parser = JobSchemaParser()
-            (
-                job_name,
-                job_operator,
-                job_depends_on,
-                dependency_logs_pattern,
-                run_if_pattern_match,
-                job_definition,
-            ) = job_parser.parse_schema(job_dict)
-
-            with self.unit_of_work as uow:
-                if job_depends_on:
-                    dependency_job = uow.jobs.get(
-                        name=job_depends_on, workflow_id=workflow.id
-                    )
-                    job_depends_on_id = dependency_job.id
-                else:
-                    job_depends_on_id = None
-                # Check if job already exists
-                job = uow.jobs.get(name=job_name, workflow_id=workflow.id)
+            if self.trigger:
+                workflow.trigger = self.trigger
+            workflow.is_active = True
+
+            # Add or update jobs
+            existing_jobs = {job.name: job for job in workflow.jobs}
+            jobs = {}
+            jobs_depends_on = {}
+            for job_dict in workflow_dict["jobs"]:
+                job_name = job_dict["name"]
+                job = existing_jobs.get(job_name)
                 if job:
-                    job.operator = job_operator
-                    job.definition = job_definition
-                    job.depends_on = job_depends_on_id
-                    job.dependency_logs_pattern = dependency_logs_pattern
-                    job.run_if_pattern_match = run_if_pattern_match
+                    job.operator = job_dict["operator"]
+                    job.definition = job_dict["definition"]
+                    job.dependency_logs_pattern = job_dict[
+                        "dependency_logs_pattern"
+                    ]
+                    job.dependency_logs_pattern_mode = job_dict[
+                        "dependency_logs_pattern_mode"
+                    ]
+                    job.dependency_logs_pattern_case_sensitive = job_dict[
+                        "dependency_logs_pattern_case_sensitive"
+                    ]
+                    job.early_trigger = job_dict["early_trigger"]
+                    job.run_if_pattern_match = job_dict["run_if_pattern_match"]
+                    job.trigger_rule = job_dict["trigger_rule"]
                     job.is_active = True
-                elif not job:
+                else:
                     job = Job(
                         name=job_name,
-                        operator=job_operator,
-                        definition=job_definition,
-                        depends_on=job_depends_on_id,
-                        dependency_logs_pattern=dependency_logs_pattern,
-                        run_if_pattern_match=run_if_pattern_match,
+                        operator=job_dict["operator"],
+                        definition=job_dict["definition"],
+                        dependency_logs_pattern=job_dict[
+                            "dependency_logs_pattern"
+                        ],
+                        dependency_logs_pattern_mode=job_dict[
+                            "dependency_logs_pattern_mode"
+                        ],
+                        dependency_logs_pattern_case_sensitive=job_dict[
+                            "dependency_logs_pattern_case_sensitive"
+                        ],
+                        early_trigger=job_dict["early_trigger"],
+                        run_if_pattern_match=job_dict["run_if_pattern_match"],
+                        trigger_rule=job_dict["trigger_rule"],
                     )
-
-                    if workflow.has_job(job):
-                        continue
-                    else:
-                        workflow.add_job(job)
-                    jobs_list.append(job)
-                    for old_job in workflow.jobs:
-                        if old_job not in jobs_list:
-                            # Deactivate job
-                            old_job.is_active = False
-                            old_job.next_run_time = None
-                            workflow.remove_job(old_job)
-                            # Unschedule Job
-                            # Remove Job
+                    workflow.add_job(job)
+                    existing_jobs[job_name] = job
+                jobs[job_name] = job
+                jobs_depends_on[job_name] = job_dict["depends_on"]
+
+            # Deactivate jobs removed from workflow definition
+            for old_job in list(workflow.jobs):
+                if old_job.name not in jobs:
+                    old_job.is_active = False
+                    old_job.next_run_time = None
+                    old_job.depends_on = []
+                    workflow.remove_job(old_job)
+
+            # Jobs may depend on jobs defined after them
+            for job_name, job in jobs.items():
+                job.depends_on = [
+                    jobs[depends_on_name]
+                    for depends_on_name in jobs_depends_on[job_name]
+                ]
 
         return workflow
 
@@ -350,3 +367,124 @@ class ActivateWorkflowJobsCommand:
             logger.error(f"Integrity error: {e}")
         except Exception as e:
             logger.error(f"Error: {e}")
+
+
+class ScanWorkflowFilesCommand:
+    """
+    Compare workflow files from a directory with the persisted scan index.
+
+    Returns a tuple with the list of added or modified files, as transient
+    WorkflowFile objects, and the list of removed files paths. Files with the
+    same size and modification time are skipped without being read, files
+    that have only been touched have their index entry updated in place.
+
+    When file_paths is given only those files are compared, which is used to
+    handle changes reported by the directory watcher.
+    """
+
+    def __init__(
+        self, unit_of_work: UnitOfWork, path: str, file_paths: list = None
+    ) -> None:
+        self.unit_of_work = unit_of_work
+        self.path = path
+        self.file_paths = set(file_paths) if file_paths is not None else None
+
+    def _get_files_paths(self):
+        if self.file_paths is None:
+            return get_workflow_files_paths(self.path)
+        return (
+            file_path
+            for file_path in self.file_paths
+            if os.path.isfile(file_path)
+        )
+
+    def execute(self):
+        modified_files = []
+        removed_files = []
+        try:
+            with self.unit_of_work as uow:
+                indexed_files = {
+                    indexed_file.file_path: indexed_file
+                    for indexed_file in uow.workflow_files.list()
+                    if self.file_paths is None
+                    or indexed_file.file_path in self.file_paths
+                }
+                scanned_paths = set()
+                for file_path in self._get_files_paths():
+                    try:
+                        file_stat = os.stat(file_path)
+                    except FileNotFoundError:
+                        continue
+                    scanned_paths.add(file_path)
+                    indexed_file = indexed_files.get(file_path)
+                    if indexed_file and indexed_file.has_same_stat(
+                        file_stat.st_size, file_stat.st_mtime
+                    ):
+                        continue
+                    file_hash = get_file_hash(file_path)
+                    if indexed_file and indexed_file.file_hash == file_hash:
+                        logger.debug(f"{file_path} touched but not modified")
+                        indexed_file.file_size = file_stat.st_size
+                        indexed_file.file_last_modified_at = file_stat.st_mtime
+                        continue
+                    modified_files.append(
+                        WorkflowFile(
+                            file_path=file_path,
+                            file_size=file_stat.st_size,
+                            file_last_modified_at=file_stat.st_mtime,
+                            file_hash=file_hash,
+                        )
+                    )
+
+                for file_path, indexed_file in indexed_files.items():
+                    if file_path in scanned_paths:
+                        continue
+                    logger.info(f"{file_path} has been removed")
+                    uow.workflow_files.remove(indexed_file)
+                    uow.workflows.update(
+                        dict(file_path=file_path), dict(file_exists=False)
+                    )
+                    removed_files.append(file_path)
+
+        except IntegrityError as e:
+            logger.error(f"Integrity error: {e}")
+        except Exception:
+            logger.error(f"Error: {traceback.format_exc()}")
+        return modified_files, removed_files
+
+
+class IndexWorkflowFilesCommand:
+    """
+    Record workflow files states on the scan index.
+    """
+
+    def __init__(
+        self, unit_of_work: UnitOfWork, workflow_files: List[WorkflowFile]
+    ) -> None:
+        self.unit_of_work = unit_of_work
+        self.workflow_files = workflow_files
+
+    def execute(self):
+        try:
+            with self.unit_of_work as uow:
+                indexed_files = {
+                    indexed_file.file_path: indexed_file
+                    for indexed_file in uow.workflow_files.list()
+                }
+                for workflow_file in self.workflow_files:
+                    indexed_file = indexed_files.get(workflow_file.file_path)
+                    if not indexed_file:
+                        indexed_file = WorkflowFile(
+                            file_path=workflow_file.file_path
+                        )
+                        uow.workflow_files.add(indexed_file)
+                        indexed_files[workflow_file.file_path] = indexed_file
+                    indexed_file.file_size = workflow_file.file_size
+                    indexed_file.file_last_modified_at = (
+                        workflow_file.file_last_modified_at
+                    )
+                    indexed_file.file_hash = workflow_file.file_hash
+        except IntegrityError as e:
+            logger.error(f"Integrity error: {e}")
+        except Exception as e:
+            logger.error(f"Error: {e}")
@@ -1,10 +1,18 @@
 from workflower import core
+from workflower.adapters.sqlalchemy.migrations import run_migrations
+from workflower.adapters.sqlalchemy.retention import (
+    enable_incremental_vacuum,
+    event_retention,
+)
 from workflower.adapters.sqlalchemy.setup import engine, metadata
 from workflower.cli import workflow
 
 
 def create_db():
     metadata.create_all(bind=engine)
+    run_migrations(engine)
+    # Rebuilding a large database takes long, only worth it with retention
+    enable_incremental_vacuum(engine, rebuild=event_retention.is_enabled)
 
 
 FUNCTION_MAP = {
@@ -1,3 +1,4 @@
+import copy
 import logging
 import time
 
@@ -5,8 +6,10 @@ from workflower.adapters.scheduler.setup import (
     create_scheduler,
     create_sqlalchemy_jobstore,
 )
-from workflower.adapters.sqlalchemy.setup import Session, engine
+from workflower.adapters.sqlalchemy.event_writer import event_writer
+from workflower.adapters.sqlalchemy.setup import ReadSession, engine
 from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
+from workflower.adapters.sqlalchemy.writer import database_writer
 from workflower.application.job.commands import ChangeJobStatusCommand
 from workflower.config import Config
 from workflower.services.workflow.loader import WorkflowLoaderService
@@ -19,12 +22,8 @@ jobstores = {
         engine=engine, tablename="on_demand_jobs"
     ),
 }
-executors = {
-    "default": {
-        "type": "threadpool",
-        "max_workers": 20,
-    },
-}
+# Scheduler pops executors types out of their options
+executors = copy.deepcopy(Config.EXECUTORS)
 
 scheduler = create_scheduler(
     executors=executors, jobstores=jobstores, timezone=Config.TIME_ZONE
@@ -38,7 +37,7 @@ class Runner:
 
     def run_workflow(self, path) -> None:
         self._is_waiting = True
-        session = Session()
+        session = ReadSession()
         uow = SqlAlchemyUnitOfWork(session)
         workflow_runner = WorkflowRunnerService()
         workflow_loader = WorkflowLoaderService()
@@ -46,14 +45,13 @@ class Runner:
             path, trigger="on_demand"
         )
         if workflow:
-            for job in workflow.jobs:
-                change_job_status_command = ChangeJobStatusCommand(
-                    uow, job.id, "pending"
+            for job_id in workflow["jobs_ids"]:
+                database_writer.execute_command(
+                    ChangeJobStatusCommand, job_id, "pending"
                 )
-                change_job_status_command.execute()
             try:
                 workflow_runner.schedule_one_workflow_jobs(
-                    uow, workflow, scheduler
+                    uow, workflow["id"], scheduler
                 )
             except Exception as error:
                 logger.error(f"Error: {error}")
@@ -63,7 +61,7 @@ class Runner:
             scheduler.start()
             while self._is_waiting:
                 with uow:
-                    workflow_record = uow.workflows.get(id=workflow.id)
+                    workflow_record = uow.workflows.get(id=workflow["id"])
                     not_pending = all(
                         job.status != "pending" for job in workflow_record.jobs
                     )
@@ -72,6 +70,8 @@ class Runner:
                     time.sleep(2)
                     if not_pending:
                         self._is_waiting = False
+            event_writer.stop()
+            database_writer.stop()
 
 
 def run_workflow(path: str) -> None:
@@ -28,6 +28,104 @@ class Config:
         "WORKFLOWS_FILES_PATH", "./samples/workflows"
     )
     # ======================================================================= #
+    # Workflow files watcher, reload workflows on file system events instead
+    # of every cycle
+    # ======================================================================= #
+    WATCH_WORKFLOWS_FILES = (
+        os.getenv("WATCH_WORKFLOWS_FILES", "false").lower() == "true"
+    )
+    WATCHER_DEBOUNCE = float(os.getenv("WATCHER_DEBOUNCE", 0.3))
+    WATCHER_POLLING_INTERVAL = float(os.getenv("WATCHER_POLLING_INTERVAL", 1))
+    # Full directory rescan, as safety net for missed events
+    WATCHER_RESCAN_CYCLE = int(os.getenv("WATCHER_RESCAN_CYCLE", 3600))
+    # ======================================================================= #
+    # Workflow files parallel loading, parse and validate files on a process
+    # pool when there are at least LOADER_PARALLEL_MIN_FILES to load
+    # ======================================================================= #
+    LOADER_PROCESSES = int(os.getenv("LOADER_PROCESSES", 0))
+    LOADER_PARALLEL_MIN_FILES = int(os.getenv("LOADER_PARALLEL_MIN_FILES", 16))
+    # ======================================================================= #
+    # Workflows reconciliation, only workflows changed since last cycle are
+    # reconciled, with a full sweep every RECONCILE_FULL_SWEEP_CYCLE seconds
+    # ======================================================================= #
+    RECONCILE_FULL_SWEEP_CYCLE = int(
+        os.getenv("RECONCILE_FULL_SWEEP_CYCLE", 3600)
+    )
+    # ======================================================================= #
+    # Scheduler executors, jobs run on the one set by their executor key, or
+    # by default on their operator one
+    # ======================================================================= #
+    EXECUTORS = {
+        "default": {
+            "class": (
+                "workflower.adapters.scheduler.executors:"
+                "PooledThreadPoolExecutor"
+            ),
+            "max_workers": int(os.getenv("THREADPOOL_MAX_WORKERS", 20)),
+        },
+        # Threads waiting on subprocesses, as many as process pool workers
+        "subprocess": {
+            "class": (
+                "workflower.adapters.scheduler.executors:"
+                "PooledThreadPoolExecutor"
+            ),
+            "max_workers": int(os.getenv("SUBPROCESS_MAX_WORKERS", 50)),
+        },
+        "processpool": {
+            "class": (
+                "workflower.adapters.scheduler.executors:"
+                "PooledProcessPoolExecutor"
+            ),
+            "max_workers": int(os.getenv("PROCESSPOOL_MAX_WORKERS", 50)),
+        },
+        "warm_processpool": {
+            "class": (
+                "workflower.adapters.scheduler.executors:"
+                "WarmProcessPoolExecutor"
+            ),
+            "max_workers": int(
+                os.getenv("WARM_PROCESSPOOL_MAX_WORKERS", os.cpu_count() or 4)
+            ),
+            "preload": os.getenv(
+                "WARM_PROCESSPOOL_PRELOAD",
+                "papermill,jupyter_client,"
+                "workflower.application.operators.factory,"
+                "workflower.plugins.factory",
+            ).split(","),
+            "max_tasks_per_child": int(
+                os.getenv("WARM_PROCESSPOOL_MAX_TASKS_PER_CHILD", 100)
+            ),
+            "max_memory": float(
+                os.getenv("WARM_PROCESSPOOL_MAX_MEMORY", 2048)
+            ),
+        },
+        "asyncio": {
+            "class": (
+                "workflower.adapters.scheduler.executors:EventLoopExecutor"
+            ),
+        },
+    }
+    # Jobs waiting for an executor worker are dispatched by priority, which
+    # increases by one every DISPATCH_AGING_INTERVAL seconds waited
+    DISPATCH_AGING_INTERVAL = float(os.getenv("DISPATCH_AGING_INTERVAL", 60))
+    # ======================================================================= #
+    # Resource pools slots, as "alteryx=2,heavy_notebooks=4", jobs declaring
+    # a resource pool, or whose operator has one, wait for one of its slots
+    # ======================================================================= #
+    RESOURCE_POOLS = {
+        name.strip(): int(slots)
+        for name, slots in (
+            pool.split("=")
+            for pool in os.getenv("RESOURCE_POOLS", "").split(",")
+            if pool.strip()
+        )
+    }
+    # ======================================================================= #
+    # Running jobs stream their logs to the scheduler, releasing jobs with an
+    # early trigger as soon as their dependency logs pattern matches
+    # ======================================================================= #
+    STREAM_TRIGGER = os.getenv("STREAM_TRIGGER", "false").lower() == "true"
+    # ======================================================================= #
     # Default application data directory
     # ======================================================================= #
     DATA_DIR = os.getenv("DATA_DIR", os.path.join(BASE_DIR, "data"))
@@ -50,6 +148,51 @@ class Config:
         ),
     )
     # ======================================================================= #
+    # Scheduler events writer, events are queued and written in batches of up
+    # to EVENT_WRITER_FLUSH_SIZE, at most EVENT_WRITER_FLUSH_LATENCY seconds
+    # after being queued
+    # ======================================================================= #
+    EVENT_WRITER_QUEUE_SIZE = int(os.getenv("EVENT_WRITER_QUEUE_SIZE", 10000))
+    EVENT_WRITER_FLUSH_SIZE = int(os.getenv("EVENT_WRITER_FLUSH_SIZE", 500))
+    EVENT_WRITER_FLUSH_LATENCY = float(
+        os.getenv("EVENT_WRITER_FLUSH_LATENCY", 0.5)
+    )
+    # ======================================================================= #
+    # Job outputs larger than BLOB_OUTPUT_THRESHOLD bytes are stored on the
+    # blob store, events keep a BLOB_OUTPUT_PREVIEW_SIZE characters preview
+    # ======================================================================= #
+    BLOB_STORE_DIR = os.getenv(
+        "BLOB_STORE_DIR",
+        os.path.join(
+            DATA_DIR,
+            "blobs",
+        ),
+    )
+    BLOB_OUTPUT_THRESHOLD = int(os.getenv("BLOB_OUTPUT_THRESHOLD", 4096))
+    BLOB_OUTPUT_PREVIEW_SIZE = int(os.getenv("BLOB_OUTPUT_PREVIEW_SIZE", 256))
+    # ======================================================================= #
+    # Events retention, events older than EVENT_RETENTION_DAYS or beyond the
+    # newest EVENT_RETENTION_MAX_ROWS are moved to compressed daily archives
+    # every EVENT_ROLLOVER_CYCLE seconds, 0 disables a limit. Opt in, with
+    # both limits disabled events stay on database
+    # ======================================================================= #
+    EVENT_RETENTION_DAYS = int(os.getenv("EVENT_RETENTION_DAYS", 0))
+    EVENT_RETENTION_MAX_ROWS = int(os.getenv("EVENT_RETENTION_MAX_ROWS", 0))
+    EVENT_ROLLOVER_CYCLE = int(os.getenv("EVENT_ROLLOVER_CYCLE", 3600))
+    EVENT_ROLLOVER_BATCH_SIZE = int(
+        os.getenv("EVENT_ROLLOVER_BATCH_SIZE", 5000)
+    )
+    # Max database pages freed after each rollover
+    EVENT_VACUUM_PAGES = int(os.getenv("EVENT_VACUUM_PAGES", 1000))
+    EVENT_ARCHIVE_DIR = os.getenv(
+        "EVENT_ARCHIVE_DIR",
+        os.path.join(
+            DATA_DIR,
+            "archive",
+            "events",
+        ),
+    )
+    # ======================================================================= #
     # Logging default configuration
     # ======================================================================= #
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -88,6 +231,78 @@ class Config:
         ),
     )
     # ======================================================================= #
+    # Papermill jobs kernels pool, keeping up to KERNEL_POOL_SIZE idle kernels
+    # by environment spec, recycled after KERNEL_POOL_MAX_USES runs and
+    # evicted after KERNEL_POOL_IDLE_TIMEOUT idle seconds. Opt in, disabled
+    # every run creates its own kernel
+    # ======================================================================= #
+    KERNEL_POOL = os.getenv("KERNEL_POOL", "false").lower() == "true"
+    KERNEL_POOL_DIR = os.getenv(
+        "KERNEL_POOL_DIR",
+        os.path.join(
+            ENVIRONMENTS_DIR,
+            "kernels",
+        ),
+    )
+    KERNEL_POOL_SIZE = int(os.getenv("KERNEL_POOL_SIZE", 4))
+    KERNEL_POOL_MAX_USES = int(os.getenv("KERNEL_POOL_MAX_USES", 50))
+    KERNEL_POOL_IDLE_TIMEOUT = int(os.getenv("KERNEL_POOL_IDLE_TIMEOUT", 3600))
+    # ======================================================================= #
+    # Python jobs virtual environments cache, keyed by requirements hash,
+    # keeping up to ENVIRONMENT_CACHE_SIZE environments and
+    # ENVIRONMENT_CACHE_DISK_QUOTA megabytes, 0 disables the quota. Loaded
+    # workflows environments are built in background if
+    # ENVIRONMENT_CACHE_PREWARM is enabled. Both are opt in, disabled every
+    # run gets a new environment
+    # ======================================================================= #
+    ENVIRONMENT_CACHE = (
+        os.getenv("ENVIRONMENT_CACHE", "false").lower() == "true"
+    )
+    ENVIRONMENT_CACHE_DIR = os.getenv(
+        "ENVIRONMENT_CACHE_DIR",
+        os.path.join(
+            ENVIRONMENTS_DIR,
+            "cache",
+        ),
+    )
+    ENVIRONMENT_CACHE_SIZE = int(os.getenv("ENVIRONMENT_CACHE_SIZE", 32))
+    ENVIRONMENT_CACHE_DISK_QUOTA = int(
+        os.getenv("ENVIRONMENT_CACHE_DISK_QUOTA", 0)
+    )
+    ENVIRONMENT_CACHE_PREWARM = (
+        os.getenv("ENVIRONMENT_CACHE_PREWARM", "false").lower() == "true"
+    )
+    # ======================================================================= #
+    # Parsed workflow definitions cache, keyed by workflow file content
+    # ======================================================================= #
+    DEFINITION_CACHE_DIR = os.getenv(
+        "DEFINITION_CACHE_DIR",
+        os.path.join(
+            DATA_DIR,
+            "cache",
+            "definitions",
+        ),
+    )
+    DEFINITION_CACHE_MEMORY_SIZE = int(
+        os.getenv("DEFINITION_CACHE_MEMORY_SIZE", 256)
+    )
+    DEFINITION_CACHE_DISK_SIZE = int(
+        os.getenv("DEFINITION_CACHE_DISK_SIZE", 4096)
+    )
+    # ======================================================================= #
+    # Requirements wheels are built once into WHEELHOUSE_DIR and installed
+    # from it without reaching the package index. Opt in, disabled
+    # requirements are installed from the package index
+    # ======================================================================= #
+    WHEELHOUSE = os.getenv("WHEELHOUSE", "false").lower() == "true"
+    WHEELHOUSE_DIR = os.getenv(
+        "WHEELHOUSE_DIR",
+        os.path.join(
+            DATA_DIR,
+            "wheelhouse",
+        ),
+    )
+    # ======================================================================= #
     # Pip default options
     # ======================================================================= #
     PIP_INDEX_URL = os.getenv("PIP_INDEX_URL", None)
@@ -1,9 +1,13 @@
 import asyncio
 import logging
+import time
 
+from workflower.adapters.sqlalchemy.retention import event_retention
 from workflower.config import Config
+from workflower.services.workflow.dirty import dirty_workflows
 from workflower.services.workflow.loader import WorkflowLoaderService
 from workflower.services.workflow.runner import WorkflowRunnerService
+from workflower.services.workflow.watcher import WorkflowDirectoryWatcher
 
 logger = logging.getLogger("workflower.services.workflow")
 
@@ -16,6 +20,8 @@ class WorkflowController:
     def __init__(self) -> None:
         self.workflow_loader = WorkflowLoaderService()
         self.workflow_runner = WorkflowRunnerService()
+        self.workflow_watcher = None
+        self.event_retention = event_retention
         self.is_running = False
 
     async def run(self, scheduler):
@@ -23,11 +29,83 @@ class WorkflowController:
         Run workflow controller.
         """
         self.is_running = True
+        self.workflow_runner.track_scheduler_events(scheduler)
+        if self.event_retention.is_enabled:
+            asyncio.get_event_loop().create_task(self.roll_over_events())
+        if Config.WATCH_WORKFLOWS_FILES:
+            await self.watch(scheduler)
+            return
         while self.is_running:
             self.workflow_loader.load_all_from_dir(Config.WORKFLOWS_FILES_PATH)
             self.workflow_runner.schedule_workflows_jobs(scheduler)
             logger.info(f"Sleeping {Config.CYCLE} seconds")
             await asyncio.sleep(Config.CYCLE)
 
+    async def watch(self, scheduler):
+        """
+        Reload and reschedule only changed workflow files, as reported by the
+        workflows directory watcher, with a full rescan every
+        WATCHER_RESCAN_CYCLE seconds.
+
+        Workflows marked as changed by their jobs events are rescheduled
+        every WATCHER_DEBOUNCE seconds.
+        """
+        self.workflow_watcher = WorkflowDirectoryWatcher(
+            Config.WORKFLOWS_FILES_PATH
+        )
+        self.workflow_watcher.start(asyncio.get_event_loop())
+        last_rescan_at = None
+        try:
+            while self.is_running:
+                if (
+                    last_rescan_at is None
+                    or time.monotonic() - last_rescan_at
+                    >= Config.WATCHER_RESCAN_CYCLE
+                ):
+                    self.workflow_loader.load_all_from_dir(
+                        Config.WORKFLOWS_FILES_PATH
+                    )
+                    self.workflow_runner.schedule_workflows_jobs(scheduler)
+                    last_rescan_at = time.monotonic()
+
+                timeout = min(
+                    Config.WATCHER_RESCAN_CYCLE
+                    - (time.monotonic() - last_rescan_at),
+                    Config.WATCHER_DEBOUNCE,
+                )
+                changed_paths = await self.workflow_watcher.get_changes(
+                    timeout=max(timeout, 0)
+                )
+                if not changed_paths:
+                    if dirty_workflows.has_changes():
+                        self.workflow_runner.schedule_workflows_jobs(scheduler)
+                    continue
+                logger.info(f"Workflow files changed: {changed_paths}")
+                self.workflow_loader.load_workflow_files(
+                    Config.WORKFLOWS_FILES_PATH, list(changed_paths)
+                )
+                self.workflow_runner.schedule_workflows_jobs(
+                    scheduler, file_paths=changed_paths
+                )
+        finally:
+            self.workflow_watcher.stop()
+
+    async def roll_over_events(self):
+        """
+        Move events out of retention window to archive every
+        EVENT_ROLLOVER_CYCLE seconds, on a worker thread.
+        """
+        loop = asyncio.get_event_loop()
+        while self.is_running:
+            try:
+                await loop.run_in_executor(
+                    None, self.event_retention.roll_over
+                )
+            except Exception as error:
+                logger.error(f"Error rolling over events: {error}")
+            await asyncio.sleep(Config.EVENT_ROLLOVER_CYCLE)
+
     def stop(self):
         self.is_running = False
+        if self.workflow_watcher is not None:
+            self.workflow_watcher.stop()
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import logging
 import os
 import signal
@@ -8,8 +9,11 @@ from workflower.adapters.scheduler.setup import (
     create_scheduler,
     create_sqlalchemy_jobstore,
 )
+from workflower.adapters.scheduler.stream import stream_trigger_listener
 from workflower.adapters.server import create_server
+from workflower.adapters.sqlalchemy.event_writer import event_writer
 from workflower.adapters.sqlalchemy.setup import engine
+from workflower.adapters.sqlalchemy.writer import database_writer
 from workflower.adapters.www import create_api
 from workflower.config import Config
 from workflower.controllers.workflow import WorkflowController
@@ -19,12 +23,8 @@ jobstores = dict(
         engine=engine, tablename="on_schedule_jobs"
     ),
 )
-executors = dict(
-    default={
-        "type": "processpool",
-        "max_workers": 50,
-    },
-)
+# Scheduler pops executors types out of their options
+executors = copy.deepcopy(Config.EXECUTORS)
 job_defaults = dict(
     # No matter how much instances are late of same job, execute one only
     coalesce=True,
@@ -50,6 +50,9 @@ def exit_handler(*args):
     logger.debug(f"Got shutting down signal for PID={os.getpid()}")
     logger.info("Gracefully shuting down")
     workflow_controller.stop()
+    stream_trigger_listener.stop()
+    event_writer.stop()
+    database_writer.stop()
     loop = asyncio.get_event_loop()
     tasks = asyncio.all_tasks(loop=loop)
     for t in tasks:
@@ -65,6 +68,9 @@ def start():
     logger.info("Starting Workflower")
     executor = ThreadPoolExecutor(max_workers=1)
     loop.run_in_executor(executor, server.run)
+    if Config.STREAM_TRIGGER:
+        # Executor workers inherit its address when started
+        stream_trigger_listener.start(scheduler)
     scheduler.start()
     loop.create_task(workflow_controller.run(scheduler))
 
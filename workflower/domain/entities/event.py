@@ -12,7 +12,9 @@ class Event:
         - model (str): event model.
         - model_id (str): event model_id.
         - exception (str, optional): exceptions.
-        - output (str, optional): output.
+        - output (str, optional): output, or its preview when stored on
+        blob store.
+        - output_blob (str, optional): blob store key of the whole output.
     """
 
     def __init__(
@@ -22,12 +24,14 @@ class Event:
         model_id: str,
         exception: str = None,
         output: str = None,
+        output_blob: str = None,
     ) -> None:
         self.name = name
         self.model = model
         self.model_id = model_id
         self.exception = exception
         self.output = output
+        self.output_blob = output_blob
 
     def __repr__(self) -> str:
         return (
@@ -2,6 +2,7 @@
 Job class.
 """
 
+import datetime
 import logging
 
 logger = logging.getLogger("workflower.domain.entities.job")
@@ -15,12 +16,19 @@ class Job:
         - name (str): Name of the given job.
         - operator (str): Operator name used by the job.
         - definition (json): Job definition that will be used by APScheduler.
-        - depends_on (str, optional): Name of dependency job.
+        - depends_on (list, optional): Jobs this job depends on.
+        - trigger_rule (str, optional): When a job with many dependencies
+        runs, all_success, one_success or all_done.
         - workflow (Workflow): Related workflow object.
         - dependency_logs_pattern (str, optional): Key word pattern to match.
+        - dependency_logs_pattern_mode (str, optional): literal or regex.
+        - dependency_logs_pattern_case_sensitive (bool, optional): Pattern
+        matches case or not.
+        - early_trigger (str, optional): On pattern match while dependency
+        is running, release or abort.
         - run_if_pattern_match (bool, optional): Run or not if pattern match.
         - is_active (bool, optional): Job is active or not.
-        - next_run_time (str, optional): Next job run time datetime.
+        - next_run_time (datetime, optional): Next job run time.
     """
 
     def __init__(
@@ -30,11 +38,15 @@ class Job:
         definition: dict,
         status: str = "pending",
         workflow=None,
-        depends_on: str = None,
+        depends_on: list = None,
         dependency_logs_pattern: str = None,
         run_if_pattern_match: bool = None,
         is_active: bool = True,
-        next_run_time: bool = None,
+        next_run_time: datetime.datetime = None,
+        trigger_rule: str = None,
+        dependency_logs_pattern_mode: str = None,
+        dependency_logs_pattern_case_sensitive: bool = None,
+        early_trigger: str = None,
     ):
         # TODO
         # Add state according with triggers
@@ -45,8 +57,14 @@ class Job:
         self.status = status
         self.operator = operator
         self.definition = definition
-        self.depends_on = depends_on
+        self.depends_on = depends_on or []
+        self.trigger_rule = trigger_rule
         self.dependency_logs_pattern = dependency_logs_pattern
+        self.dependency_logs_pattern_mode = dependency_logs_pattern_mode
+        self.dependency_logs_pattern_case_sensitive = (
+            dependency_logs_pattern_case_sensitive
+        )
+        self.early_trigger = early_trigger
         self.run_if_pattern_match = run_if_pattern_match
         self.workflow = workflow
         self.is_active = is_active
@@ -71,7 +89,8 @@ class Job:
             name=self.name,
             operator=self.operator,
             **self.definition,
-            depends_on=self.depends_on,
+            depends_on=[job.name for job in self.depends_on],
+            trigger_rule=self.trigger_rule,
             next_run_time=self.next_run_time,
             run_if_pattern_match=self.run_if_pattern_match,
         )
@@ -90,7 +109,8 @@ class Job:
             f"status={self.status}, "
             f"operator={self.operator}, "
             # f"definition={self.definition}, "
-            f"depends_on={self.depends_on}, "
+            f"depends_on={[job.name for job in self.depends_on]}, "
+            f"trigger_rule={self.trigger_rule}, "
             f"dependency_logs_pattern={self.dependency_logs_pattern}, "
             f"run_if_pattern_match={self.run_if_pattern_match}, "
             f"workflow={self.workflow}, "
@@ -17,7 +17,7 @@ class Workflow:
     Args:
         - name (str): Name of the given workflow.
         - file_path(str, optional): Path of workflow file.
-        - file_last_modified_at (int, optional): time since epoch of
+        - file_last_modified_at (float, optional): time since epoch of
         last file modification.
         - is_active (bool, optional): Workflow is active or not.
         - modified_since_last_load (bool, optional): Workflow has been modified
@@ -33,7 +33,7 @@ class Workflow:
         trigger: str = None,
         file_path: str = None,
         file_exists: bool = None,
-        file_last_modified_at: str = None,
+        file_last_modified_at: float = None,
         modified_since_last_load: bool = False,
         jobs: List[Job] = None,
     ):
@@ -0,0 +1,51 @@
+"""
+Workflow file class.
+"""
+import logging
+
+logger = logging.getLogger("workflower.domain.entities.workflow_file")
+
+
+class WorkflowFile:
+    """
+    Domain object for a scanned workflow file, used as index entry to skip
+    files that did not change since the last load.
+
+    Args:
+        - file_path (str): Path of workflow file.
+        - file_size (int): File size in bytes.
+        - file_last_modified_at (float): time since epoch of last file
+        modification.
+        - file_hash (str): Hash of file content.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        file_size: int = None,
+        file_last_modified_at: float = None,
+        file_hash: str = None,
+    ):
+        self.file_path = file_path
+        self.file_size = file_size
+        self.file_last_modified_at = file_last_modified_at
+        self.file_hash = file_hash
+
+    def has_same_stat(
+        self, file_size: int, file_last_modified_at: float
+    ) -> bool:
+        """
+        Check if file size and modification time match with indexed ones.
+        """
+        return (
+            self.file_size == file_size
+            and self.file_last_modified_at == file_last_modified_at
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WorkflowFile(file_path={self.file_path}, "
+            f"file_size={self.file_size}, "
+            f"file_last_modified_at={self.file_last_modified_at}, "
+            f"file_hash={self.file_hash})>"
+        )
@@ -0,0 +1,178 @@
+"""
+Parsed workflow definitions cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+from workflower.config import Config
+
+logger = logging.getLogger("workflower.services.schema.cache")
+
+
+class DefinitionCache:
+    """
+    Content addressed cache of parsed workflow definitions.
+
+    Definitions are stored as compressed json, in memory up to memory_size
+    entries and on disk up to disk_size entries, least recently used entries
+    are evicted first. Values are deserialized on every get, so callers can
+    change them freely.
+
+    Args:
+        - directory (str, optional): disk cache directory, memory only if
+        not given.
+        - memory_size (int, optional): max entries kept in memory.
+        - disk_size (int, optional): max entries kept on disk.
+    """
+
+    file_extension = ".json.z"
+
+    def __init__(
+        self,
+        directory: str = None,
+        memory_size: int = 256,
+        disk_size: int = 4096,
+    ) -> None:
+        self.directory = directory
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        Build a cache key from everything the cached value depends on.
+        """
+        key = hashlib.sha256()
+        for part in parts:
+            key.update(str(part).encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    @staticmethod
+    def _serialize(value: dict) -> bytes:
+        return zlib.compress(
+            json.dumps(value, separators=(",", ":")).encode("utf-8")
+        )
+
+    @staticmethod
+    def _deserialize(data: bytes) -> dict:
+        return json.loads(zlib.decompress(data).decode("utf-8"))
+
+    def _get_file_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.file_extension)
+
+    def _set_memory(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _get_disk(self, key: str) -> bytes:
+        if not self.directory:
+            return None
+        file_path = self._get_file_path(key)
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            # Mark as recently used
+            os.utime(file_path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            logger.warning(f"Could not read cached definition: {error}")
+            return None
+
+    def _set_disk(self, key: str, data: bytes) -> None:
+        if not self.directory:
+            return
+        file_path = self._get_file_path(key)
+        temporary_file_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_file_path, "wb") as f:
+                f.write(data)
+            os.replace(temporary_file_path, file_path)
+            self._evict_disk()
+        except OSError as error:
+            logger.warning(f"Could not write cached definition: {error}")
+
+    def _evict_disk(self) -> None:
+        """
+        Remove least recently used entries when disk cache is full.
+        """
+        entries = [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(self.file_extension)
+        ]
+        if len(entries) <= self.disk_size:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.disk_size]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def get(self, key: str) -> dict:
+        """
+        Get a cached definition, or None if not cached.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is None:
+            data = self._get_disk(key)
+            if data is None:
+                return None
+            self._set_memory(key, data)
+        try:
+            return self._deserialize(data)
+        except (zlib.error, ValueError) as error:
+            logger.warning(f"Discarding invalid cached definition: {error}")
+            self.remove(key)
+            return None
+
+    def set(self, key: str, value: dict) -> None:
+        """
+        Cache a definition.
+        """
+        data = self._serialize(value)
+        self._set_memory(key, data)
+        self._set_disk(key, data)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a cached definition.
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._get_file_path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Remove all cached definitions from memory.
+        """
+        with self._lock:
+            self._memory.clear()
+
+
+definition_cache = DefinitionCache(
+    directory=Config.DEFINITION_CACHE_DIR,
+    memory_size=Config.DEFINITION_CACHE_MEMORY_SIZE,
+    disk_size=Config.DEFINITION_CACHE_DISK_SIZE,
+)
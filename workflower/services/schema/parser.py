@@ -5,10 +5,25 @@ import logging
 import os
 from abc import ABC, abstractclassmethod
 
+from workflower.application.exceptions import InvalidSchemaError
 from workflower.config import Config
+from workflower.services.schema.cache import definition_cache
+from workflower.services.schema.validator import (
+    get_job_depends_on,
+    validate_schema,
+)
+from workflower.utils.file import (
+    get_file_hash,
+    get_file_name,
+    yaml_file_to_dict,
+)
 
 logger = logging.getLogger("workflower.services.parser")
 
+# Must be increased whenever parsed workflow definitions change, so cached
+# definitions are parsed again
+SCHEMA_PARSER_VERSION = 11
+
 
 class ParseStrategy(ABC):
     """
@@ -313,6 +328,12 @@ class PythonOperatorParseStrategy(ParseStrategy):
             self.schema_kwargs.update(
                 dict(requirements_path=requirements_path)
             )
+        isolation = configuration_dict.get("isolation")
+        if isolation:
+            self.schema_kwargs.update(dict(isolation=isolation))
+        timeout = configuration_dict.get("timeout")
+        if timeout:
+            self.schema_kwargs.update(dict(timeout=timeout))
         self.schema_kwargs.update(
             dict(
                 pip_index_url=Config.PIP_INDEX_URL,
@@ -385,6 +406,37 @@ class JobOperatorSchemaParser:
         return self._strategy.parse(configuration_dict)
 
 
+# Subprocess operators spend their time waiting on it, so they run on
+# threads, in process ones, papermill kernel clients included, run on warm
+# workers with their imports done
+OPERATORS_EXECUTORS = dict(
+    alteryx="subprocess",
+    papermill="warm_processpool",
+    python="subprocess",
+    module="warm_processpool",
+)
+
+
+def get_job_default_executor(configuration_dict: dict) -> str:
+    """
+    Executor a job runs on when it does not set one.
+    """
+    # In process python runs on a warm worker, replaced if a timed out run
+    # is stuck on it
+    if (
+        configuration_dict.get("operator") == "python"
+        and configuration_dict.get("isolation") == "none"
+    ):
+        return "warm_processpool"
+    executor = OPERATORS_EXECUTORS.get(configuration_dict.get("operator"))
+    if executor is None:
+        raise InvalidSchemaError(
+            "Job operator options must be in: "
+            f"{', '.join(OPERATORS_EXECUTORS)}"
+        )
+    return executor
+
+
 def _create_operator_parse_strategy(operator_option: str) -> ParseStrategy:
     """
     Operator strategy factory.
@@ -431,25 +483,149 @@ class JobSchemaParser:
         """
         job_name = configuration_dict.get("name")
         job_operator = configuration_dict.get("operator")
-        job_depends_on = configuration_dict.get("depends_on", None)
+        job_depends_on = get_job_depends_on(configuration_dict)
         if job_depends_on:
+            trigger_rule = configuration_dict.get(
+                "trigger_rule", "all_success"
+            )
             dependency_logs_pattern = configuration_dict.get(
                 "dependency_logs_pattern", None
             )
+            dependency_logs_pattern_mode = configuration_dict.get(
+                "dependency_logs_pattern_mode", "literal"
+            )
+            dependency_logs_pattern_case_sensitive = configuration_dict.get(
+                "dependency_logs_pattern_case_sensitive", False
+            )
+            early_trigger = configuration_dict.get("early_trigger", None)
             run_if_pattern_match = configuration_dict.get(
                 "run_if_pattern_match", None
             )
         else:
+            trigger_rule = None
             dependency_logs_pattern = None
+            dependency_logs_pattern_mode = None
+            dependency_logs_pattern_case_sensitive = None
+            early_trigger = None
             run_if_pattern_match = None
         job_trigger_options = self._parse_job_trigger(configuration_dict)
         job_operator_options = self._parse_job_operator(configuration_dict)
         job_config = dict(**job_trigger_options, **job_operator_options)
+        job_config.update(
+            dict(
+                executor=configuration_dict.get(
+                    "executor", get_job_default_executor(configuration_dict)
+                )
+            )
+        )
+        # Operators may have a resource pool of their own
+        resource_pool = configuration_dict.get(
+            "resource_pool",
+            job_operator if job_operator in Config.RESOURCE_POOLS else None,
+        )
+        if resource_pool:
+            job_config.setdefault("kwargs", {}).update(
+                dict(resource_pool=resource_pool)
+            )
+        priority = configuration_dict.get("priority")
+        if priority:
+            job_config.setdefault("kwargs", {}).update(dict(priority=priority))
         return (
             job_name,
             job_operator,
             job_depends_on,
+            trigger_rule,
             dependency_logs_pattern,
+            dependency_logs_pattern_mode,
+            dependency_logs_pattern_case_sensitive,
+            early_trigger,
             run_if_pattern_match,
             job_config,
         )
+
+
+def _get_definition_cache_key(file_path: str) -> str:
+    """
+    Workflow file definition cache key, configuration values are part of it
+    as they are copied into jobs definitions.
+    """
+    return definition_cache.make_key(
+        get_file_hash(file_path),
+        file_path,
+        SCHEMA_PARSER_VERSION,
+        Config.ENVIRONMENTS_DIR,
+        Config.KERNELS_SPECS_DIR,
+        Config.PIP_INDEX_URL,
+        Config.PIP_TRUSTED_HOST,
+        sorted(Config.RESOURCE_POOLS),
+    )
+
+
+def parse_workflow_file(file_path: str) -> dict:
+    """
+    Read, validate and parse a workflow file into plain python objects, so it
+    can be done out of the process that writes to the database.
+
+    Parsed definitions are cached by file content, unchanged files are not
+    parsed again.
+
+    Returns None if workflow name does not match with file name.
+    """
+    cache_key = _get_definition_cache_key(file_path)
+    workflow_dict = definition_cache.get(cache_key)
+    if workflow_dict is not None:
+        logger.debug(f"Workflow file {file_path} definition cache hit")
+        return workflow_dict
+    workflow_dict = _parse_workflow_file(file_path)
+    if workflow_dict is not None:
+        definition_cache.set(cache_key, workflow_dict)
+    return workflow_dict
+
+
+def _parse_workflow_file(file_path: str) -> dict:
+    configuration_dict = yaml_file_to_dict(file_path)
+    workflow_parser = WorkflowSchemaParser()
+    workflow_name, jobs_dict = workflow_parser.parse_schema(configuration_dict)
+    workflow_file_name = get_file_name(file_path)
+    logger.debug(f"Workflow file name: {workflow_file_name}")
+    # File name must match with workflow name to workflow be loaded
+    if workflow_name != workflow_file_name:
+        logger.warning(
+            f"Workflow name from {workflow_name}"
+            f"don't match with file name {file_path}, "
+            "skipping load"
+        )
+        return
+    validate_schema(configuration_dict)
+    jobs = []
+    for job_dict in jobs_dict:
+        job_parser = JobSchemaParser()
+        (
+            job_name,
+            job_operator,
+            job_depends_on,
+            trigger_rule,
+            dependency_logs_pattern,
+            dependency_logs_pattern_mode,
+            dependency_logs_pattern_case_sensitive,
+            early_trigger,
+            run_if_pattern_match,
+            job_definition,
+        ) = job_parser.parse_schema(job_dict)
+        jobs.append(
+            dict(
+                name=job_name,
+                operator=job_operator,
+                depends_on=job_depends_on,
+                trigger_rule=trigger_rule,
+                dependency_logs_pattern=dependency_logs_pattern,
+                dependency_logs_pattern_mode=dependency_logs_pattern_mode,
+                dependency_logs_pattern_case_sensitive=(
+                    dependency_logs_pattern_case_sensitive
+                ),
+                early_trigger=early_trigger,
+                run_if_pattern_match=run_if_pattern_match,
+                definition=job_definition,
+            )
+        )
+    return dict(name=workflow_name, file_path=file_path, jobs=jobs)
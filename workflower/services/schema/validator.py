@@ -1,11 +1,14 @@
 import logging
 import os
+import re
 
 from workflower.application.exceptions import (
     InvalidFilePathError,
     InvalidSchemaError,
     InvalidTypeError,
 )
+from workflower.config import Config
+from workflower.utils.pattern import PATTERN_MODES, compile_regex
 
 logger = logging.getLogger("workflower.utils.schema")
 
@@ -212,8 +215,57 @@ def python_job_use_has_expected_keys(job_dict: dict) -> bool:
     return True
 
 
+def python_job_isolation_has_expected_options(job_dict: dict) -> bool:
+    """
+    Python job isolation must be one of the expected options, jobs with
+    requirements need a virtual environment, and jobs with no isolation
+    run on a process pool executor worker.
+    """
+    isolation = job_dict.get("isolation")
+    if isolation is None:
+        return True
+    isolation_options = ["venv", "none"]
+    if isolation not in isolation_options:
+        raise InvalidSchemaError(
+            "Python job isolation must be: " f"{', '.join(isolation_options)}"
+        )
+    if isolation == "none" and "requirements_path" in job_dict:
+        raise InvalidSchemaError(
+            "Python jobs with requirements_path need venv isolation"
+        )
+    process_pool_executors = ["processpool", "warm_processpool"]
+    if (
+        isolation == "none"
+        and job_dict.get("executor", "warm_processpool")
+        not in process_pool_executors
+    ):
+        raise InvalidSchemaError(
+            "Python jobs with no isolation need executor: "
+            f"{', '.join(process_pool_executors)}"
+        )
+    return True
+
+
+def python_job_timeout_is_positive_number(job_dict: dict) -> bool:
+    """
+    Python job timeout must be a positive number of seconds.
+    """
+    timeout = job_dict.get("timeout")
+    if timeout is None:
+        return True
+    if (
+        not isinstance(timeout, (int, float))
+        or isinstance(timeout, bool)
+        or timeout <= 0
+    ):
+        raise InvalidTypeError("Python job timeout must be a positive number")
+    return True
+
+
 def validate_python_job(job_dict: dict) -> None:
     python_job_use_has_expected_keys(job_dict)
+    python_job_isolation_has_expected_options(job_dict)
+    python_job_timeout_is_positive_number(job_dict)
 
 
 def module_job_use_has_expected_keys(job_dict: dict) -> bool:
@@ -274,6 +326,46 @@ def validate_job_operator(job_dict: dict) -> None:
         validate_module_job(job_dict)
 
 
+def job_executor_has_expected_options(job_dict: dict) -> bool:
+    """
+    Job executor must be one of the configured executors.
+    """
+    executor = job_dict.get("executor")
+    if executor is None:
+        return True
+    if executor not in Config.EXECUTORS:
+        raise InvalidSchemaError(
+            f"Job executor must be: {', '.join(Config.EXECUTORS)}"
+        )
+    return True
+
+
+def job_resource_pool_is_configured(job_dict: dict) -> bool:
+    """
+    Job resource pool must be one of the configured resource pools.
+    """
+    resource_pool = job_dict.get("resource_pool")
+    if resource_pool is None:
+        return True
+    if resource_pool not in Config.RESOURCE_POOLS:
+        raise InvalidSchemaError(
+            f"Job resource_pool {resource_pool} is not configured"
+        )
+    return True
+
+
+def job_priority_is_int_type(job_dict: dict) -> bool:
+    """
+    Job priority must be int type.
+    """
+    priority = job_dict.get("priority")
+    if priority is None:
+        return True
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise InvalidTypeError("Job priority must be type int")
+    return True
+
+
 def trigger_is_string_type(job_dict: dict) -> bool:
     """
     Trigger key value must be string type.
@@ -308,14 +400,49 @@ def dependency_trigger_has_expected_keys(job_dict: dict) -> bool:
     return True
 
 
+def get_job_depends_on(job_dict: dict) -> list:
+    """
+    Names of the jobs a job depends on, depends_on may be one job name or a
+    list of them.
+    """
+    depends_on = job_dict.get("depends_on")
+    if not depends_on:
+        return []
+    if isinstance(depends_on, str):
+        return [depends_on]
+    return list(depends_on)
+
+
+def dependency_trigger_depends_on_is_string_or_list_type(
+    job_dict: dict,
+) -> bool:
+    """
+    Dependency trigger depends_on must be a job name or a list of them.
+    """
+    depends_on = job_dict["depends_on"]
+    if isinstance(depends_on, str):
+        return True
+    if not isinstance(depends_on, list) or not all(
+        isinstance(job_name, str) for job_name in depends_on
+    ):
+        raise InvalidTypeError(
+            "Job depends_on must be type string or list of strings"
+        )
+    return True
+
+
 def dependency_trigger_depends_on_existing_job(
     job_dict: dict,
     jobs_names: list,
 ) -> bool:
     """
-    Dependency trigger depends_on must be an existing job.
+    Dependency trigger depends_on must be existing jobs.
     """
-    if not job_dict["depends_on"] in jobs_names:
+    depends_on = get_job_depends_on(job_dict)
+    if not depends_on or not all(
+        job_name in jobs_names and job_name != job_dict["name"]
+        for job_name in depends_on
+    ):
         raise InvalidSchemaError(
             "Job depends_on must have a valid job name reference "
             "from the same workflow"
@@ -323,6 +450,65 @@ def dependency_trigger_depends_on_existing_job(
     return True
 
 
+def dependency_trigger_rule_has_expected_options(job_dict: dict) -> bool:
+    """
+    Dependency trigger rule must have expected options.
+    """
+    trigger_rule_options = ["all_success", "one_success", "all_done"]
+    trigger_rule = job_dict.get("trigger_rule")
+    if trigger_rule is not None and trigger_rule not in trigger_rule_options:
+        raise InvalidSchemaError(
+            f"Job trigger_rule must be: {', '.join(trigger_rule_options)}"
+        )
+    return True
+
+
+def dependency_logs_pattern_is_valid(job_dict: dict) -> bool:
+    """
+    Dependency logs pattern mode must have expected options, and regex
+    patterns must compile.
+    """
+    pattern_mode = job_dict.get("dependency_logs_pattern_mode", "literal")
+    if pattern_mode not in PATTERN_MODES:
+        raise InvalidSchemaError(
+            "Job dependency_logs_pattern_mode must be: "
+            f"{', '.join(PATTERN_MODES)}"
+        )
+    pattern = job_dict.get("dependency_logs_pattern")
+    if pattern_mode == "regex" and pattern:
+        try:
+            compile_regex(str(pattern))
+        except re.error as error:
+            raise InvalidSchemaError(
+                f"Job dependency_logs_pattern is not a valid regex: {error}"
+            )
+    return True
+
+
+def dependency_early_trigger_has_expected_options(job_dict: dict) -> bool:
+    """
+    Dependency early trigger must have expected options, and a logs pattern
+    to match.
+    """
+    early_trigger_options = ["release", "abort"]
+    early_trigger = job_dict.get("early_trigger")
+    if early_trigger is None:
+        return True
+    if early_trigger not in early_trigger_options:
+        raise InvalidSchemaError(
+            f"Job early_trigger must be: {', '.join(early_trigger_options)}"
+        )
+    # Jobs are released, or dependencies aborted, when pattern matches
+    if not job_dict.get("dependency_logs_pattern") or not job_dict.get(
+        "run_if_pattern_match"
+    ):
+        raise InvalidSchemaError(
+            "Job early_trigger must have a dependency_logs_pattern and "
+            "run_if_pattern_match: True"
+        )
+    return True
+
+
 def validate_job_triggers(job_dict: dict, jobs_names: list) -> None:
     """
     Validate job triggers.
@@ -331,7 +517,39 @@ def validate_job_triggers(job_dict: dict, jobs_names: list) -> None:
     job_trigger_has_expected_options(job_dict)
     if job_dict["trigger"] == "dependency":
         dependency_trigger_has_expected_keys(job_dict)
+        dependency_trigger_depends_on_is_string_or_list_type(job_dict)
         dependency_trigger_depends_on_existing_job(job_dict, jobs_names)
+        dependency_trigger_rule_has_expected_options(job_dict)
+        dependency_logs_pattern_is_valid(job_dict)
+        dependency_early_trigger_has_expected_options(job_dict)
+
+
+def workflow_jobs_dependencies_are_acyclic(workflow_jobs: list) -> bool:
+    """
+    Jobs dependencies must not form a cycle, or their jobs would never run.
+    """
+    jobs_depends_on = {
+        job["name"]: get_job_depends_on(job) for job in workflow_jobs
+    }
+    # Depth first search, coloring jobs being visited and visited ones
+    visiting, visited = set(), set()
+
+    def visit(job_name):
+        if job_name in visited:
+            return
+        if job_name in visiting:
+            raise InvalidSchemaError(
+                f"Job {job_name} depends on itself through its dependencies"
+            )
+        visiting.add(job_name)
+        for depends_on in jobs_depends_on.get(job_name, []):
+            visit(depends_on)
+        visiting.discard(job_name)
+        visited.add(job_name)
+
+    for job_name in jobs_depends_on:
+        visit(job_name)
+    return True
 
 
 def workflow_jobs_is_list_type(configuration_dict: dict) -> bool:
@@ -351,13 +569,19 @@ def validate_workflow_jobs_definition(configuration_dict: dict) -> None:
     workflow_jobs_is_list_type(configuration_dict)
     workflow = configuration_dict["workflow"]
     workflow_jobs = workflow["jobs"]
-    jobs_names = []
+    # Jobs may depend on jobs defined after them
+    jobs_names = [job.get("name") for job in workflow_jobs]
     for job in workflow_jobs:
-        jobs_names.append(job["name"])
         job_name_is_string_type(job)
         job_has_expected_keys(job)
         #  Job operator
         validate_job_operator(job)
+        job_executor_has_expected_options(job)
+        job_resource_pool_is_configured(job)
+        job_priority_is_int_type(job)
+        # Job triggers
+        validate_job_triggers(job, jobs_names)
+    workflow_jobs_dependencies_are_acyclic(workflow_jobs)
 
 
 def validate_schema(configuration_dict: dict) -> bool:
@@ -0,0 +1,60 @@
+"""
+Workflows changed since last reconciliation.
+"""
+import logging
+import threading
+from typing import Iterable, Set, Tuple
+
+logger = logging.getLogger("workflower.services.workflow.dirty")
+
+
+class DirtyWorkflows:
+    """
+    Thread safe record of workflows files and jobs changed since the last
+    reconciliation, fed by the loader and by scheduler events, so only
+    those workflows are reconciled.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._file_paths = set()
+        self._job_ids = set()
+
+    def mark_file_paths(self, file_paths: Iterable[str]) -> None:
+        """
+        Mark workflows loaded from the given files as changed.
+        """
+        with self._lock:
+            self._file_paths.update(file_paths)
+
+    def mark_job(self, job_id) -> None:
+        """
+        Mark the workflow of a job as changed, scheduler job ids are strings
+        of database ids.
+        """
+        try:
+            job_id = int(job_id)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring job {job_id}, not a workflow job")
+            return
+        with self._lock:
+            self._job_ids.add(job_id)
+
+    def has_changes(self) -> bool:
+        """
+        Whether any workflow changed since last drain.
+        """
+        with self._lock:
+            return bool(self._file_paths or self._job_ids)
+
+    def drain(self) -> Tuple[Set[str], Set[int]]:
+        """
+        Return and clear changed workflows files paths and jobs ids.
+        """
+        with self._lock:
+            file_paths, self._file_paths = self._file_paths, set()
+            job_ids, self._job_ids = self._job_ids, set()
+        return file_paths, job_ids
+
+
+dirty_workflows = DirtyWorkflows()
@@ -0,0 +1,447 @@
+"""
+Jobs dependency graph.
+"""
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from workflower.utils.pattern import Pattern, PatternMatcher
+
+logger = logging.getLogger("workflower.services.workflow.graph")
+
+# Workflows are read with their jobs and jobs dependencies
+WORKFLOW_RELATIONSHIPS = ["jobs", "jobs.depends_on"]
+
+
+def _as_job_id(job_id):
+    """
+    Scheduler job ids are strings of database ids.
+    """
+    try:
+        return int(job_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class DependencyNode:
+    """
+    Snapshot of a dependency job, holding what is needed to decide if it
+    should run and to schedule it, without database reads.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "operator",
+        "definition",
+        "workflow_id",
+        "depends_on",
+        "trigger_rule",
+        "dependency_logs_pattern",
+        "dependency_logs_pattern_mode",
+        "dependency_logs_pattern_case_sensitive",
+        "run_if_pattern_match",
+        "early_trigger",
+        "order",
+    )
+
+    def __init__(self, job) -> None:
+        self.id = job.id
+        self.name = job.name
+        self.operator = job.operator
+        self.definition = job.definition
+        self.workflow_id = job.workflow_id
+        self.depends_on = tuple(dependency.id for dependency in job.depends_on)
+        self.trigger_rule = job.trigger_rule or "all_success"
+        self.run_if_pattern_match = job.run_if_pattern_match
+        self.early_trigger = job.early_trigger
+        self.dependency_logs_pattern = None
+        if job.dependency_logs_pattern:
+            self.dependency_logs_pattern = str(job.dependency_logs_pattern)
+        self.dependency_logs_pattern_mode = (
+            job.dependency_logs_pattern_mode or "literal"
+        )
+        self.dependency_logs_pattern_case_sensitive = bool(
+            job.dependency_logs_pattern_case_sensitive
+        )
+        # Position on its workflow topological order
+        self.order = 0
+
+    def get_pattern(self):
+        """
+        Dependency logs pattern, keyed by job id, or None.
+        """
+        if not self.dependency_logs_pattern:
+            return None
+        return Pattern(
+            self.id,
+            self.dependency_logs_pattern,
+            self.dependency_logs_pattern_mode,
+            self.dependency_logs_pattern_case_sensitive,
+        )
+
+    def should_run(self, matches: bool) -> bool:
+        """
+        Check dependency job log pattern result against its dependency
+        output.
+
+        | matches | run_if_pattern_match | run   |
+        | True    | True                 | True  |
+        | False   | True                 | False |
+        | True    | False                | False |
+        | False   | False                | True  |
+        """
+        if not self.dependency_logs_pattern:
+            return True
+        return matches == bool(self.run_if_pattern_match)
+
+    def __repr__(self) -> str:
+        return f"DependencyNode(id={self.id}, name={self.name})"
+
+
+def _sort_topologically(nodes: List[DependencyNode]) -> None:
+    """
+    Number nodes so every job comes after the jobs it depends on, jobs on
+    a cycle are left last.
+    """
+    nodes_by_id = {node.id: node for node in nodes}
+    pending_dependencies = {
+        node.id: sum(
+            1 for dependency in node.depends_on if dependency in nodes_by_id
+        )
+        for node in nodes
+    }
+    children = {}
+    for node in nodes:
+        for dependency in node.depends_on:
+            children.setdefault(dependency, []).append(node.id)
+    ready = sorted(
+        node_id for node_id, count in pending_dependencies.items() if not count
+    )
+    order = 0
+    while ready:
+        node_id = ready.pop(0)
+        nodes_by_id[node_id].order = order
+        order += 1
+        for child_id in children.get(node_id, []):
+            pending_dependencies[child_id] -= 1
+            if not pending_dependencies[child_id]:
+                ready.append(child_id)
+    for node_id, count in pending_dependencies.items():
+        if count:
+            nodes_by_id[node_id].order = order
+
+
+class DependencyGraph:
+    """
+    Thread safe in memory index of active jobs by the jobs they depend on,
+    so jobs to trigger after an execution are found in O(dependency jobs)
+    without database reads.
+
+    A job with many dependencies joins their results and runs according to
+    its trigger rule:
+        - all_success: once all of them succeeded.
+        - one_success: as soon as one of them succeeded.
+        - all_done: once all of them finished, whatever their result.
+    A dependency whose output does not match the job log pattern counts as
+    finished but not succeeded. Once all dependencies finished the join
+    starts over, for the next run.
+
+    Log patterns of the jobs depending on a job are compiled together, as
+    jobs are set, so its output is scanned once per execution. Jobs with an
+    early trigger may also be released while their dependency is still
+    running, as soon as its logs match.
+
+    It is kept up to date per workflow by the reconciler, and replaced
+    whole on every full reconciliation. Until first replaced, or loaded, it
+    is not loaded.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._nodes: Dict[int, DependencyNode] = {}
+        self._children: Dict[int, List[int]] = {}
+        self._workflows_jobs: Dict[int, List[int]] = {}
+        # Results of finished dependencies, by dependency job id, of jobs
+        # waiting for the others
+        self._joins: Dict[int, Dict[int, Tuple[bool, Any]]] = {}
+        # one_success jobs already triggered on their current join
+        self._triggered: Set[int] = set()
+        # Log patterns matchers by dependency job id, and dependency jobs
+        # whose dependent jobs changed since they were compiled
+        self._matchers: Dict[int, PatternMatcher] = {}
+        self._stale_matchers: Set[int] = set()
+        # Jobs released while their dependency, by id, is still running
+        self._released: Dict[int, Set[int]] = {}
+        self.is_loaded = False
+
+    def _remove_job(self, job_id: int) -> None:
+        node = self._nodes.pop(job_id, None)
+        if node is None:
+            return
+        self._stale_matchers.update(node.depends_on)
+        for dependency in node.depends_on:
+            children = self._children.get(dependency)
+            if children and job_id in children:
+                children.remove(job_id)
+                if not children:
+                    del self._children[dependency]
+
+    def _remove_workflow(self, workflow_id) -> None:
+        for job_id in self._workflows_jobs.pop(workflow_id, []):
+            self._remove_job(job_id)
+
+    def _set_workflow(
+        self, workflow_id, nodes: Iterable[DependencyNode]
+    ) -> None:
+        self._remove_workflow(workflow_id)
+        nodes = list(nodes)
+        if not nodes:
+            return
+        _sort_topologically(nodes)
+        self._workflows_jobs[workflow_id] = [node.id for node in nodes]
+        for node in nodes:
+            self._nodes[node.id] = node
+            self._stale_matchers.update(node.depends_on)
+            for dependency in node.depends_on:
+                self._children.setdefault(dependency, []).append(node.id)
+
+    def _compile_matcher(self, job_id: int) -> None:
+        patterns = [
+            self._nodes[child_id].get_pattern()
+            for child_id in self._children.get(job_id, [])
+            if self._nodes[child_id].dependency_logs_pattern
+        ]
+        self._matchers.pop(job_id, None)
+        if not patterns:
+            return
+        try:
+            self._matchers[job_id] = PatternMatcher(patterns)
+        except re.error as error:
+            logger.error(f"Job {job_id} dependency logs pattern: {error}")
+
+    def _refresh(self) -> None:
+        """
+        Compile changed log patterns, and keep joins in progress across
+        reconciliations, unless their job was removed or its dependencies
+        changed.
+        """
+        for job_id in self._stale_matchers:
+            self._compile_matcher(job_id)
+        self._stale_matchers = set()
+        for job_id, results in list(self._joins.items()):
+            node = self._nodes.get(job_id)
+            if node is None or not set(results).issubset(node.depends_on):
+                del self._joins[job_id]
+                self._triggered.discard(job_id)
+
+    def set_workflow(
+        self, workflow_id, nodes: Iterable[DependencyNode]
+    ) -> None:
+        """
+        Replace a workflow jobs.
+        """
+        with self._lock:
+            self._set_workflow(workflow_id, nodes)
+            self._refresh()
+
+    def remove_workflow(self, workflow_id) -> None:
+        """
+        Remove a workflow jobs.
+        """
+        with self._lock:
+            self._remove_workflow(workflow_id)
+            self._refresh()
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> None:
+        """
+        Remove jobs, like the ones left without workflow.
+        """
+        with self._lock:
+            for job_id in job_ids:
+                self._remove_job(job_id)
+            self._refresh()
+
+    def replace(
+        self, workflows_nodes: Dict[int, Iterable[DependencyNode]]
+    ) -> None:
+        """
+        Replace all workflows jobs, by workflow id, marking graph as loaded.
+        """
+        with self._lock:
+            self._nodes = {}
+            self._children = {}
+            self._workflows_jobs = {}
+            self._matchers = {}
+            for workflow_id, nodes in workflows_nodes.items():
+                self._set_workflow(workflow_id, nodes)
+            self._refresh()
+            self.is_loaded = True
+        logger.debug(f"Dependency graph loaded with {len(self._nodes)} jobs")
+
+    def load(self, unit_of_work) -> None:
+        """
+        Load active workflows jobs from database, for dependencies to be
+        followed before first reconciliation.
+        """
+        with unit_of_work as uow:
+            workflows = uow.workflows.list_with_relationships(
+                WORKFLOW_RELATIONSHIPS, is_active=True
+            )
+            workflows_nodes = {
+                workflow.id: [
+                    DependencyNode(job)
+                    for job in workflow.jobs
+                    if job.is_active
+                ]
+                for workflow in workflows
+            }
+        self.replace(workflows_nodes)
+
+    def get_dependency_jobs(self, job_id) -> List[DependencyNode]:
+        """
+        Jobs depending on a job.
+        """
+        job_id = _as_job_id(job_id)
+        with self._lock:
+            return [
+                self._nodes[child_id]
+                for child_id in self._children.get(job_id, [])
+            ]
+
+    def _is_ready(self, node: DependencyNode, results: dict, succeeded):
+        if node.trigger_rule == "one_success":
+            if succeeded and node.id not in self._triggered:
+                self._triggered.add(node.id)
+                return True
+            return False
+        if len(results) < len(node.depends_on):
+            return False
+        if node.trigger_rule == "all_done":
+            return True
+        return all(result for result, _ in results.values())
+
+    def _get_return_value(self, node: DependencyNode, results: dict, job_id):
+        """
+        A job with one dependency gets its return value, a job with many
+        gets their return values by job name.
+        """
+        if len(node.depends_on) == 1:
+            return results[job_id][1]
+        return {
+            getattr(self._nodes.get(dependency), "name", dependency): (
+                results[dependency][1]
+            )
+            for dependency in node.depends_on
+            if dependency in results
+        }
+
+    def _record_result(
+        self,
+        node: DependencyNode,
+        job_id: int,
+        succeeded: bool,
+        job_return_value,
+        ready_jobs: list,
+    ) -> None:
+        results = self._joins.setdefault(node.id, {})
+        results[job_id] = (succeeded, job_return_value)
+        if self._is_ready(node, results, succeeded):
+            logger.info(f"Dependency job {node.name} triggered")
+            ready_jobs.append(
+                (node, self._get_return_value(node, results, job_id))
+            )
+        else:
+            logger.debug(f"Dependency job {node.name} not ready")
+        # Every dependency finished, next run starts a new join
+        if len(results) >= len(node.depends_on):
+            del self._joins[node.id]
+            self._triggered.discard(node.id)
+
+    def complete_job(
+        self, job_id, job_return_value=None, succeeded: bool = True
+    ) -> List[Tuple[DependencyNode, Any]]:
+        """
+        Record a job execution result on the jobs depending on it.
+
+        Returns the jobs ready to run, each with the return value it should
+        be given, in topological order.
+        """
+        job_id = _as_job_id(job_id)
+        with self._lock:
+            matcher = self._matchers.get(job_id)
+        matched = set()
+        if matcher is not None and succeeded:
+            # Output is scanned once for every dependent job, out of lock
+            matched = matcher.match(str(job_return_value))
+        ready_jobs = []
+        with self._lock:
+            released = self._released.pop(job_id, set())
+            for child_id in self._children.get(job_id, []):
+                # Result was recorded when the job was released
+                if child_id in released:
+                    continue
+                node = self._nodes[child_id]
+                self._record_result(
+                    node,
+                    job_id,
+                    succeeded and node.should_run(child_id in matched),
+                    job_return_value,
+                    ready_jobs,
+                )
+        ready_jobs.sort(key=lambda item: (item[0].order, item[0].id))
+        return ready_jobs
+
+    def get_stream_patterns(self, job_id) -> List[Tuple[Pattern, str]]:
+        """
+        Logs patterns, with their early trigger, of the jobs to release, or
+        abort job for, as soon as its logs match them.
+        """
+        job_id = _as_job_id(job_id)
+        with self._lock:
+            return [
+                (node.get_pattern(), node.early_trigger)
+                for node in (
+                    self._nodes[child_id]
+                    for child_id in self._children.get(job_id, [])
+                )
+                if node.early_trigger
+                and node.dependency_logs_pattern
+                and node.run_if_pattern_match
+            ]
+
+    def release_job(
+        self, job_id, dependency_job_id, log_line=None
+    ) -> List[Tuple[DependencyNode, Any]]:
+        """
+        Record a job as succeeded for a job depending on it, because its
+        logs matched while still running. Its completion is then ignored
+        for the released job.
+
+        Returns the released job if ready to run, with the log line as
+        return value.
+        """
+        job_id = _as_job_id(job_id)
+        dependency_job_id = _as_job_id(dependency_job_id)
+        ready_jobs = []
+        with self._lock:
+            if dependency_job_id not in self._children.get(job_id, []):
+                return ready_jobs
+            if not self._nodes[dependency_job_id].early_trigger:
+                return ready_jobs
+            released = self._released.setdefault(job_id, set())
+            if dependency_job_id in released:
+                return ready_jobs
+            released.add(dependency_job_id)
+            self._record_result(
+                self._nodes[dependency_job_id],
+                job_id,
+                True,
+                log_line,
+                ready_jobs,
+            )
+        return ready_jobs
+
+
+dependency_graph = DependencyGraph()
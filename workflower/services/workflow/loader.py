@@ -1,91 +1,265 @@
 import logging
-import os
 import traceback
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
-from workflower.adapters.sqlalchemy.setup import Session
-from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
+from workflower.adapters.sqlalchemy.writer import database_writer
 from workflower.application.event.commands import CreateEventCommand
 from workflower.application.workflow.commands import (
-    ActivateWorkflowCommand,
+    IndexWorkflowFilesCommand,
     LoadWorkflowFromYamlFileCommand,
-    SetWorkflowTriggerCommand,
+    ScanWorkflowFilesCommand,
 )
-from workflower.domain.entities.workflow import Workflow
+from workflower.config import Config
+from workflower.domain.entities.workflow_file import WorkflowFile
+from workflower.services.schema.parser import parse_workflow_file
+from workflower.services.workflow.dirty import dirty_workflows
+from workflower.utils.environment import environment_cache
+from workflower.utils.wheelhouse import wheelhouse
 
 logger = logging.getLogger("workflower.loader")
 
 
+def _parse_workflow_file(file_path: str) -> Tuple[dict, str]:
+    """
+    Parse a workflow file on a process pool worker, returning the parsed
+    workflow dict and the formatted traceback if it failed.
+    """
+    try:
+        return parse_workflow_file(file_path), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def _prewarm_environments(workflow_dict: dict) -> None:
+    """
+    Build jobs requirements wheels and python jobs virtual environments in
+    background, so their first run does not wait for them.
+    """
+    for job_dict in workflow_dict["jobs"]:
+        kwargs = job_dict["definition"].get("kwargs", {})
+        requirements_path = kwargs.get("requirements_path")
+        pip_index_url = kwargs.get("pip_index_url")
+        pip_trusted_host = kwargs.get("pip_trusted_host")
+        if job_dict["operator"] == "python":
+            if Config.WHEELHOUSE and requirements_path:
+                wheelhouse.refresh(
+                    requirements_path,
+                    pip_index_url=pip_index_url,
+                    pip_trusted_host=pip_trusted_host,
+                )
+            if Config.ENVIRONMENT_CACHE and Config.ENVIRONMENT_CACHE_PREWARM:
+                environment_cache.prewarm(
+                    requirements_path, pip_index_url, pip_trusted_host
+                )
+        elif job_dict["operator"] == "papermill" and Config.WHEELHOUSE:
+            wheelhouse.refresh(
+                packages=["ipykernel"],
+                pip_index_url=pip_index_url,
+                pip_trusted_host=pip_trusted_host,
+            )
+
+
+def _load_workflow(
+    uow, path: str, workflow_dict: dict, trigger: str
+) -> Optional[dict]:
+    """
+    Load a workflow on the database writer, returning plain data, as its
+    objects do not outlive the writer session.
+    """
+    workflow = LoadWorkflowFromYamlFileCommand(
+        uow, path, workflow_dict, trigger=trigger
+    ).execute()
+    if workflow is None:
+        return None
+    return dict(
+        id=workflow.id,
+        name=workflow.name,
+        file_path=workflow.file_path,
+        jobs_ids=[job.id for job in workflow.jobs],
+    )
+
+
 class WorkflowLoaderService:
     def __init__(self) -> None:
         self._workflows = None
+        self._failed_files = []
 
     @property
-    def workflows(self) -> List[Workflow]:
+    def workflows(self) -> List[dict]:
         return self._workflows
 
-    def load_one_workflow_file(self, path: str, trigger: str = "on_schedule"):
+    @property
+    def failed_files(self) -> List[str]:
+        return self._failed_files
+
+    def _create_load_error_event(self, path: str, exception: str):
+        """
+        Record a workflow file load failure.
+        """
+        logger.error(f"Error loading {path}: {exception}")
+        self._failed_files.append(path)
+        database_writer.execute_command(
+            CreateEventCommand,
+            model="workflow",
+            model_id=None,
+            name="workflow_load_error",
+            exception=exception,
+        )
+
+    def load_one_workflow_file(
+        self,
+        path: str,
+        trigger: str = "on_schedule",
+        workflow_dict: dict = None,
+    ):
         """
-        Load one workflow from file.
+        Load one workflow from file, returning its id, name, file path and
+        jobs ids.
 
         Args:
             - path (str): workflow file path
             - trigger (str): expects "on_schedule" or "on_demand".
+            - workflow_dict (dict, optional): workflow already parsed by
+            parse_workflow_file.
         """
-        session = Session()
-        uow = SqlAlchemyUnitOfWork(session)
         # TODO
         #  Add strategy pattern
-        command = LoadWorkflowFromYamlFileCommand(uow, path)
-        workflow = None
         try:
-            workflow = command.execute()
+            if workflow_dict is None:
+                workflow_dict = parse_workflow_file(path)
+            workflow = database_writer.execute(
+                _load_workflow, path, workflow_dict, trigger
+            )
         except Exception:
-            logger.error(f"Error loading {path}:" f" {traceback.format_exc()}")
-            create_event_command = CreateEventCommand(
-                uow,
-                model="workflow",
-                model_id=None,
-                name="workflow_load_error",
-                exception=traceback.format_exc(),
+            self._create_load_error_event(path, traceback.format_exc())
+            return
+        if workflow_dict is not None:
+            _prewarm_environments(workflow_dict)
+        return workflow
+
+    def _load_files_in_parallel(
+        self, modified_files: List[WorkflowFile], trigger: str
+    ):
+        """
+        Parse and validate files on a process pool, results are written to
+        the database by this thread as they complete.
+        """
+        logger.info(
+            f"Parsing {len(modified_files)} workflow files on "
+            f"{Config.LOADER_PROCESSES} processes"
+        )
+        with ProcessPoolExecutor(
+            max_workers=Config.LOADER_PROCESSES
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _parse_workflow_file, workflow_file.file_path
+                ): workflow_file
+                for workflow_file in modified_files
+            }
+            for future in as_completed(futures):
+                workflow_file = futures[future]
+                workflow_dict, exception = future.result()
+                if exception:
+                    self._create_load_error_event(
+                        workflow_file.file_path, exception
+                    )
+                    workflow = None
+                elif workflow_dict is None:
+                    workflow = None
+                else:
+                    workflow = self.load_one_workflow_file(
+                        workflow_file.file_path,
+                        trigger=trigger,
+                        workflow_dict=workflow_dict,
+                    )
+                yield workflow_file, workflow
+
+    def _load_files(self, modified_files: List[WorkflowFile], trigger: str):
+        """
+        Load files one by one.
+        """
+        for workflow_file in modified_files:
+            workflow = self.load_one_workflow_file(
+                workflow_file.file_path, trigger=trigger
             )
-            create_event_command.execute()
+            yield workflow_file, workflow
 
-        if workflow:
-            set_trigger_command = SetWorkflowTriggerCommand(
-                uow, workflow.id, trigger
+    def _load_scanned_files(
+        self, path: str, file_paths: List[str], trigger: str
+    ) -> List[dict]:
+        """
+        Load files reported as added or modified by the scan command.
+        """
+        self._workflows = []
+        self._failed_files = []
+        modified_files, removed_files = database_writer.execute_command(
+            ScanWorkflowFilesCommand, path, file_paths
+        )
+        logger.info(
+            f"Workflow files modified: {len(modified_files)}, "
+            f"removed: {len(removed_files)}"
+        )
+        if (
+            Config.LOADER_PROCESSES > 1
+            and len(modified_files) >= Config.LOADER_PARALLEL_MIN_FILES
+        ):
+            loaded_files = self._load_files_in_parallel(
+                modified_files, trigger
             )
-            set_trigger_command.execute()
-            activate_Workflow_command = ActivateWorkflowCommand(
-                uow, workflow.id
+        else:
+            loaded_files = self._load_files(modified_files, trigger)
+        counter = 0
+        loaded_file_paths = []
+        indexed_files = []
+        for workflow_file, workflow in loaded_files:
+            if workflow_file.file_path in self._failed_files:
+                continue
+            loaded_file_paths.append(workflow_file.file_path)
+            # Files not loaded, as a workflow name mismatch, are parsed again
+            # on next scan
+            if workflow:
+                indexed_files.append(workflow_file)
+                self._workflows.append(workflow)
+                counter += 1
+        if indexed_files:
+            database_writer.execute_command(
+                IndexWorkflowFilesCommand, indexed_files
             )
-            activate_Workflow_command.execute()
-
-            return workflow
+        dirty_workflows.mark_file_paths(loaded_file_paths + removed_files)
+        logger.info(f"Workflows Loaded {counter}")
+        return self._workflows
 
     def load_all_from_dir(
         self, path: str, trigger: str = "on_schedule"
-    ) -> List[Workflow]:
+    ) -> List[dict]:
         """
-        Load all workflow files from a given directory
+        Load added or modified workflow files from a given directory.
+
+        Files are compared with the scan index by size, modification time and
+        content hash, unchanged files are not parsed again. Files that failed
+        to load, or were skipped, are not indexed, so they are retried on
+        next cycle.
 
         Args:
             - path (str): workflows file path
             - trigger (str): expects "on_schedule" or "on_demand".
         """
-
-        self._workflows = []
         logger.info(f"Loading Workflows from directory: {path}")
-        counter = 0
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.endswith(".yml") or file.endswith(".yaml"):
-                    workflow_path = os.path.join(root, file)
-                    workflow = self.load_one_workflow_file(
-                        workflow_path, trigger=trigger
-                    )
-                    if workflow:
-                        self._workflows.append(workflow)
-                        counter += 1
-        logger.info(f"Workflows Loaded {counter}")
-        return self._workflows
+        return self._load_scanned_files(path, None, trigger)
+
+    def load_workflow_files(
+        self, path: str, file_paths: List[str], trigger: str = "on_schedule"
+    ) -> List[dict]:
+        """
+        Load only the given workflow files from a directory, as reported by
+        the directory watcher.
+
+        Args:
+            - path (str): workflows file path
+            - file_paths (List[str]): changed workflow files paths
+            - trigger (str): expects "on_schedule" or "on_demand".
+        """
+        logger.info(f"Loading {len(file_paths)} changed workflow files")
+        return self._load_scanned_files(path, file_paths, trigger)
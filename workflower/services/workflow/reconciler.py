@@ -0,0 +1,387 @@
+"""
+Workflow reconciler.
+"""
+import logging
+import os
+from typing import List
+
+from apscheduler.jobstores.base import JobLookupError
+from workflower.adapters.sqlalchemy.event_writer import event_writer
+from workflower.adapters.sqlalchemy.writer import (
+    DatabaseWriter,
+    database_writer,
+)
+from workflower.application.interfaces.unit_of_work import UnitOfWork
+from workflower.application.job.commands import (
+    add_scheduler_job,
+    get_job_schedule_params,
+)
+from workflower.domain.entities.job import Job
+from workflower.domain.entities.workflow import Workflow
+from workflower.services.workflow.graph import (
+    WORKFLOW_RELATIONSHIPS,
+    DependencyGraph,
+    DependencyNode,
+    dependency_graph,
+)
+from workflower.utils.file import get_file_modification_date
+
+logger = logging.getLogger("workflower.services.workflow.reconciler")
+
+
+class WorkflowReconciler:
+    """
+    Reconcile workflows and jobs stored on database with scheduler jobs.
+
+    Workflows with their jobs and the scheduler jobs are read once, the
+    differences are computed in memory, then status changes, next run times
+    and events are written by the database writer with bulk statements on a
+    single commit, so database round trips per cycle do not grow with the
+    number of jobs.
+
+    Args:
+        - unit_of_work (UnitOfWork): unit of work used for reading.
+        - scheduler: APScheduler scheduler.
+        - executor (str, optional): scheduler executor alias.
+        - jobstore (str, optional): scheduler jobstore alias.
+        - writer (DatabaseWriter, optional): database writer.
+        - graph (DependencyGraph, optional): jobs dependency graph, updated
+        with visited workflows jobs.
+    """
+
+    def __init__(
+        self,
+        unit_of_work: UnitOfWork,
+        scheduler,
+        executor="default",
+        jobstore="default",
+        writer: DatabaseWriter = database_writer,
+        graph: DependencyGraph = dependency_graph,
+    ) -> None:
+        self.unit_of_work = unit_of_work
+        self.scheduler = scheduler
+        self.executor = executor
+        self.jobstore = jobstore
+        self.writer = writer
+        self.graph = graph
+        self._reset()
+
+    def _reset(self) -> None:
+        self._scheduled_jobs = {}
+        self._workflows_updates = {}
+        self._jobs_updates = {}
+        self._events = []
+        self._jobs_to_unschedule = []
+        self._jobs_to_schedule = []
+        self._unscheduled_jobs_ids = set()
+        self._removed_jobs_ids = set()
+        self._workflows_dependency_nodes = {}
+        self._full_sweep = False
+
+    def _update_workflow(self, workflow_id, **attributes) -> None:
+        self._workflows_updates.setdefault(
+            workflow_id, dict(id=workflow_id)
+        ).update(attributes)
+
+    def _update_job(self, job_id, **attributes) -> None:
+        self._jobs_updates.setdefault(job_id, dict(id=job_id)).update(
+            attributes
+        )
+
+    def _add_job_event(self, name: str, job_id) -> None:
+        self._events.append(
+            dict(
+                name=name,
+                model="job",
+                model_id=job_id,
+                exception=None,
+                output=None,
+            )
+        )
+
+    def _get_workflow_file_state(self, workflow: Workflow):
+        """
+        Check if workflow file still exists and if it has been modified
+        since last reconciliation.
+        """
+        if not workflow.file_path:
+            logger.info("No workflow file")
+            return workflow.file_exists, workflow.modified_since_last_load
+
+        file_exists = os.path.isfile(workflow.file_path)
+        modified_since_last_load = workflow.modified_since_last_load
+        updates = {}
+        if file_exists:
+            file_last_modified_at = get_file_modification_date(
+                workflow.file_path
+            )
+            modified_since_last_load = (
+                workflow.file_last_modified_at is not None
+                and file_last_modified_at != workflow.file_last_modified_at
+            )
+            if file_last_modified_at != workflow.file_last_modified_at:
+                updates.update(file_last_modified_at=file_last_modified_at)
+            if modified_since_last_load != workflow.modified_since_last_load:
+                updates.update(
+                    modified_since_last_load=modified_since_last_load
+                )
+        else:
+            logger.info(f"{workflow.name} file not exists")
+        if file_exists != workflow.file_exists:
+            updates.update(file_exists=file_exists)
+        if updates:
+            self._update_workflow(workflow.id, **updates)
+        return file_exists, modified_since_last_load
+
+    def _unschedule_job(self, job: Job) -> None:
+        """
+        Plan removing a job from scheduler, the unscheduled status and event
+        are only recorded when it changes job state.
+        """
+        if job.id in self._unscheduled_jobs_ids:
+            return
+        self._unscheduled_jobs_ids.add(job.id)
+        scheduled_job = self._scheduled_jobs.pop(str(job.id), None)
+        if scheduled_job:
+            self._jobs_to_unschedule.append(scheduled_job.id)
+        if scheduled_job or job.status != "unscheduled":
+            self._update_job(job.id, status="unscheduled")
+            self._add_job_event("job_unscheduled", job.id)
+
+    def _schedule_job(self, job: Job) -> None:
+        """
+        Plan adding a job to scheduler, or keeping its next run time up to
+        date if already scheduled.
+        """
+        scheduled_job = self._scheduled_jobs.get(str(job.id))
+        if scheduled_job:
+            logger.debug(f"Job {job.id} already added, skipping.")
+            next_run_time = getattr(scheduled_job, "next_run_time", None)
+            if next_run_time != job.next_run_time:
+                self._update_job(job.id, next_run_time=next_run_time)
+            return
+        if not job.is_active:
+            return
+        try:
+            schedule_params = get_job_schedule_params(job)
+        except Exception as error:
+            logger.error(f"Error: {error}")
+            return
+        self._jobs_to_schedule.append((job.id, schedule_params))
+
+    def _plan_dependency_nodes(self, workflow: Workflow) -> None:
+        """
+        Snapshot workflow active jobs for the dependency graph.
+        """
+        nodes = []
+        if workflow.is_active:
+            nodes = [
+                DependencyNode(job) for job in workflow.jobs if job.is_active
+            ]
+        self._workflows_dependency_nodes[workflow.id] = nodes
+
+    def _plan_workflow(self, workflow: Workflow) -> None:
+        logger.info(f"Trying to schedule {workflow.name}")
+        file_exists, modified_since_last_load = self._get_workflow_file_state(
+            workflow
+        )
+        is_active = workflow.is_active
+        if not file_exists:
+            logger.info(
+                f"{workflow.name} file has been removed, unscheduling jobs"
+            )
+            is_active = False
+            if workflow.is_active:
+                self._update_workflow(workflow.id, is_active=False)
+
+        if not is_active:
+            self._workflows_dependency_nodes[workflow.id] = []
+            for job in workflow.jobs:
+                if job.is_active or job.next_run_time is not None:
+                    self._update_job(
+                        job.id, is_active=False, next_run_time=None
+                    )
+                self._unschedule_job(job)
+            logger.info(f"{workflow.name} file removed, skipping")
+            return
+
+        if modified_since_last_load:
+            logger.info(
+                f"{workflow.name} file has been modified, unscheduling jobs"
+            )
+            for job in workflow.jobs:
+                self._unschedule_job(job)
+        logger.info("Scheduling jobs")
+        for job in workflow.jobs:
+            if not job.is_active:
+                self._unschedule_job(job)
+                continue
+            # Job should be scheduled to run immediately after it's
+            # dependencies
+            if job.depends_on:
+                logger.debug(
+                    f"Job {job.id} depends on "
+                    f"{[depends_on.id for depends_on in job.depends_on]}, "
+                    "skipping."
+                )
+                continue
+            self._schedule_job(job)
+
+    def _plan_dangling_jobs(self, jobs: List[Job]) -> None:
+        """
+        Plan unscheduling inactive jobs and removing jobs without workflow.
+        """
+        for job in jobs:
+            if not job.is_active:
+                self._unschedule_job(job)
+            if job.workflow_id is None:
+                self._removed_jobs_ids.add(job.id)
+
+    def _apply(self) -> None:
+        """
+        Apply planned changes to scheduler, then write them to database.
+        """
+        for scheduled_job_id in self._jobs_to_unschedule:
+            try:
+                self.scheduler.remove_job(scheduled_job_id)
+            except JobLookupError:
+                logger.warning(
+                    f"tried to remove {scheduled_job_id}, "
+                    "but it was not scheduled"
+                )
+        for job_id, schedule_params in self._jobs_to_schedule:
+            scheduled_job = add_scheduler_job(
+                self.scheduler,
+                job_id,
+                schedule_params,
+                self.executor,
+                self.jobstore,
+            )
+            if scheduled_job is None:
+                continue
+            self._update_job(
+                job_id,
+                status="scheduled",
+                next_run_time=getattr(scheduled_job, "next_run_time", None),
+            )
+            self._add_job_event("job_scheduled", job_id)
+
+        # Scheduler listeners changes must be written before the ones
+        # planned here, which reflect the final job state
+        event_writer.flush()
+        self.writer.execute(self._write_changes)
+
+        if self._full_sweep:
+            self.graph.replace(self._workflows_dependency_nodes)
+            return
+        for workflow_id, nodes in self._workflows_dependency_nodes.items():
+            self.graph.set_workflow(workflow_id, nodes)
+        self.graph.remove_jobs(self._removed_jobs_ids)
+
+    def _write_changes(self, uow) -> None:
+        """
+        Write planned changes, runs on the database writer thread.
+        """
+        jobs_updates = [
+            job_update
+            for job_id, job_update in self._jobs_updates.items()
+            if job_id not in self._removed_jobs_ids
+        ]
+        with uow:
+            if self._workflows_updates:
+                uow.workflows.bulk_update(
+                    list(self._workflows_updates.values())
+                )
+            if jobs_updates:
+                uow.jobs.bulk_update(jobs_updates)
+            if self._removed_jobs_ids:
+                uow.jobs.bulk_remove(list(self._removed_jobs_ids))
+            if self._events:
+                uow.events.bulk_add(self._events)
+        logger.info(
+            f"Reconciled workflows: {len(self._workflows_updates)} updated, "
+            f"jobs: {len(jobs_updates)} updated, "
+            f"{len(self._removed_jobs_ids)} removed, "
+            f"{len(self._jobs_to_schedule)} scheduled, "
+            f"{len(self._jobs_to_unschedule)} unscheduled"
+        )
+
+    def _list_changed_workflows(self, uow, file_paths, job_ids):
+        """
+        List workflows loaded from the given files or owning the given jobs.
+        """
+        workflows = {}
+        if file_paths:
+            for workflow in uow.workflows.list_with_relationships(
+                WORKFLOW_RELATIONSHIPS, file_path=list(file_paths)
+            ):
+                workflows[workflow.id] = workflow
+        if job_ids:
+            workflows_ids = {
+                job.workflow_id
+                for job in uow.jobs.list_with_relationships(
+                    [], id=list(job_ids)
+                )
+                if job.workflow_id is not None
+            }
+            workflows_ids.difference_update(workflows)
+            if workflows_ids:
+                for workflow in uow.workflows.list_with_relationships(
+                    WORKFLOW_RELATIONSHIPS, id=list(workflows_ids)
+                ):
+                    workflows[workflow.id] = workflow
+        return list(workflows.values())
+
+    def reconcile(self, file_paths=None, job_ids=None) -> None:
+        """
+        Reconcile on schedule workflows jobs with scheduler.
+
+        Without arguments every workflow and job is visited, otherwise only
+        workflows loaded from file_paths or owning job_ids, and jobs left
+        without workflow.
+
+        Args:
+            - file_paths (Iterable[str], optional): changed workflows files.
+            - job_ids (Iterable[int], optional): changed jobs ids.
+        """
+        self._reset()
+        self._full_sweep = file_paths is None and job_ids is None
+        with self.unit_of_work as uow:
+            self._scheduled_jobs = {
+                scheduled_job.id: scheduled_job
+                for scheduled_job in self.scheduler.get_jobs()
+            }
+            if self._full_sweep:
+                self._plan_dangling_jobs(uow.jobs.list())
+                workflows = uow.workflows.list_with_relationships(
+                    WORKFLOW_RELATIONSHIPS
+                )
+            else:
+                self._plan_dangling_jobs(uow.jobs.list(workflow_id=None))
+                workflows = self._list_changed_workflows(
+                    uow, file_paths, job_ids
+                )
+            for workflow in workflows:
+                self._plan_dependency_nodes(workflow)
+                if not workflow.trigger == "on_schedule":
+                    continue
+                self._plan_workflow(workflow)
+        self._apply()
+
+    def reconcile_workflow(self, workflow_id) -> None:
+        """
+        Reconcile one workflow jobs with scheduler, whatever its trigger.
+        """
+        self._reset()
+        with self.unit_of_work as uow:
+            self._scheduled_jobs = {
+                scheduled_job.id: scheduled_job
+                for scheduled_job in self.scheduler.get_jobs()
+            }
+            workflows = uow.workflows.list_with_relationships(
+                WORKFLOW_RELATIONSHIPS, id=workflow_id
+            )
+            for workflow in workflows:
+                self._plan_dependency_nodes(workflow)
+                self._plan_workflow(workflow)
+        self._apply()
@@ -1,31 +1,46 @@
 import logging
+import time
 
-from workflower.adapters.sqlalchemy.setup import Session
-from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
-from workflower.application.event.commands import CreateEventCommand
-from workflower.application.job.commands import (
-    ChangeJobStatusCommand,
-    RemoveJobCommand,
-    ScheduleJobCommand,
-    UnscheduleJobCommand,
-    UpdateNextRunTimeCommand,
-)
-from workflower.application.workflow.commands import (
-    DeactivateWorkflowCommand,
-    DeactivateWorkflowJobsCommand,
-    UpdateModifiedWorkflowFileStateCommand,
-    UpdateWorkflowFileExistsStateCommand,
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_REMOVED,
 )
-from workflower.domain.entities.workflow import Workflow
+from workflower.adapters.sqlalchemy.setup import ReadSession
+from workflower.adapters.sqlalchemy.unit_of_work import SqlAlchemyUnitOfWork
+from workflower.config import Config
+from workflower.services.workflow.dirty import dirty_workflows
+from workflower.services.workflow.reconciler import WorkflowReconciler
 
 logger = logging.getLogger("workflower.services.workflow")
 
 
+def _on_job_event(event) -> None:
+    dirty_workflows.mark_job(event.job_id)
+
+
 class WorkflowRunnerService:
+    def __init__(self) -> None:
+        self._last_full_sweep_at = None
+
+    def track_scheduler_events(self, scheduler) -> None:
+        """
+        Mark workflows as changed when their jobs are executed, fail, are
+        missed or removed from scheduler.
+        """
+        scheduler.add_listener(
+            _on_job_event,
+            EVENT_JOB_EXECUTED
+            | EVENT_JOB_ERROR
+            | EVENT_JOB_MISSED
+            | EVENT_JOB_REMOVED,
+        )
+
     def schedule_one_workflow_jobs(
         self,
         uow,
-        workflow: Workflow,
+        workflow_id: int,
         scheduler,
         executor="default",
         jobstore="default",
@@ -33,161 +48,49 @@ class WorkflowRunnerService:
         """
         Schedule one workflow
         """
-        logger.info(f"Trying to schedule {workflow.name}")
-        if not workflow.file_exists:
-            logger.info(
-                f"{workflow.name} file has been removed, unscheduling jobs"
-            )
-            deactivate_workflow_command = DeactivateWorkflowCommand(
-                uow, workflow.id
-            )
-            deactivate_workflow_command.execute()
-        if not workflow.is_active:
-            deactivate_workflow_jobs_command = DeactivateWorkflowJobsCommand(
-                uow, workflow.id
-            )
-            deactivate_workflow_jobs_command.execute()
-            for job in workflow.jobs:
-                unschedule_job_command = UnscheduleJobCommand(
-                    uow, job.id, scheduler
-                )
-                unschedule_job_command.execute()
-                change_job_status_command = ChangeJobStatusCommand(
-                    uow, job.id, "unscheduled"
-                )
-                change_job_status_command.execute()
-                create_event_command = CreateEventCommand(
-                    uow,
-                    name="job_unscheduled",
-                    model="job",
-                    model_id=job.id,
-                    exception=None,
-                    output=None,
-                )
-                create_event_command.execute()
-            logger.info(f"{workflow.name} file removed, skipping")
-
-        elif workflow.file_exists:
-            if workflow.modified_since_last_load:
-                logger.info(
-                    f"{workflow.name} file has been modified, "
-                    "unscheduling jobs"
-                )
-                for job in workflow.jobs:
-                    unschedule_job_command = UnscheduleJobCommand(
-                        uow, job.id, scheduler
-                    )
-                    unschedule_job_command.execute()
-                    change_job_status_command = ChangeJobStatusCommand(
-                        uow, job.id, "unscheduled"
-                    )
-                    change_job_status_command.execute()
-                    create_event_command = CreateEventCommand(
-                        uow,
-                        name="job_unscheduled",
-                        model="job",
-                        model_id=job.id,
-                        exception=None,
-                        output=None,
-                    )
-                    create_event_command.execute()
-            logger.info("Scheduling jobs")
-            for job in workflow.jobs:
-                # Job should be scheduled to run immediately after it's
-                # dependency
-                if job.depends_on:
-                    logger.debug(
-                        f"Job {job.id} depends on {job.depends_on}, skipping."
-                    )
-                    continue
-                # Job Already scheduled
-                scheduled_job = scheduler.get_job(job.id)
-                if scheduled_job:
-                    logger.debug(f"Job {job.id} already added, skipping.")
-                    next_run_time = scheduled_job.next_run_time
-                    update_next_runtime_command = UpdateNextRunTimeCommand(
-                        uow, job.id, next_run_time
-                    )
-                    update_next_runtime_command.execute()
-                    continue
-                # Job should be scheduled
-                if job.is_active:
-                    schedule_jobs_command = ScheduleJobCommand(
-                        uow, job.id, scheduler, executor, jobstore
-                    )
-                    schedule_jobs_command.execute()
-
-                    scheduled_job = scheduler.get_job(job.id)
-                    if scheduled_job:
-                        next_run_time = scheduled_job.next_run_time
-                        update_next_runtime_command = UpdateNextRunTimeCommand(
-                            uow, job.id, next_run_time
-                        )
-                        update_next_runtime_command.execute()
-
-                    create_event_command = CreateEventCommand(
-                        uow,
-                        name="job_scheduled",
-                        model="job",
-                        model_id=job.id,
-                        exception=None,
-                        output=None,
-                    )
-                    create_event_command.execute()
-                    change_job_status_command = ChangeJobStatusCommand(
-                        uow, job.id, "scheduled"
-                    )
-                    change_job_status_command.execute()
+        reconciler = WorkflowReconciler(uow, scheduler, executor, jobstore)
+        reconciler.reconcile_workflow(workflow_id)
 
-    def schedule_workflows_jobs(self, scheduler) -> None:
+    def schedule_workflows_jobs(self, scheduler, file_paths=None) -> None:
         """
         run Workflow Controller.
-        """
-        logger.info("Scheduling workflows jobs")
-        session = Session()
-        uow = SqlAlchemyUnitOfWork(session)
-        with uow:
-            # Load all workflows into database, it won't load if file has been
-            # removed.
 
-            # Clean dangling jobs
-            jobs = uow.jobs.list()
-            for job in jobs:
-                if not job.is_active:
-                    unschedule_job_command = UnscheduleJobCommand(
-                        uow, job.id, scheduler
-                    )
-                    unschedule_job_command.execute()
-                    change_job_status_command = ChangeJobStatusCommand(
-                        uow, job.id, "unscheduled"
-                    )
-                    change_job_status_command.execute()
-                    create_event_command = CreateEventCommand(
-                        uow,
-                        name="job_unscheduled",
-                        model="job",
-                        model_id=job.id,
-                        exception=None,
-                        output=None,
-                    )
-                    create_event_command.execute()
-                if not job.workflow:
-                    remove_job_command = RemoveJobCommand(uow, job.id)
-                    remove_job_command.execute()
+        Only workflows changed since last call are reconciled, every
+        RECONCILE_FULL_SWEEP_CYCLE seconds all workflows are.
 
-            # Load all workflows on database, including if the file has ben
-            # removed.
-            workflows = uow.workflows.list()
-            for workflow in workflows:
-                if not workflow.trigger == "on_schedule":
-                    continue
-                update_modified_file_state_command = (
-                    UpdateModifiedWorkflowFileStateCommand(uow, workflow.id)
-                )
-                update_modified_file_state_command.execute()
+        Args:
+            - scheduler: APScheduler scheduler.
+            - file_paths (List[str], optional): workflows files to be
+            reconciled besides the ones already marked as changed.
+        """
+        if file_paths:
+            dirty_workflows.mark_file_paths(file_paths)
+        session = ReadSession()
+        uow = SqlAlchemyUnitOfWork(session)
+        reconciler = WorkflowReconciler(uow, scheduler)
+        if (
+            self._last_full_sweep_at is None
+            or time.monotonic() - self._last_full_sweep_at
+            >= Config.RECONCILE_FULL_SWEEP_CYCLE
+        ):
+            logger.info("Scheduling all workflows jobs")
+            dirty_workflows.drain()
+            reconciler.reconcile()
+            self._last_full_sweep_at = time.monotonic()
+            return
 
-                update_Workflow_file_exists_command = (
-                    UpdateWorkflowFileExistsStateCommand(uow, workflow.id)
-                )
-                update_Workflow_file_exists_command.execute()
-                self.schedule_one_workflow_jobs(uow, workflow, scheduler)
+        changed_file_paths, changed_job_ids = dirty_workflows.drain()
+        if not changed_file_paths and not changed_job_ids:
+            logger.info("No workflow changed, skipping scheduling")
+            return
+        logger.info(
+            f"Scheduling {len(changed_file_paths)} changed workflows files "
+            f"and {len(changed_job_ids)} changed jobs workflows"
+        )
+        try:
+            reconciler.reconcile(changed_file_paths, changed_job_ids)
+        except Exception:
+            dirty_workflows.mark_file_paths(changed_file_paths)
+            for job_id in changed_job_ids:
+                dirty_workflows.mark_job(job_id)
+            raise
@@ -0,0 +1,137 @@
+"""
+Workflow directory watcher.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Set
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+from workflower.config import Config
+
+logger = logging.getLogger("workflower.services.workflow.watcher")
+
+
+def _is_workflow_file(path: str) -> bool:
+    return path.endswith(".yml") or path.endswith(".yaml")
+
+
+class WorkflowFilesEventHandler(FileSystemEventHandler):
+    """
+    Forward workflow files changes to a callback.
+    """
+
+    def __init__(self, callback) -> None:
+        self.callback = callback
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path and _is_workflow_file(path):
+                self.callback(path)
+
+
+class WorkflowDirectoryWatcher:
+    """
+    Watch a workflows directory using the operating system file events
+    (inotify on linux), falling back to polling when native events are not
+    available.
+
+    Changed paths are pushed to an asyncio queue and debounced, so an editor
+    saving a file several times in a row results in a single reload.
+
+    Args:
+        - path (str): workflows directory path.
+        - debounce (float, optional): seconds without new events before a
+        batch of changes is returned.
+        - polling_interval (float, optional): polling fallback interval in
+        seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        debounce: float = Config.WATCHER_DEBOUNCE,
+        polling_interval: float = Config.WATCHER_POLLING_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.debounce = debounce
+        self.polling_interval = polling_interval
+        self._absolute_path = os.path.abspath(path)
+        self._observer = None
+        self._loop = None
+        self._queue = None
+
+    def _to_scan_path(self, path: str) -> str:
+        """
+        Express an event path the same way directory scans do, so it matches
+        workflow files index and workflows file paths.
+        """
+        relative_path = os.path.relpath(
+            os.path.abspath(path), self._absolute_path
+        )
+        return os.path.join(self.path, relative_path)
+
+    def _on_path_changed(self, path: str) -> None:
+        scan_path = self._to_scan_path(path)
+        logger.debug(f"Workflow file changed: {scan_path}")
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, scan_path)
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Start watching workflows directory.
+        """
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        event_handler = WorkflowFilesEventHandler(self._on_path_changed)
+        try:
+            self._observer = Observer()
+            self._observer.schedule(event_handler, self.path, recursive=True)
+            self._observer.start()
+            logger.info(f"Watching {self.path} for changes")
+        except OSError as error:
+            logger.warning(
+                f"File system events not available ({error}), "
+                f"polling every {self.polling_interval} seconds"
+            )
+            self._observer = PollingObserver(timeout=self.polling_interval)
+            self._observer.schedule(event_handler, self.path, recursive=True)
+            self._observer.start()
+
+    def stop(self) -> None:
+        """
+        Stop watching workflows directory.
+        """
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    async def get_changes(self, timeout: float = None) -> Set[str]:
+        """
+        Wait for changed workflow files paths.
+
+        Returns an empty set if nothing changed before timeout, otherwise
+        collects paths until no new event arrives for debounce seconds, up
+        to ten times debounce.
+        """
+        changed_paths = set()
+        try:
+            changed_paths.add(
+                await asyncio.wait_for(self._queue.get(), timeout)
+            )
+        except asyncio.TimeoutError:
+            return changed_paths
+        deadline = time.monotonic() + 10 * self.debounce
+        while time.monotonic() < deadline:
+            try:
+                changed_paths.add(
+                    await asyncio.wait_for(self._queue.get(), self.debounce)
+                )
+            except asyncio.TimeoutError:
+                break
+        return changed_paths
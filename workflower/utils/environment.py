@@ -1,16 +1,38 @@
+import hashlib
 import json
 import logging
 import os
 import platform
+import shutil
 import subprocess
+import sys
+import threading
+import time
 import uuid
 import venv
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
 
 from jupyter_client.kernelspecapp import KernelSpecManager
+from workflower.config import Config
+from workflower.utils.file import FileLock, get_directory_size, get_file_hash
+from workflower.utils.wheelhouse import wheelhouse
 
 logger = logging.getLogger("workflower.utils.environment")
 
 
+def get_venv_executable(env_path):
+    """
+    Virtual environment python executable path.
+    """
+    if platform.system() == "Windows":
+        return os.path.join(env_path, "Scripts", "python")
+    # Linux
+    return os.path.join(env_path, "bin", "python")
+
+
 def create_venv(name, environments_dir, with_pip=True):
     """
     Create virtual environment.
@@ -20,23 +42,456 @@ def create_venv(name, environments_dir, with_pip=True):
     logger.info(f"Virtual environment name: {env_path}")
 
     venv.create(env_path, system_site_packages=True, with_pip=with_pip)
-    if platform.system() == "Windows":
-        env_executable = os.path.join(env_path, "Scripts", "python")
+    return env_path, get_venv_executable(env_path)
+
+
+def clone_venv(template_path, env_path):
+    """
+    Clone a virtual environment, hard linking its files so only scripts and
+    configuration, which hold the environment path, are written. Files are
+    copied where hard links are not supported.
+
+    Installers and the interpreter replace files instead of writing to them,
+    so cloned environments do not change their template.
+    """
+    logger.info(f"Cloning virtual environment {template_path} to {env_path}")
+    template_path = os.path.abspath(template_path)
+    env_path = os.path.abspath(env_path)
+    scripts_dir = os.path.dirname(get_venv_executable(template_path))
+    for root, dirs, files in os.walk(template_path):
+        clone_root = os.path.join(
+            env_path, os.path.relpath(root, template_path)
+        )
+        os.makedirs(clone_root, exist_ok=True)
+        for name in dirs + files:
+            source = os.path.join(root, name)
+            target = os.path.join(clone_root, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+            elif name in dirs or name == EnvironmentCache.ready_file_name:
+                continue
+            elif root == scripts_dir or name == "pyvenv.cfg":
+                _copy_with_path(source, target, template_path, env_path)
+            else:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+    return env_path, get_venv_executable(env_path)
+
+
+def _copy_with_path(source, target, old_path, new_path):
+    """
+    Copy a file, replacing a path on it if it is a text file.
+    """
+    with open(source, "rb") as source_file:
+        content = source_file.read()
+    if b"\0" not in content:
+        content = content.replace(
+            old_path.encode("utf-8"), new_path.encode("utf-8")
+        )
+    with open(target, "wb") as target_file:
+        target_file.write(content)
+    shutil.copymode(source, target)
+
+
+def discard_venv(env_path):
+    """
+    Remove a virtual environment by moving it to a trash directory, emptied
+    in background.
+    """
+    trash_dir = os.path.join(os.path.dirname(env_path), ".trash")
+    os.makedirs(trash_dir, exist_ok=True)
+    try:
+        os.rename(env_path, os.path.join(trash_dir, str(uuid.uuid4())))
+    except FileNotFoundError:
+        return
+    except OSError:
+        shutil.rmtree(env_path, ignore_errors=True)
+        return
+    threading.Thread(
+        target=_empty_trash, args=(trash_dir,), daemon=True
+    ).start()
+
+
+def _empty_trash(trash_dir):
+    # Also removes what was left by interrupted calls
+    for name in os.listdir(trash_dir):
+        shutil.rmtree(os.path.join(trash_dir, name), ignore_errors=True)
+
+
+def pip_install(
+    env_executable,
+    requirements_path=None,
+    packages=None,
+    pip_index_url=None,
+    pip_trusted_host=None,
+) -> bool:
+    """
+    Install a requirements file, or packages, on a virtual environment,
+    from the wheelhouse if their wheels were built, returns False if pip
+    failed.
+    """
+    pip_install_args = [env_executable, "-m", "pip", "-q", "install"]
+    if requirements_path:
+        pip_install_args.extend(["-r", requirements_path])
     else:
-        # Linux
-        env_executable = os.path.join(env_path, "bin", "python")
-    return env_path, env_executable
+        pip_install_args.extend(packages)
 
+    if Config.WHEELHOUSE:
+        wheelhouse_args = wheelhouse.get_install_args(
+            requirements_path, packages, pip_index_url, pip_trusted_host
+        )
+        if wheelhouse_args:
+            if _run_pip(pip_install_args + wheelhouse_args):
+                return True
+            logger.warning(
+                "Wheelhouse install failed, installing from package index"
+            )
 
-def create_and_install_kernel(
-    environments_dir, kernel_specs_dir, pip_index_url, pip_trusted_host
+    if pip_index_url:
+        pip_install_args.append(f"--index-url={pip_index_url}")
+    if pip_trusted_host:
+        pip_install_args.append(f"--trusted-host={pip_trusted_host}")
+    return _run_pip(pip_install_args)
+
+
+def _run_pip(pip_args) -> bool:
+    process = subprocess.run(
+        pip_args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.STDOUT,
+    )
+    return process.returncode == 0
+
+
+def install_requirements(
+    env_executable,
+    requirements_path,
+    pip_index_url=None,
+    pip_trusted_host=None,
+) -> bool:
+    """
+    Install requirements file on a virtual environment, returns False if
+    pip failed.
+    """
+    if not os.path.isfile(requirements_path):
+        logger.warning("Invalid requirements file path")
+    return pip_install(
+        env_executable,
+        requirements_path=requirements_path,
+        pip_index_url=pip_index_url,
+        pip_trusted_host=pip_trusted_host,
+    )
+
+
+@contextmanager
+def temporary_environment(
+    environments_dir,
+    requirements_path=None,
+    pip_index_url=None,
+    pip_trusted_host=None,
 ):
-    # Create environment
-    logger.info("Creating Kernel")
-    kernel_name = str(uuid.uuid4())
-    logger.info(f"Kernel name {kernel_name}")
+    """
+    Yield a new virtual environment python executable, cloned from the
+    cached environment with the same requirements if ENVIRONMENT_CACHE is
+    enabled, removing the environment afterwards.
+    """
+    if not Config.ENVIRONMENT_CACHE:
+        env_path, env_executable = create_venv(
+            str(uuid.uuid4()), environments_dir=environments_dir
+        )
+        try:
+            if requirements_path:
+                install_requirements(
+                    env_executable,
+                    requirements_path,
+                    pip_index_url,
+                    pip_trusted_host,
+                )
+            yield env_executable
+        finally:
+            discard_venv(env_path)
+        return
+    env_path = os.path.join(environments_dir, str(uuid.uuid4()))
+    with environment_cache.get_environment(
+        requirements_path, pip_index_url, pip_trusted_host
+    ) as template_executable:
+        _, env_executable = clone_venv(
+            os.path.dirname(os.path.dirname(template_executable)), env_path
+        )
+    try:
+        yield env_executable
+    finally:
+        discard_venv(env_path)
+
+
+class EnvironmentCache:
+    """
+    Virtual environments cache, keyed by python version, requirements
+    content and pip options, so runs with the same requirements reuse a
+    ready environment instead of creating one and installing them again.
+
+    An environment is built once, under a lock held across processes. Least
+    recently used environments are evicted beyond max_environments or the
+    disk quota, unless in use.
+
+    Args:
+        - directory (str): cached environments directory.
+        - max_environments (int, optional): max environments kept.
+        - disk_quota (float, optional): max megabytes taken by environments,
+        unlimited if 0.
+        - prewarm_workers (int, optional): environments built at once in
+        background.
+    """
+
+    ready_file_name = ".workflower_environment.json"
+
+    def __init__(
+        self,
+        directory: str,
+        max_environments: int = 32,
+        disk_quota: float = 0,
+        prewarm_workers: int = 2,
+    ) -> None:
+        self.directory = directory
+        self.max_environments = max_environments
+        self.disk_quota = disk_quota
+        self.prewarm_workers = prewarm_workers
+        self._lock = threading.Lock()
+        self._keys_locks = {}
+        self._in_use = Counter()
+        self._prewarm_executor = None
+        self._prewarming = set()
+
+    @staticmethod
+    def make_key(
+        requirements_path=None, pip_index_url=None, pip_trusted_host=None
+    ) -> str:
+        """
+        Build an environment key from everything it depends on.
+        """
+        requirements_hash = ""
+        if requirements_path and os.path.isfile(requirements_path):
+            requirements_hash = get_file_hash(requirements_path)
+        key = hashlib.sha256()
+        for part in [
+            sys.version,
+            sys.executable,
+            requirements_hash,
+            pip_index_url,
+            pip_trusted_host,
+        ]:
+            key.update(str(part).encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def _get_env_path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _get_ready_file_path(self, key: str) -> str:
+        return os.path.join(self._get_env_path(key), self.ready_file_name)
+
+    def _get_file_lock(self, key: str, shared: bool = False) -> FileLock:
+        return FileLock(self._get_env_path(key) + ".lock", shared=shared)
+
+    def _get_key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._keys_locks.setdefault(key, threading.Lock())
+
+    def is_ready(self, key: str) -> bool:
+        return os.path.isfile(self._get_ready_file_path(key))
+
+    def _build(
+        self, key, requirements_path, pip_index_url, pip_trusted_host
+    ) -> bool:
+        """
+        Create an environment and install its requirements, it is marked as
+        ready only if they were installed.
+        """
+        logger.info(f"Building cached environment {key}")
+        # Left over by a failed build
+        discard_venv(self._get_env_path(key))
+        env_path, env_executable = create_venv(key, self.directory)
+        if requirements_path and not install_requirements(
+            env_executable, requirements_path, pip_index_url, pip_trusted_host
+        ):
+            logger.error(f"Could not install {requirements_path} on {key}")
+            return False
+        with open(
+            self._get_ready_file_path(key), "w", encoding="utf-8"
+        ) as ready_file:
+            json.dump(
+                dict(
+                    requirements_path=requirements_path,
+                    size=get_directory_size(env_path),
+                ),
+                ready_file,
+            )
+        return True
 
-    env_path, env_executable = create_venv(kernel_name, environments_dir)
+    def _ensure(
+        self, key, requirements_path, pip_index_url, pip_trusted_host
+    ) -> bool:
+        os.makedirs(self.directory, exist_ok=True)
+        with self._get_key_lock(key), self._get_file_lock(key):
+            if self.is_ready(key):
+                return True
+            return self._build(
+                key, requirements_path, pip_index_url, pip_trusted_host
+            )
+
+    @contextmanager
+    def get_environment(
+        self, requirements_path=None, pip_index_url=None, pip_trusted_host=None
+    ):
+        """
+        Yield a ready environment python executable, building it first if
+        needed. A shared lock keeps it from being evicted while in use.
+
+        An environment whose requirements could not be installed is still
+        yielded, as a fresh one would be, but removed afterwards.
+        """
+        key = self.make_key(requirements_path, pip_index_url, pip_trusted_host)
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            self._in_use[key] += 1
+        file_lock = None
+        try:
+            while True:
+                file_lock = self._get_file_lock(key, shared=True)
+                file_lock.acquire()
+                if self.is_ready(key):
+                    break
+                file_lock.release()
+                file_lock = None
+                if not self._ensure(
+                    key, requirements_path, pip_index_url, pip_trusted_host
+                ):
+                    break
+            if file_lock is not None:
+                # Modification time tracks when environment was last used
+                os.utime(self._get_ready_file_path(key))
+            yield get_venv_executable(self._get_env_path(key))
+        finally:
+            if file_lock is not None:
+                file_lock.release()
+            with self._lock:
+                self._in_use[key] -= 1
+                if not self._in_use[key]:
+                    del self._in_use[key]
+                    if file_lock is None:
+                        self._remove(key)
+            self.evict()
+
+    def _remove(self, key: str) -> bool:
+        """
+        Remove an environment, unless it is in use by another process.
+        """
+        file_lock = self._get_file_lock(key)
+        if not file_lock.acquire(blocking=False):
+            return False
+        try:
+            discard_venv(self._get_env_path(key))
+        finally:
+            file_lock.release()
+        return True
+
+    def prewarm(
+        self, requirements_path=None, pip_index_url=None, pip_trusted_host=None
+    ) -> None:
+        """
+        Build an environment in background, if not ready yet.
+        """
+        key = self.make_key(requirements_path, pip_index_url, pip_trusted_host)
+        with self._lock:
+            if key in self._prewarming or self.is_ready(key):
+                return
+            self._prewarming.add(key)
+            if self._prewarm_executor is None:
+                self._prewarm_executor = ThreadPoolExecutor(
+                    max_workers=self.prewarm_workers,
+                    thread_name_prefix="environment-prewarm",
+                )
+        logger.info(f"Prewarming environment for {requirements_path}")
+        self._prewarm_executor.submit(
+            self._prewarm,
+            key,
+            requirements_path,
+            pip_index_url,
+            pip_trusted_host,
+        )
+
+    def _prewarm(
+        self, key, requirements_path, pip_index_url, pip_trusted_host
+    ) -> None:
+        try:
+            if not self._ensure(
+                key, requirements_path, pip_index_url, pip_trusted_host
+            ):
+                self._remove(key)
+        except Exception as error:
+            logger.error(f"Environment prewarm error: {error}")
+        finally:
+            with self._lock:
+                self._prewarming.discard(key)
+        self.evict()
+
+    def _list_environments(self) -> list:
+        """
+        Ready environments, least recently used first.
+        """
+        environments = []
+        if not os.path.isdir(self.directory):
+            return environments
+        for key in os.listdir(self.directory):
+            ready_file_path = self._get_ready_file_path(key)
+            try:
+                with open(ready_file_path, encoding="utf-8") as ready_file:
+                    size = json.load(ready_file).get("size", 0)
+                last_used = os.path.getmtime(ready_file_path)
+            except (OSError, ValueError):
+                continue
+            environments.append((last_used, key, size))
+        return sorted(environments)
+
+    def evict(self) -> None:
+        """
+        Remove least recently used environments beyond max environments or
+        disk quota.
+        """
+        environments = self._list_environments()
+        count = len(environments)
+        total_size = sum(size for _, _, size in environments)
+        disk_quota = self.disk_quota * 1024 * 1024
+        for _, key, size in environments:
+            if count <= self.max_environments and (
+                not disk_quota or total_size <= disk_quota
+            ):
+                break
+            # Environments are taken in use under this lock
+            with self._lock:
+                if self._in_use[key] or key in self._prewarming:
+                    continue
+                # In use, or being built, by another process
+                if not self._remove(key):
+                    continue
+                logger.info(f"Evicted cached environment {key}")
+            count -= 1
+            total_size -= size
+
+
+def install_kernel(
+    kernel_name,
+    env_executable,
+    kernel_specs_dir,
+    pip_index_url=None,
+    pip_trusted_host=None,
+):
+    """
+    Install ipykernel on a virtual environment and a kernel spec running it,
+    returns the kernel spec folder and False if ipykernel install failed.
+    """
     # Create kernel spec
     kernel_spec = {
         "argv": [
@@ -53,12 +508,7 @@ def create_and_install_kernel(
     kernel_spec_file = os.path.join(kernel_spec_folder, "kernel.json")
 
     # Create kernel spec folder
-    if not os.path.exists(os.path.dirname(kernel_spec_file)):
-        try:
-            os.makedirs(os.path.dirname(kernel_spec_file))
-        except OSError as exc:  # Guard against race condition
-            if exc.errno != exc.errno.EEXIST:
-                raise
+    os.makedirs(kernel_spec_folder, exist_ok=True)
 
     with open(kernel_spec_file, mode="w", encoding="utf-8") as f:
         json.dump(kernel_spec, f)
@@ -71,22 +521,307 @@ def create_and_install_kernel(
         user=True,
     )
 
-    ipykenerl_install_args = [
+    is_installed = pip_install(
         env_executable,
-        "-m",
-        "pip",
-        "-q",
-        "install",
-        "ipykernel",
-    ]
-    if pip_index_url:
-        ipykenerl_install_args.append(f"--index-url={pip_index_url}")
-    if pip_trusted_host:
-        ipykenerl_install_args.append(f"--trusted-host={pip_trusted_host}")
+        packages=["ipykernel"],
+        pip_index_url=pip_index_url,
+        pip_trusted_host=pip_trusted_host,
+    )
+    return kernel_spec_folder, is_installed
 
-    subprocess.run(
-        ipykenerl_install_args,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.STDOUT,
+
+def uninstall_kernel(kernel_name, kernel_spec_folder=None):
+    """
+    Remove a kernel spec installed by install_kernel.
+    """
+    try:
+        KernelSpecManager().remove_kernel_spec(kernel_name)
+    except KeyError:
+        pass
+    if kernel_spec_folder is not None:
+        shutil.rmtree(kernel_spec_folder, ignore_errors=True)
+
+
+def create_and_install_kernel(
+    environments_dir, kernel_specs_dir, pip_index_url, pip_trusted_host
+):
+    # Create environment
+    logger.info("Creating Kernel")
+    kernel_name = str(uuid.uuid4())
+    logger.info(f"Kernel name {kernel_name}")
+
+    if Config.ENVIRONMENT_CACHE:
+        with environment_cache.get_environment(
+            pip_index_url=pip_index_url, pip_trusted_host=pip_trusted_host
+        ) as template_executable:
+            env_path, env_executable = clone_venv(
+                os.path.dirname(os.path.dirname(template_executable)),
+                os.path.join(environments_dir, kernel_name),
+            )
+    else:
+        env_path, env_executable = create_venv(kernel_name, environments_dir)
+    kernel_spec_folder, _ = install_kernel(
+        kernel_name,
+        env_executable,
+        kernel_specs_dir,
+        pip_index_url,
+        pip_trusted_host,
     )
     return kernel_name, kernel_spec_folder, env_path
+
+
+class KernelPool:
+    """
+    Jupyter kernels pool, keyed by environment spec, so notebook runs lease
+    a ready kernel spec and environment instead of creating and installing
+    one every run.
+
+    Kernels live on disk, leased under a lock held across processes. Each
+    run starts a new kernel process, so a leased kernel state does not
+    outlive its run, its environment is recycled after max_uses runs, in
+    case notebooks installed packages on it. Idle kernels are evicted after
+    idle_timeout seconds.
+
+    Args:
+        - environments_dir (str): kernels virtual environments directory.
+        - kernel_specs_dir (str): kernels specs directory.
+        - size (int, optional): max idle kernels kept by environment spec.
+        - max_uses (int, optional): runs before a kernel is recycled.
+        - idle_timeout (float, optional): seconds before an idle kernel is
+        evicted.
+    """
+
+    kernel_file_name = ".workflower_kernel.json"
+
+    def __init__(
+        self,
+        environments_dir: str,
+        kernel_specs_dir: str,
+        size: int = 4,
+        max_uses: int = 50,
+        idle_timeout: float = 3600,
+    ) -> None:
+        self.environments_dir = environments_dir
+        self.kernel_specs_dir = kernel_specs_dir
+        self.size = size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+
+    @staticmethod
+    def make_key(pip_index_url=None, pip_trusted_host=None) -> str:
+        """
+        Build an environment spec key from everything kernels depend on.
+        """
+        key = hashlib.sha256()
+        for part in [
+            sys.version,
+            sys.executable,
+            pip_index_url,
+            pip_trusted_host,
+        ]:
+            key.update(str(part).encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()[:16]
+
+    def _get_env_path(self, kernel_name: str) -> str:
+        return os.path.join(self.environments_dir, kernel_name)
+
+    def _get_kernel_file_path(self, kernel_name: str) -> str:
+        return os.path.join(
+            self._get_env_path(kernel_name), self.kernel_file_name
+        )
+
+    def _get_file_lock(self, kernel_name: str) -> FileLock:
+        return FileLock(self._get_env_path(kernel_name) + ".lock")
+
+    def _read_kernel(self, kernel_name: str) -> Optional[dict]:
+        """
+        Ready kernel metadata, None if it is not ready.
+        """
+        kernel_file_path = self._get_kernel_file_path(kernel_name)
+        try:
+            with open(kernel_file_path, encoding="utf-8") as kernel_file:
+                kernel = json.load(kernel_file)
+            kernel.update(last_used=os.path.getmtime(kernel_file_path))
+        except (OSError, ValueError):
+            return None
+        return kernel
+
+    def _write_kernel(self, kernel: dict) -> None:
+        # Modification time tracks when kernel was last used
+        with open(
+            self._get_kernel_file_path(kernel["kernel_name"]),
+            "w",
+            encoding="utf-8",
+        ) as kernel_file:
+            json.dump(
+                dict(
+                    key=kernel["key"],
+                    kernel_name=kernel["kernel_name"],
+                    kernel_spec_folder=kernel["kernel_spec_folder"],
+                    uses=kernel["uses"],
+                ),
+                kernel_file,
+            )
+
+    def _list_kernels(self, key: str = None) -> list:
+        """
+        Ready kernels, most recently used first.
+        """
+        kernels = []
+        if not os.path.isdir(self.environments_dir):
+            return kernels
+        for kernel_name in os.listdir(self.environments_dir):
+            kernel = self._read_kernel(kernel_name)
+            if kernel is None or (key is not None and kernel["key"] != key):
+                continue
+            kernels.append(kernel)
+        return sorted(
+            kernels, key=lambda kernel: kernel["last_used"], reverse=True
+        )
+
+    def _build(
+        self, key, kernel_name, pip_index_url, pip_trusted_host
+    ) -> dict:
+        """
+        Create a kernel environment and spec, it is marked as ready only if
+        ipykernel was installed.
+        """
+        logger.info(f"Building pooled kernel {kernel_name}")
+        _, env_executable = create_venv(kernel_name, self.environments_dir)
+        kernel_spec_folder, is_installed = install_kernel(
+            kernel_name,
+            env_executable,
+            self.kernel_specs_dir,
+            pip_index_url,
+            pip_trusted_host,
+        )
+        kernel = dict(
+            key=key,
+            kernel_name=kernel_name,
+            kernel_spec_folder=kernel_spec_folder,
+            uses=0,
+        )
+        if is_installed:
+            self._write_kernel(kernel)
+        else:
+            logger.error(f"Could not install ipykernel on {kernel_name}")
+        return kernel
+
+    def _remove(self, kernel_name, kernel_spec_folder=None) -> None:
+        """
+        Remove a kernel, its lock must be held.
+        """
+        logger.info(f"Removing pooled kernel {kernel_name}")
+        uninstall_kernel(
+            kernel_name,
+            kernel_spec_folder
+            or os.path.join(self.kernel_specs_dir, kernel_name),
+        )
+        discard_venv(self._get_env_path(kernel_name))
+        try:
+            os.remove(self._get_env_path(kernel_name) + ".lock")
+        except OSError:
+            pass
+
+    @contextmanager
+    def lease(self, pip_index_url=None, pip_trusted_host=None):
+        """
+        Yield the name of an idle ready kernel, building one if there is
+        none, and return it to the pool afterwards.
+        """
+        key = self.make_key(pip_index_url, pip_trusted_host)
+        os.makedirs(self.environments_dir, exist_ok=True)
+        os.makedirs(self.kernel_specs_dir, exist_ok=True)
+        self.evict()
+        kernel = None
+        for idle_kernel in self._list_kernels(key):
+            file_lock = self._get_file_lock(idle_kernel["kernel_name"])
+            if not file_lock.acquire(blocking=False):
+                continue
+            # Kernel may have been evicted before its lock was acquired
+            kernel = self._read_kernel(idle_kernel["kernel_name"])
+            if kernel is not None:
+                logger.debug(f"Leased pooled kernel {kernel['kernel_name']}")
+                break
+            file_lock.release()
+        if kernel is None:
+            kernel_name = f"{key}-{uuid.uuid4().hex[:8]}"
+            file_lock = self._get_file_lock(kernel_name)
+            file_lock.acquire()
+            try:
+                kernel = self._build(
+                    key, kernel_name, pip_index_url, pip_trusted_host
+                )
+            except Exception:
+                self._remove(kernel_name)
+                file_lock.release()
+                raise
+        try:
+            yield kernel["kernel_name"]
+        finally:
+            try:
+                kernel["uses"] += 1
+                ready_kernels = self._list_kernels(key)
+                if (
+                    self._read_kernel(kernel["kernel_name"]) is None
+                    or kernel["uses"] >= self.max_uses
+                    or len(ready_kernels) > self.size
+                ):
+                    self._remove(
+                        kernel["kernel_name"], kernel["kernel_spec_folder"]
+                    )
+                else:
+                    self._write_kernel(kernel)
+            finally:
+                file_lock.release()
+
+    def evict(self) -> None:
+        """
+        Remove kernels idle for longer than idle timeout, and kernels left
+        over by failed builds.
+        """
+        if not os.path.isdir(self.environments_dir):
+            return
+        now = time.time()
+        for kernel_name in os.listdir(self.environments_dir):
+            env_path = self._get_env_path(kernel_name)
+            # Trash directory included
+            if kernel_name.startswith(".") or not os.path.isdir(env_path):
+                continue
+            kernel = self._read_kernel(kernel_name)
+            try:
+                last_used = (
+                    kernel["last_used"]
+                    if kernel
+                    else os.path.getmtime(env_path)
+                )
+            except OSError:
+                continue
+            if now - last_used < self.idle_timeout:
+                continue
+            file_lock = self._get_file_lock(kernel_name)
+            # Kernel leased, or being built, by another run
+            if not file_lock.acquire(blocking=False):
+                continue
+            try:
+                self._remove(
+                    kernel_name, kernel and kernel["kernel_spec_folder"]
+                )
+            finally:
+                file_lock.release()
+
+
+environment_cache = EnvironmentCache(
+    Config.ENVIRONMENT_CACHE_DIR,
+    max_environments=Config.ENVIRONMENT_CACHE_SIZE,
+    disk_quota=Config.ENVIRONMENT_CACHE_DISK_QUOTA,
+)
+
+kernel_pool = KernelPool(
+    Config.KERNEL_POOL_DIR,
+    Config.KERNELS_SPECS_DIR,
+    size=Config.KERNEL_POOL_SIZE,
+    max_uses=Config.KERNEL_POOL_MAX_USES,
+    idle_timeout=Config.KERNEL_POOL_IDLE_TIMEOUT,
+)
@@ -1,8 +1,18 @@
+import hashlib
 import logging
 import os
+import time
+from typing import Iterator
 
 import yaml
 
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
 logger = logging.getLogger("workflower.utils.file")
 
 
@@ -20,6 +30,125 @@ def get_file_modification_date(file_path: str) -> int:
     return os.path.getmtime(file_path)
 
 
+def get_file_hash(file_path: str, chunk_size: int = 65536) -> str:
+    """
+    Get sha256 hex digest of file content.
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_directory_size(path: str) -> int:
+    """
+    Get size in bytes of the files of a directory tree.
+    """
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            file_path = os.path.join(root, file)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+
+class FileLock:
+    """
+    Lock, across processes, on a lock file.
+
+    On Windows, where only exclusive byte range locks exist, a shared lock
+    holds one of SHARED_SLOTS bytes past the first one, and an exclusive
+    lock the first byte and all of them, so it waits for every shared one.
+
+    Args:
+        - path (str): lock file path, created if it does not exist.
+        - shared (bool, optional): lock shared with other shared locks.
+    """
+
+    SHARED_SLOTS = 64
+
+    def __init__(self, path: str, shared: bool = False) -> None:
+        self.path = path
+        self.shared = shared
+        self._file = None
+        self._region = None
+
+    def _lock_region(self, offset: int, size: int) -> bool:
+        self._file.seek(offset)
+        try:
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, size)
+        except OSError:
+            return False
+        self._region = (offset, size)
+        return True
+
+    def _lock(self, blocking: bool) -> None:
+        if fcntl is not None:
+            flags = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            fcntl.flock(self._file.fileno(), flags)
+            return
+        while True:
+            if self.shared:
+                # Any free slot, first byte is only held by exclusive locks
+                if any(
+                    self._lock_region(slot, 1)
+                    for slot in range(1, self.SHARED_SLOTS + 1)
+                ):
+                    return
+            elif self._lock_region(0, self.SHARED_SLOTS + 1):
+                return
+            if not blocking:
+                raise OSError("Lock is held")
+            time.sleep(0.1)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire lock, returns False if not blocking and it is held.
+        """
+        self._file = open(self.path, "a+b")
+        try:
+            self._lock(blocking)
+        except OSError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            offset, size = self._region
+            self._file.seek(offset)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, size)
+            self._region = None
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+def get_workflow_files_paths(path: str) -> Iterator[str]:
+    """
+    Yield .yml and .yaml file paths from a directory tree.
+    """
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            if file.endswith(".yml") or file.endswith(".yaml"):
+                yield os.path.join(root, file)
+
+
 def yaml_file_to_dict(file_path: str) -> dict:
     """
     Return a dict from yaml file's path.
@@ -0,0 +1,182 @@
+"""
+Multi pattern matching.
+"""
+import logging
+import re
+from typing import Hashable, Iterable, NamedTuple, Set
+
+logger = logging.getLogger("workflower.utils.pattern")
+
+PATTERN_MODES = ["literal", "regex"]
+
+
+class Pattern(NamedTuple):
+    """
+    Pattern to look for on a text.
+
+    Args:
+        - key (Hashable): value returned when pattern is found.
+        - pattern (str): literal text or regular expression.
+        - mode (str, optional): literal or regex.
+        - case_sensitive (bool, optional): match case or not.
+    """
+
+    key: Hashable
+    pattern: str
+    mode: str = "literal"
+    case_sensitive: bool = False
+
+
+def compile_regex(pattern: str, case_sensitive: bool = False):
+    """
+    Compile a regular expression pattern, raises re.error if invalid.
+    """
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+class LiteralMatcher:
+    """
+    Find which of many literal words occur on a text, by a single compiled
+    alternation of all of them, so the text is scanned once in C.
+
+    Alternation matches do not overlap, so on any match, the words not
+    matched are checked on their own.
+
+    Args:
+        - words (Iterable[str]): words to look for.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._words = list(words)
+        self._indexes = {}
+        for index, word in enumerate(self._words):
+            self._indexes.setdefault(word, []).append(index)
+        self._regex = None
+        if self._words:
+            # Longest first, so a word is not hidden by its own prefix
+            self._regex = re.compile(
+                "|".join(
+                    re.escape(word)
+                    for word in sorted(self._indexes, key=len, reverse=True)
+                )
+            )
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Indexes of the words found on text.
+        """
+        found = set()
+        if self._regex is None:
+            return found
+        matched_words = set(self._regex.findall(text))
+        if not matched_words:
+            return found
+        for word, indexes in self._indexes.items():
+            if word in matched_words or word in text:
+                found.update(indexes)
+        return found
+
+
+class PatternMatcher:
+    """
+    Match many patterns against a text, compiled once.
+
+    Literal patterns are looked for in a single pass over the text, and
+    case insensitive ones in a single pass over its lower case, computed
+    once. Regex patterns are joined into a single alternation, except those
+    with groups or global flags of their own, which can not be nested in it
+    and are matched apart.
+
+    Args:
+        - patterns (Iterable[Pattern]): patterns to look for.
+    """
+
+    def __init__(self, patterns: Iterable[Pattern]) -> None:
+        patterns = list(patterns)
+        case_sensitive_literals = [
+            pattern
+            for pattern in patterns
+            if pattern.mode == "literal" and pattern.case_sensitive
+        ]
+        case_insensitive_literals = [
+            pattern
+            for pattern in patterns
+            if pattern.mode == "literal" and not pattern.case_sensitive
+        ]
+        self._case_sensitive_keys = [
+            pattern.key for pattern in case_sensitive_literals
+        ]
+        self._case_sensitive_literals = LiteralMatcher(
+            pattern.pattern for pattern in case_sensitive_literals
+        )
+        self._case_insensitive_keys = [
+            pattern.key for pattern in case_insensitive_literals
+        ]
+        self._case_insensitive_literals = LiteralMatcher(
+            pattern.pattern.lower() for pattern in case_insensitive_literals
+        )
+
+        self._regexes = {}
+        self._separate_regexes_keys = []
+        alternatives = []
+        for pattern in patterns:
+            if pattern.mode != "regex":
+                continue
+            regex = compile_regex(pattern.pattern, pattern.case_sensitive)
+            self._regexes[pattern.key] = regex
+            # Case sensitivity is scoped to each alternative
+            flags = "" if pattern.case_sensitive else "i"
+            group_name = f"p{len(alternatives)}"
+            alternative = f"(?P<{group_name}>(?{flags}:{regex.pattern}))"
+            if regex.groups or not self._can_combine(alternative):
+                self._separate_regexes_keys.append(pattern.key)
+                continue
+            alternatives.append((pattern.key, alternative))
+        self._combined_regexes_keys = [key for key, _ in alternatives]
+        self._combined_regex = None
+        if alternatives:
+            self._combined_regex = re.compile(
+                "|".join(alternative for _, alternative in alternatives)
+            )
+
+    @staticmethod
+    def _can_combine(alternative: str) -> bool:
+        # Patterns with global inline flags, like (?i), can not be nested
+        try:
+            re.compile(alternative)
+        except re.error:
+            return False
+        return True
+
+    def _match_regexes(self, text: str) -> Set[Hashable]:
+        matched = set()
+        if self._combined_regex is not None:
+            for match in self._combined_regex.finditer(text):
+                matched.add(
+                    self._combined_regexes_keys[int(match.lastgroup[1:])]
+                )
+            # A pattern may only match where another one matched first, so
+            # on any match, the ones left are checked on their own
+            if matched:
+                for key in self._combined_regexes_keys:
+                    if key not in matched and self._regexes[key].search(text):
+                        matched.add(key)
+        for key in self._separate_regexes_keys:
+            if self._regexes[key].search(text):
+                matched.add(key)
+        return matched
+
+    def match(self, text: str) -> Set[Hashable]:
+        """
+        Keys of the patterns found on text.
+        """
+        matched = set()
+        if self._case_sensitive_keys:
+            for index in self._case_sensitive_literals.find(text):
+                matched.add(self._case_sensitive_keys[index])
+        if self._case_insensitive_keys:
+            for index in self._case_insensitive_literals.find(text.lower()):
+                matched.add(self._case_insensitive_keys[index])
+        if self._regexes:
+            matched |= self._match_regexes(text)
+        return matched
@@ -0,0 +1,234 @@
+"""
+Local wheelhouse.
+"""
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from workflower.config import Config
+from workflower.utils.file import FileLock, get_file_hash
+
+logger = logging.getLogger("workflower.utils.wheelhouse")
+
+
+class Wheelhouse:
+    """
+    Wheels of requirements files and packages, resolved and built once into
+    a local directory, so they are installed without reaching the package
+    index.
+
+    Requirements are built again, in background, once their requirements
+    file content changes.
+
+    Args:
+        - directory (str): wheels directory.
+        - workers (int, optional): requirements built at once in background.
+    """
+
+    def __init__(self, directory: str, workers: int = 1) -> None:
+        self.directory = directory
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._refreshing = set()
+
+    @staticmethod
+    def _get_requirements_args(
+        requirements_path=None, packages: List[str] = None
+    ) -> list:
+        if requirements_path:
+            return ["-r", requirements_path]
+        return list(packages or [])
+
+    @staticmethod
+    def _make_key(
+        requirements_path=None,
+        packages: List[str] = None,
+        pip_index_url=None,
+        pip_trusted_host=None,
+    ) -> str:
+        key = hashlib.sha256()
+        for part in [
+            requirements_path and os.path.abspath(requirements_path),
+            packages and sorted(packages),
+            pip_index_url,
+            pip_trusted_host,
+        ]:
+            key.update(str(part).encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    @staticmethod
+    def _get_content_hash(requirements_path=None) -> Optional[str]:
+        if requirements_path is None:
+            return ""
+        if not os.path.isfile(requirements_path):
+            return None
+        return get_file_hash(requirements_path)
+
+    def _get_built_file_path(self, key: str) -> str:
+        return os.path.join(self.directory, ".built", f"{key}.json")
+
+    def is_ready(
+        self,
+        requirements_path=None,
+        packages: List[str] = None,
+        pip_index_url=None,
+        pip_trusted_host=None,
+    ) -> bool:
+        """
+        Whether wheels were built for requirements current content.
+        """
+        content_hash = self._get_content_hash(requirements_path)
+        if content_hash is None:
+            return False
+        key = self._make_key(
+            requirements_path, packages, pip_index_url, pip_trusted_host
+        )
+        try:
+            with open(
+                self._get_built_file_path(key), encoding="utf-8"
+            ) as built_file:
+                return json.load(built_file)["hash"] == content_hash
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def build(
+        self,
+        requirements_path=None,
+        packages: List[str] = None,
+        pip_index_url=None,
+        pip_trusted_host=None,
+    ) -> bool:
+        """
+        Resolve and build requirements wheels into the wheelhouse, returns
+        False if pip failed.
+        """
+        key = self._make_key(
+            requirements_path, packages, pip_index_url, pip_trusted_host
+        )
+        built_file_path = self._get_built_file_path(key)
+        os.makedirs(os.path.dirname(built_file_path), exist_ok=True)
+        with FileLock(built_file_path + ".lock"):
+            content_hash = self._get_content_hash(requirements_path)
+            if content_hash is None:
+                logger.warning("Invalid requirements file path")
+                return False
+            if self.is_ready(
+                requirements_path, packages, pip_index_url, pip_trusted_host
+            ):
+                return True
+            logger.info(
+                "Building wheels for "
+                f"{requirements_path or ', '.join(packages)}"
+            )
+            pip_wheel_args = [
+                sys.executable,
+                "-m",
+                "pip",
+                "-q",
+                "wheel",
+                f"--wheel-dir={self.directory}",
+                *self._get_requirements_args(requirements_path, packages),
+            ]
+            if pip_index_url:
+                pip_wheel_args.append(f"--index-url={pip_index_url}")
+            if pip_trusted_host:
+                pip_wheel_args.append(f"--trusted-host={pip_trusted_host}")
+            process = subprocess.run(
+                pip_wheel_args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.STDOUT,
+            )
+            if process.returncode != 0:
+                logger.error(
+                    "Could not build wheels for "
+                    f"{requirements_path or ', '.join(packages)}"
+                )
+                return False
+            with open(built_file_path, "w", encoding="utf-8") as built_file:
+                json.dump(
+                    dict(
+                        requirements_path=requirements_path,
+                        packages=packages,
+                        hash=content_hash,
+                    ),
+                    built_file,
+                )
+            return True
+
+    def refresh(
+        self,
+        requirements_path=None,
+        packages: List[str] = None,
+        pip_index_url=None,
+        pip_trusted_host=None,
+    ) -> None:
+        """
+        Build requirements wheels in background, if they are not built for
+        requirements current content.
+        """
+        key = self._make_key(
+            requirements_path, packages, pip_index_url, pip_trusted_host
+        )
+        with self._lock:
+            if key in self._refreshing or self.is_ready(
+                requirements_path, packages, pip_index_url, pip_trusted_host
+            ):
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="wheelhouse",
+                )
+        self._executor.submit(
+            self._refresh,
+            key,
+            requirements_path,
+            packages,
+            pip_index_url,
+            pip_trusted_host,
+        )
+
+    def _refresh(
+        self, key, requirements_path, packages, pip_index_url, pip_trusted_host
+    ) -> None:
+        try:
+            self.build(
+                requirements_path, packages, pip_index_url, pip_trusted_host
+            )
+        except Exception as error:
+            logger.error(f"Wheelhouse build error: {error}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_install_args(
+        self,
+        requirements_path=None,
+        packages: List[str] = None,
+        pip_index_url=None,
+        pip_trusted_host=None,
+    ) -> Optional[list]:
+        """
+        Pip install options to install requirements from the wheelhouse,
+        None if their wheels are not built, refreshing them in background.
+        """
+        if not self.is_ready(
+            requirements_path, packages, pip_index_url, pip_trusted_host
+        ):
+            self.refresh(
+                requirements_path, packages, pip_index_url, pip_trusted_host
+            )
+            return None
+        return ["--no-index", f"--find-links={self.directory}"]
+
+
+wheelhouse = Wheelhouse(Config.WHEELHOUSE_DIR)